@@ -1,6 +1,8 @@
+from django import forms
 from django.contrib import admin
 
-from .models import org, proj, user, news
+from .domain.templates import ProjectTemplate
+from .models import org, proj, user, news, stats, jobs
 
 
 class ProjectAdmin(admin.ModelAdmin):
@@ -12,6 +14,22 @@ class ProjectAdmin(admin.ModelAdmin):
     ordering = ('-creation_date',)
 
 
+class OrganizationProjectTemplateForm(forms.ModelForm):
+
+    def clean_definition(self):
+        definition = self.cleaned_data['definition']
+        ProjectTemplate.from_json(definition)
+        return definition
+
+
+class OrganizationProjectTemplateAdmin(admin.ModelAdmin):
+
+    form = OrganizationProjectTemplateForm
+
+    list_display = ('organization', 'last_modified_date')
+    search_fields = ('organization__name',)
+
+
 class UserAdmin(admin.ModelAdmin):
 
     fields = (
@@ -40,6 +58,7 @@ class UserAdmin(admin.ModelAdmin):
 
 admin.site.register(user.Skill)
 admin.site.register(org.Organization)
+admin.site.register(org.OrganizationProjectTemplate, OrganizationProjectTemplateAdmin)
 admin.site.register(proj.Project, ProjectAdmin)
 admin.site.register(proj.ProjectScope)
 admin.site.register(proj.ProjectLog)
@@ -53,6 +72,7 @@ admin.site.register(proj.ProjectTaskRequirement)
 admin.site.register(proj.VolunteerApplication)
 admin.site.register(user.User, UserAdmin)
 admin.site.register(user.UserNotification)
+admin.site.register(user.OutboundEmail)
 admin.site.register(user.VolunteerProfile)
 admin.site.register(user.VolunteerSkill)
 admin.site.register(user.UserBadge)
@@ -63,3 +83,5 @@ admin.site.register(org.OrganizationRole)
 admin.site.register(proj.ProjectRole)
 admin.site.register(proj.ProjectTaskRole)
 admin.site.register(news.NewsPiece)
+admin.site.register(stats.PlatformStatistics)
+admin.site.register(jobs.Job)
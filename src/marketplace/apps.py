@@ -5,3 +5,14 @@ class MarketplaceConfig(AppConfig):
 
     name = 'marketplace'
     verbose_name = 'Solve for Good'
+
+    def ready(self):
+        # add the permissions used by the domain and views -- upon start-up
+        # of every process, rather than only upon loading of the URLconf
+        import marketplace.authorization.org
+        import marketplace.authorization.proj
+        import marketplace.authorization.user
+
+        # connect the receivers of the connections' health checks and metrics,
+        # and of the slow-query log
+        from marketplace.db import connections, slow_queries
@@ -0,0 +1,28 @@
+"""Benchmark suites run by ``manage.py bench``.
+
+Each suite is a module of this package exposing ``run(sizes, repeat)``,
+which returns a list of result rows (dicts). Suites do their work inside a
+transaction that is rolled back, so that they may be pointed at a
+development database without leaving anything behind.
+
+"""
+from importlib import import_module
+
+
+SUITES = (
+    'connections',
+    'home',
+    'markdown',
+    'notifications',
+    'pagination',
+    'permissions',
+    'scale',
+    'startup',
+)
+
+
+def load_suite(name):
+    if name not in SUITES:
+        raise KeyError(f"Unknown benchmark suite: {name}")
+
+    return import_module(f'{__name__}.{name}')
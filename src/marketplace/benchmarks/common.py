@@ -0,0 +1,60 @@
+import contextlib
+import statistics
+import time
+
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextlib.contextmanager
+def rolled_back():
+    """Run the enclosed block in a transaction which is always rolled back."""
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def measure(func, repeat=1, setup=None):
+    """Time ``func`` over ``repeat`` runs, each in its own rolled-back
+    transaction.
+
+    ``setup``, if given, is called (untimed) before each run, within the
+    same transaction, and its return value is passed to ``func``.
+
+    Returns the median wall-clock time (in seconds) and the number of
+    queries issued by a single run.
+
+    """
+    timings = []
+    query_count = None
+
+    for _ in range(repeat):
+        with rolled_back():
+            args = () if setup is None else (setup(),)
+
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                func(*args)
+                timings.append(time.perf_counter() - start)
+
+            query_count = len(queries)
+
+    return (statistics.median(timings), query_count)
+
+
+def result(suite, case, size, seconds, queries, **extra):
+    return dict(
+        suite=suite,
+        case=case,
+        size=size,
+        seconds=round(seconds, 6),
+        queries=queries,
+        **extra
+    )
@@ -0,0 +1,91 @@
+"""Requests for the (anonymous) project list page, served by Django's
+request handler -- such that connections are closed, or kept, between
+requests as they would be by a worker -- with a new connection per
+request versus a persistent one.
+
+Meaningful against PostgreSQL, where each new connection pays for its TLS
+handshake and authentication. Unlike the other suites, requests are
+served outside of any transaction (so that connections may be closed):
+they read the database's existing projects, and change nothing.
+
+The problem size is the number of requests per run.
+
+"""
+import statistics
+import time
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection, reset_queries
+from django.test import RequestFactory, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from marketplace.db.connections import METRICS
+
+from .common import result
+
+
+DEFAULT_SIZES = (200,)
+
+CASES = (
+    ('connection per request', 0),
+    ('persistent connection', 60),
+)
+
+
+def start_response(status, headers):
+    pass
+
+
+def request(handler, environ):
+    response = handler(dict(environ), start_response)
+    for _chunk in response:
+        pass
+    response.close()
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+def run(sizes=None, repeat=1):
+    rows = []
+
+    handler = WSGIHandler()
+    environ = RequestFactory().get(reverse('marketplace:proj_list')).environ
+    initial_max_age = connection.settings_dict['CONN_MAX_AGE']
+    pooled = getattr(connection, 'pooled', False)
+
+    try:
+        for size in sizes or DEFAULT_SIZES:
+            for (case, max_age) in CASES:
+                connection.close()
+                connection.settings_dict['CONN_MAX_AGE'] = max_age
+
+                # (requests reset the query log)
+                reset_queries()
+                with CaptureQueriesContext(connection) as queries:
+                    request(handler, environ)
+
+                timings = []
+                METRICS.reset()
+                for _ in range(repeat):
+                    start = time.perf_counter()
+                    for _ in range(size):
+                        request(handler, environ)
+                    timings.append(time.perf_counter() - start)
+                metrics = METRICS.snapshot()
+
+                seconds = statistics.median(timings)
+                rows.append(result(
+                    'connections',
+                    f'{case} (pooled)' if pooled else case,
+                    size,
+                    seconds,
+                    len(queries),
+                    requests_per_second=round(size / seconds, 1),
+                    opened=metrics['opened'],
+                    reused=metrics['reused'],
+                ))
+    finally:
+        connection.close()
+        connection.settings_dict['CONN_MAX_AGE'] = initial_max_age
+
+    return rows
@@ -0,0 +1,45 @@
+"""The (anonymous) home page, over many projects: with its statistics
+computed upon every request (as formerly) versus read from the
+materialized platform statistics.
+
+"""
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from marketplace.domain import marketplace
+
+from .common import measure, result
+from .seed import seed_projects
+
+
+DEFAULT_SIZES = (10000,)
+
+NO_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.dummy.DummyCache'}}
+
+
+def get_home(client):
+    client.get(reverse('marketplace:home'))
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+def run(sizes=None, repeat=1):
+    rows = []
+
+    for size in sizes or DEFAULT_SIZES:
+        def computed_setup():
+            seed_projects(size)
+            return Client()
+
+        def materialized_setup():
+            seed_projects(size)
+            marketplace.stats.refresh_platform_statistics()
+            return Client()
+
+        with override_settings(CACHES=NO_CACHE, PLATFORM_STATISTICS_MAX_AGE=0):
+            (seconds, queries) = measure(get_home, repeat, computed_setup)
+        rows.append(result('home', 'computed per request', size, seconds, queries))
+
+        (seconds, queries) = measure(get_home, repeat, materialized_setup)
+        rows.append(result('home', 'materialized statistics', size, seconds, queries))
+
+    return rows
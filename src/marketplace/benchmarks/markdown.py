@@ -0,0 +1,94 @@
+"""Project pages presenting long Markdown fields (information and scope):
+with their Markdown rendered upon every request (as formerly) versus
+served pre-rendered.
+
+The problem size is the number of paragraphs of each Markdown field.
+
+"""
+from datetime import date
+
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from marketplace.domain import marketplace
+from marketplace.domain.org import OrganizationService
+from marketplace.domain.proj import ProjectService
+from marketplace.models.org import Organization
+from marketplace.models.proj import Project, ProjectScope
+from marketplace.models.user import User
+
+from .common import measure, result
+
+
+DEFAULT_SIZES = (10, 50)
+
+PAGES = (
+    ('proj_info.html', 'marketplace:proj_info'),
+    ('proj_scope.html', 'marketplace:proj_scope'),
+)
+
+PARAGRAPH = (
+    "The **data** for this project is collected by _several_ agencies, and "
+    "is described in [the documentation](https://example.org/docs).\n\n"
+    "* records of `service requests`, by neighborhood\n"
+    "* a survey of residents, conducted yearly\n\n"
+)
+
+
+def markdown_text(paragraph_count):
+    return ''.join(f"### Section {index}\n\n{PARAGRAPH}" for index in range(paragraph_count))
+
+
+def make_project(paragraph_count, prerendered):
+    text = markdown_text(paragraph_count)
+
+    owner = User(username='bench-owner', email='bench-owner@example.com')
+    marketplace.user.add_user(owner, 'organization')
+
+    organization = Organization(name='Benchmark organization')
+    OrganizationService.create_organization(owner, organization)
+
+    project = Project(
+        name='Benchmark project',
+        short_summary='Benchmark project',
+        intended_start_date=date.today(),
+        intended_end_date=date.today(),
+    )
+    for field_name in Project.markdown_fields + ProjectScope.markdown_fields:
+        setattr(project, field_name, text)
+
+    OrganizationService.create_project(owner, organization.id, project)
+    ProjectService.publish_project(owner, project.id, project)
+
+    if not prerendered:
+        # as were rows prior to their being backfilled
+        Project.objects.filter(id=project.id).update(rendered_markdown='')
+        ProjectScope.objects.filter(project=project).update(rendered_markdown='')
+
+    client = Client()
+    client.force_login(owner)
+
+    return (client, project)
+
+
+def get_page(url_name):
+    def func(setup):
+        (client, project) = setup
+        client.get(reverse(url_name, args=[project.id]))
+
+    return func
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+def run(sizes=None, repeat=1):
+    rows = []
+
+    for size in sizes or DEFAULT_SIZES:
+        for (template_name, url_name) in PAGES:
+            (seconds, queries) = measure(get_page(url_name), repeat, lambda: make_project(size, False))
+            rows.append(result('markdown', f'{template_name} (rendered per request)', size, seconds, queries))
+
+            (seconds, queries) = measure(get_page(url_name), repeat, lambda: make_project(size, True))
+            rows.append(result('markdown', f'{template_name} (pre-rendered)', size, seconds, queries))
+
+    return rows
@@ -0,0 +1,71 @@
+"""Notification fan-out: per-recipient writes (as formerly performed)
+versus the bulk fan-out engine, and the outbox worker's delivery of the
+resulting emails.
+
+Mail is sent through the in-memory backend, so that delivery is measured
+without network latency.
+
+"""
+from django.test.utils import override_settings
+
+from marketplace.domain.notifications import (
+    NotificationService,
+    add_user_notification,
+    deliver_queued_emails,
+)
+from marketplace.models.user import NotificationSeverity, NotificationSource, User
+
+from .common import measure, result
+
+
+DEFAULT_SIZES = (10, 100, 1000)
+
+DESCRIPTION = "A benchmark notification."
+
+
+def make_recipients(size):
+    User.objects.bulk_create(
+        User(username=f'bench-notify-{index}', email=f'bench-notify-{index}@example.com')
+        for index in range(size)
+    )
+    return User.objects.filter(username__startswith='bench-notify-')
+
+
+def notify_each(users):
+    for user in users:
+        add_user_notification(user, DESCRIPTION, NotificationSeverity.INFO,
+                              NotificationSource.GENERIC, 0)
+
+
+def notify_bulk(users):
+    NotificationService.add_multiuser_notification(users, DESCRIPTION, NotificationSeverity.INFO,
+                                                   NotificationSource.GENERIC, 0)
+
+
+def queue_and_deliver(size):
+    users = make_recipients(size)
+    notify_bulk(users)
+    return size
+
+
+def deliver_queued(size):
+    while deliver_queued_emails(batch_size=size)[0]:
+        pass
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+def run(sizes=None, repeat=1):
+    rows = []
+
+    for size in sizes or DEFAULT_SIZES:
+        for (case, func) in (
+            ('per-recipient', notify_each),
+            ('fan-out', notify_bulk),
+        ):
+            (seconds, queries) = measure(func, repeat, lambda: make_recipients(size))
+            rows.append(result('notifications', case, size, seconds, queries))
+
+        (seconds, queries) = measure(deliver_queued, repeat, lambda: queue_and_deliver(size))
+        rows.append(result('notifications', 'outbox delivery', size, seconds, queries))
+
+    return rows
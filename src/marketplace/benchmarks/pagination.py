@@ -0,0 +1,54 @@
+"""Retrieval of the last page of a user's notifications: by page number
+(COUNT plus OFFSET) versus by cursor (keyset seek).
+
+"""
+from django.core.paginator import Paginator
+
+from marketplace.models.user import User, UserNotification
+from marketplace.views.common import CursorPaginator
+
+from .common import measure, result
+
+
+DEFAULT_SIZES = (1000, 100000)
+
+PAGE_SIZE = 10
+
+
+def seed_notifications(count):
+    user = User.objects.create(username='bench-pagination')
+    UserNotification.objects.bulk_create(
+        UserNotification(user=user, notification_description=f'Notification {index}', is_read=False)
+        for index in range(count)
+    )
+    return UserNotification.objects.filter(user=user).order_by('-notification_date')
+
+
+def run(sizes=None, repeat=1):
+    rows = []
+
+    for size in sizes or DEFAULT_SIZES:
+        def offset_setup():
+            return seed_notifications(size)
+
+        def offset_page(notifications):
+            # (as upon each request, the paginator counts the notifications)
+            paginator = Paginator(notifications, PAGE_SIZE)
+            list(paginator.get_page(-(-size // PAGE_SIZE)))
+
+        def cursor_setup():
+            paginator = CursorPaginator(seed_notifications(size), PAGE_SIZE)
+            last = paginator.object_list.order_by('-notification_date', '-pk')[size - PAGE_SIZE - 1]
+            return (paginator, paginator.encode_cursor(CursorPaginator.NEXT, last))
+
+        def cursor_page(setup):
+            (paginator, cursor) = setup
+            list(paginator.get_page(cursor))
+
+        (seconds, queries) = measure(offset_page, repeat, offset_setup)
+        rows.append(result('pagination', 'last page by number', size, seconds, queries))
+
+        (seconds, queries) = measure(cursor_page, repeat, cursor_setup)
+        rows.append(result('pagination', 'last page by cursor', size, seconds, queries))
+
+    return rows
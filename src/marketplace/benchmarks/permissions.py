@@ -0,0 +1,74 @@
+"""Project pages, rendered for the project owner, with and without role
+snapshots shared among the page's permission checks.
+
+"""
+from datetime import date
+
+from django.test import Client, modify_settings, override_settings
+from django.urls import reverse
+
+from marketplace.domain import marketplace
+from marketplace.domain.org import OrganizationService
+from marketplace.domain.proj import ProjectService
+from marketplace.models.org import Organization
+from marketplace.models.proj import Project
+from marketplace.models.user import User
+
+from .common import measure, result
+
+
+VIEWS = (
+    ('ProjectView', 'marketplace:proj_info'),
+    ('ProjectTaskIndex', 'marketplace:proj_task_list'),
+    ('project_channel_comments_view', 'marketplace:proj_discussion'),
+)
+
+
+def make_project():
+    owner = User(username='bench-owner', email='bench-owner@example.com')
+    marketplace.user.add_user(owner, 'organization')
+
+    organization = Organization(name='Benchmark organization')
+    OrganizationService.create_organization(owner, organization)
+
+    project = Project(
+        name='Benchmark project',
+        short_summary='Benchmark project',
+        intended_start_date=date.today(),
+        intended_end_date=date.today(),
+    )
+    OrganizationService.create_project(owner, organization.id, project)
+    ProjectService.publish_project(owner, project.id, project)
+
+    channel = ProjectService.get_project_channels(owner, project).first()
+
+    client = Client()
+    client.force_login(owner)
+
+    return (client, project, channel)
+
+
+def get_view(url_name):
+    def func(setup):
+        (client, project, channel) = setup
+        args = [project.id, channel.id] if url_name == 'marketplace:proj_discussion' else [project.id]
+        client.get(reverse(url_name, args=args))
+
+    return func
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+def run(sizes=None, repeat=1):
+    rows = []
+
+    for (view_name, url_name) in VIEWS:
+        with modify_settings(MIDDLEWARE={
+            'remove': 'marketplace.middleware.role_snapshot_middleware',
+        }):
+            (seconds, queries) = measure(get_view(url_name), repeat, make_project)
+        rows.append(result('permissions', f'{view_name} (per-check)', 1, seconds, queries))
+
+        (seconds, queries) = measure(get_view(url_name), repeat, make_project)
+        rows.append(result('permissions', f'{view_name} (snapshot)', 1, seconds, queries))
+
+    return rows
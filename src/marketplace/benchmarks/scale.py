@@ -0,0 +1,90 @@
+"""Key views and domain functions, against a graph seeded at production
+scale (see: ``manage.py seed_scale``).
+
+Unlike other suites, this one seeds nothing itself: it measures the
+database as found, acting as the seeded graph's busiest owner and
+volunteer. The reported size is the number of projects in the database
+(requested sizes are ignored).
+
+"""
+from django.core.management.base import CommandError
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from marketplace.domain import marketplace
+from marketplace.domain.user import UserService
+from marketplace.models.proj import Project, ProjectStatus
+from marketplace.models.user import User
+
+from .common import measure, result, rolled_back
+
+
+PREFIX = 'scale'
+
+
+def busiest_user(kind, related_name):
+    user = (
+        User.objects
+        .filter(username__startswith=f'{PREFIX}-{kind}-')
+        .annotate(activity=Count(related_name))
+        .order_by('-activity', 'id')
+        .first()
+    )
+    if user is None:
+        raise CommandError(f"no seeded graph found: run manage.py seed_scale (with --prefix {PREFIX})")
+    return user
+
+
+def client_for(user):
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def get_view(client, url_name, *args, query=''):
+    url = reverse(url_name, args=args) + query
+
+    def func():
+        response = client.get(url)
+        assert response.status_code == 200, (url, response.status_code)
+
+    return func
+
+
+@override_settings(ALLOWED_HOSTS=['*'])
+def run(sizes=None, repeat=1):
+    # (such that the clients' sessions, too, are rolled back)
+    with rolled_back():
+        return run_cases(repeat)
+
+
+def run_cases(repeat):
+    owner = busiest_user('owner', 'projectrole')
+    volunteer = busiest_user('volunteer', 'projecttaskrole')
+    project = (
+        Project.objects
+        .filter(projectrole__user=owner, status=ProjectStatus.IN_PROGRESS)
+        .first() or Project.objects.filter(projectrole__user=owner).first()
+    )
+
+    (owner_client, volunteer_client) = (client_for(owner), client_for(volunteer))
+
+    cases = (
+        ('project list search', get_view(volunteer_client, 'marketplace:proj_list', query='?projname=data')),
+        ('volunteer dashboard', get_view(volunteer_client, 'marketplace:user_dashboard')),
+        ('owner dashboard', get_view(owner_client, 'marketplace:user_dashboard')),
+        ('project info', get_view(owner_client, 'marketplace:proj_info', project.id)),
+        ('volunteer list', get_view(owner_client, 'marketplace:volunteer_list')),
+        # (uncached)
+        ('featured volunteer (leaderboard)', UserService.get_featured_volunteer.__wrapped__),
+        ('platform statistics', marketplace.stats.refresh_platform_statistics),
+    )
+
+    size = Project.objects.count()
+    rows = []
+    for (case, func) in cases:
+        (seconds, queries) = measure(func, repeat)
+        rows.append(result('scale', case, size, seconds, queries))
+
+    return rows
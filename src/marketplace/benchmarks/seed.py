@@ -0,0 +1,448 @@
+"""Bulk generation of synthetic data for benchmarks."""
+import collections
+import itertools
+import random
+from datetime import date, datetime, time, timedelta, timezone
+
+from django.contrib.auth.hashers import make_password
+from django.db.models import Max
+
+from marketplace.domain import marketplace
+from marketplace.domain.templates import DEFAULT_PROJECT_TEMPLATE, ProjectTemplate
+from marketplace.models.org import Organization, OrganizationRole
+from marketplace.models.proj import (
+    Project, ProjectStatus, ProjectTask, ProjectComment, ProjectDiscussionChannel,
+    ProjectFollower, ProjectRole, ProjectScope, ProjectSocialCause, ProjectTaskRequirement,
+    ProjectTaskReview, ProjectTaskRole, ProjRole, TaskRequirementImportance, TaskRole,
+    TaskStatus, VolunteerApplication,
+)
+from marketplace.models.common import OrgRole, ReviewStatus, Score, SkillLevel, SocialCause
+from marketplace.models.user import (
+    EducationLevel, NotificationSeverity, NotificationSource, Skill, User, UserBadge,
+    UserNotification, UserType, VolunteerProfile, VolunteerSkill,
+)
+
+
+PROJECT_STATUSES = (
+    ProjectStatus.NEW,
+    ProjectStatus.DESIGN,
+    ProjectStatus.WAITING_STAFF,
+    ProjectStatus.IN_PROGRESS,
+    ProjectStatus.COMPLETED,
+    ProjectStatus.DRAFT,
+)
+
+SOCIAL_CAUSES = tuple(cause for (cause, _label) in SocialCause.get_choices())
+
+SKILL_LEVELS = tuple(level for (level, _label) in SkillLevel.get_choices())
+
+
+def seed_projects(count, prefix='bench'):
+    """Create an organization with ``count`` projects (of varied status and
+    cause), each with a single task.
+
+    """
+    organization = Organization.objects.create(name=f'{prefix} organization')
+
+    Project.objects.bulk_create(
+        Project(
+            name=f'{prefix} project {index}',
+            short_summary=f'Synthetic project number {index}',
+            status=PROJECT_STATUSES[index % len(PROJECT_STATUSES)],
+            project_cause=SOCIAL_CAUSES[index % len(SOCIAL_CAUSES)],
+            intended_start_date=date.today(),
+            intended_end_date=date.today(),
+            organization=organization,
+        )
+        for index in range(count)
+    )
+
+    projects = Project.objects.filter(organization=organization)
+
+    ProjectTask.objects.bulk_create(
+        ProjectTask(
+            name='Task',
+            short_summary='Synthetic task',
+            description='Synthetic task',
+            onboarding_instructions='',
+            business_area='',
+            percentage_complete=0,
+            accepting_volunteers=False,
+            estimated_start_date=date.today(),
+            estimated_end_date=date.today(),
+            project_id=project_id,
+        )
+        for project_id in projects.values_list('id', flat=True)
+    )
+
+    return organization
+
+
+# Production-scale graphs (see: manage.py seed_scale) #
+
+# (the password of every seeded user)
+SCALE_PASSWORD = 'scale'
+
+SCALE_PROJECT_STATUSES = (
+    (ProjectStatus.DRAFT, 5),
+    (ProjectStatus.NEW, 10),
+    (ProjectStatus.DESIGN, 10),
+    (ProjectStatus.WAITING_STAFF, 20),
+    (ProjectStatus.IN_PROGRESS, 25),
+    (ProjectStatus.COMPLETED, 30),
+)
+
+# stages of the four tasks of the default template (scoping, project
+# management, domain work and QA), by status of their project
+TASK_STAGES = {
+    ProjectStatus.DRAFT: (TaskStatus.DRAFT,) * 4,
+    ProjectStatus.NEW: (TaskStatus.NOT_STARTED,) + (TaskStatus.DRAFT,) * 3,
+    ProjectStatus.DESIGN: (TaskStatus.STARTED,) + (TaskStatus.DRAFT,) * 3,
+    ProjectStatus.WAITING_STAFF: (TaskStatus.COMPLETED,) + (TaskStatus.NOT_STARTED,) * 3,
+    ProjectStatus.IN_PROGRESS: (TaskStatus.COMPLETED,) + (TaskStatus.STARTED,) * 3,
+    ProjectStatus.COMPLETED: (TaskStatus.COMPLETED,) * 4,
+}
+
+WORDS = (
+    'data', 'model', 'survey', 'city', 'health', 'school', 'transit', 'energy',
+    'analysis', 'dashboard', 'pipeline', 'outcomes', 'residents', 'services',
+    'records', 'predict', 'validate', 'deploy', 'review', 'feature', 'risk',
+    'matching', 'equity', 'forecast', 'clinic', 'housing', 'water', 'safety',
+)
+
+
+class ScaleGraph:
+    """Generator of a synthetic graph of organizations, projects and
+    volunteers, inserted in bulk.
+
+    The graph is determined by its ``seed`` and ``as_of`` date (to which
+    all dates are relative).
+
+    """
+    def __init__(self, seed=0, as_of=None, prefix='scale', batch_size=5000):
+        self.random = random.Random(seed)
+        self.as_of = as_of or date.today()
+        self.prefix = prefix
+        self.batch_size = batch_size
+        self.password = make_password(SCALE_PASSWORD, salt=f'{prefix}{seed}')
+        self.counts = collections.OrderedDict()
+
+    def day(self, max_age=730):
+        return self.as_of - timedelta(days=self.random.randrange(max_age))
+
+    def moment(self, max_age=730):
+        return datetime.combine(self.day(max_age), time(12), tzinfo=timezone.utc)
+
+    def text(self, word_count):
+        return ' '.join(self.random.choice(WORDS) for _ in range(word_count)).capitalize() + '.'
+
+    def create(self, model, objects):
+        """Insert the given objects in batches, returning the IDs of
+        those inserted (in order).
+
+        """
+        last_id = model.objects.aggregate(last_id=Max('id'))['last_id'] or 0
+
+        batch = []
+        for obj in objects:
+            batch.append(obj)
+            if len(batch) == self.batch_size:
+                model.objects.bulk_create(batch)
+                batch = []
+        model.objects.bulk_create(batch)
+
+        object_ids = list(
+            model.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)
+        )
+        self.counts[model._meta.verbose_name_plural] = (
+            self.counts.get(model._meta.verbose_name_plural, 0) + len(object_ids)
+        )
+        return object_ids
+
+    def create_users(self, kind, count, user_type):
+        return self.create(User, (
+            User(
+                username=f'{self.prefix}-{kind}-{index}',
+                email=f'{self.prefix}-{kind}-{index}@example.org',
+                first_name=kind.capitalize(),
+                last_name=str(index),
+                password=self.password,
+                initial_type=user_type,
+                date_joined=self.moment(),
+            )
+            for index in range(count)
+        ))
+
+    def seed(self, projects, volunteers, comments, notifications):
+        owner_ids = self.seed_organizations(max(1, projects // 10))
+        volunteer_ids = self.seed_volunteers(volunteers)
+        tasks = self.seed_projects(projects, owner_ids)
+        self.seed_applications(tasks, volunteer_ids)
+        self.seed_comments(comments, owner_ids + volunteer_ids)
+        self.seed_notifications(notifications, owner_ids + volunteer_ids)
+
+        # badges (and reputations) follow from the tasks completed and reviewed
+        # (in batches whose parameters suit any database)
+        for offset in range(0, len(volunteer_ids), 500):
+            marketplace.reputation.update_reputations(volunteer_ids[offset:offset + 500],
+                                                      notify=False)
+        self.counts['user badges'] = UserBadge.objects.filter(user__in=User.objects.filter(
+            username__startswith=f'{self.prefix}-')).count()
+
+        return self.counts
+
+    def seed_organizations(self, count):
+        owner_ids = self.create_users('owner', count, UserType.ORGANIZATION)
+
+        organization_ids = self.create(Organization, (
+            Organization(
+                name=f'{self.prefix} organization {index}',
+                short_summary=self.text(12),
+                description=self.text(60),
+                street_address=f'{index} Main Street',
+                city='Chicago',
+                state='IL',
+                zipcode='60601',
+                country='US',
+                main_cause=self.random.choice(SOCIAL_CAUSES),
+            )
+            for index in range(count)
+        ))
+        self.organization_owners = dict(zip(organization_ids, owner_ids))
+
+        self.create(OrganizationRole, (
+            OrganizationRole(role=OrgRole.ADMINISTRATOR, user_id=owner_id,
+                             organization_id=organization_id)
+            for (organization_id, owner_id) in self.organization_owners.items()
+        ))
+
+        return owner_ids
+
+    def seed_volunteers(self, count):
+        volunteer_ids = self.create_users('volunteer', count, UserType.VOLUNTEER)
+
+        profile_ids = self.create(VolunteerProfile, (
+            VolunteerProfile(
+                user_id=user_id,
+                volunteer_status=(
+                    ReviewStatus.ACCEPTED if self.random.random() < 0.9 else ReviewStatus.NEW
+                ),
+                is_edited=True,
+                cover_letter=self.text(40),
+                degree_level=self.random.choice(
+                    (EducationLevel.BACHELORS, EducationLevel.MASTERS, EducationLevel.PHD)
+                ),
+                weekly_availability_hours=self.random.randint(2, 20),
+            )
+            for user_id in volunteer_ids
+        ))
+
+        # (creation dates are otherwise those of the insert)
+        profiles = list(VolunteerProfile.objects.filter(id__in=profile_ids).only('id'))
+        for profile in profiles:
+            profile.creation_date = self.moment()
+        VolunteerProfile.objects.bulk_update(profiles, ['creation_date'],
+                                             batch_size=self.batch_size)
+
+        self.skill_ids = list(Skill.objects.order_by('id').values_list('id', flat=True))
+        if self.skill_ids:
+            self.create(VolunteerSkill, (
+                VolunteerSkill(user_id=user_id, skill_id=skill_id,
+                               level=self.random.choice(SKILL_LEVELS))
+                for user_id in volunteer_ids
+                for skill_id in self.random.sample(self.skill_ids, min(3, len(self.skill_ids)))
+            ))
+
+        return volunteer_ids
+
+    def seed_projects(self, count, owner_ids):
+        (statuses, weights) = zip(*SCALE_PROJECT_STATUSES)
+        organization_ids = list(self.organization_owners)
+
+        project_statuses = self.random.choices(statuses, weights, k=count)
+        project_ids = self.create(Project, (
+            Project(
+                name=f'{self.prefix} project {index}: {self.text(3)[:-1]}',
+                short_summary=self.text(20),
+                motivation=self.text(80),
+                solution_description=self.text(80),
+                project_impact=self.text(40),
+                stakeholders=self.text(20),
+                available_staff=self.text(20),
+                project_cause=self.random.choice(SOCIAL_CAUSES),
+                status=status,
+                intended_start_date=self.day(),
+                intended_end_date=self.as_of + timedelta(days=self.random.randrange(365)),
+                organization_id=organization_ids[index % len(organization_ids)],
+            )
+            for (index, status) in enumerate(project_statuses)
+        ))
+
+        self.project_ids = project_ids
+        projects = list(
+            Project.objects.filter(id__in=project_ids).only('id', 'organization_id', 'status')
+        )
+        for project in projects:
+            project.creation_date = self.moment()
+        Project.objects.bulk_update(projects, ['creation_date'], batch_size=self.batch_size)
+
+        self.create(ProjectSocialCause, (
+            ProjectSocialCause(project_id=project.id,
+                               social_cause=self.random.choice(SOCIAL_CAUSES))
+            for project in projects
+        ))
+        self.create(ProjectRole, (
+            ProjectRole(project_id=project.id,
+                        user_id=self.organization_owners[project.organization_id],
+                        role=ProjRole.OWNER)
+            for project in projects
+        ))
+        self.create(ProjectScope, (
+            ProjectScope(
+                project_id=project.id,
+                author_id=self.organization_owners[project.organization_id],
+                scope_goals=self.text(60),
+                scope_available_data=self.text(60),
+                version_notes="Initial scope at project creation time.",
+            )
+            for project in projects
+        ))
+
+        # tasks and channels are those of projects created from the default
+        # template, but for the progress of their tasks
+        template = ProjectTemplate(DEFAULT_PROJECT_TEMPLATE)
+        project_tasks = [template.build_tasks(project) for project in projects]
+        for (project, tasks_of_project) in zip(projects, project_tasks):
+            for (task, stage) in zip(tasks_of_project, TASK_STAGES[project.status]):
+                task.stage = stage
+                task.percentage_complete = 1 if stage == TaskStatus.COMPLETED else 0
+                task.accepting_volunteers = stage == TaskStatus.NOT_STARTED
+                task.estimated_start_date = self.day()
+                task.estimated_end_date = self.as_of + timedelta(days=self.random.randrange(60))
+                if stage in (TaskStatus.STARTED, TaskStatus.COMPLETED):
+                    task.actual_start_date = self.day()
+                if stage == TaskStatus.COMPLETED:
+                    task.actual_end_date = self.as_of
+                task.render_markdown()
+
+        task_ids = self.create(ProjectTask, itertools.chain.from_iterable(project_tasks))
+        for (task, task_id) in zip(itertools.chain.from_iterable(project_tasks), task_ids):
+            task.id = task_id
+        tasks = [
+            (task.id, project, task.name, task.stage)
+            for (project, tasks_of_project) in zip(projects, project_tasks)
+            for task in tasks_of_project
+        ]
+
+        if self.skill_ids:
+            self.create(ProjectTaskRequirement, (
+                ProjectTaskRequirement(
+                    task_id=task_id,
+                    skill_id=skill_id,
+                    level=self.random.choice(SKILL_LEVELS),
+                    importance=TaskRequirementImportance.REQUIRED,
+                )
+                for (task_id, _project, _name, _stage) in tasks
+                for skill_id in self.random.sample(self.skill_ids, min(2, len(self.skill_ids)))
+            ))
+
+        self.create(ProjectDiscussionChannel, (
+            channel
+            for (project, tasks_of_project) in zip(projects, project_tasks)
+            for channel in template.build_channels(project, tasks_of_project)
+        ))
+
+        self.create(ProjectFollower, (
+            ProjectFollower(project_id=project.id, user_id=user_id)
+            for project in projects
+            for user_id in self.random.sample(owner_ids,
+                                              min(len(owner_ids), self.random.randrange(4)))
+        ))
+
+        return tasks
+
+    def seed_applications(self, tasks, volunteer_ids):
+        (applications, roles, reviews) = ([], [], [])
+
+        for (task_id, project, _name, stage) in tasks:
+            if stage == TaskStatus.DRAFT or not volunteer_ids:
+                continue
+
+            reviewer_id = self.organization_owners[project.organization_id]
+            applicant_ids = self.random.sample(volunteer_ids,
+                                               min(len(volunteer_ids), self.random.randint(1, 5)))
+
+            for (index, volunteer_id) in enumerate(applicant_ids):
+                if stage == TaskStatus.NOT_STARTED:
+                    status = ReviewStatus.NEW
+                else:
+                    status = ReviewStatus.ACCEPTED if index == 0 else ReviewStatus.REJECTED
+
+                applications.append(VolunteerApplication(
+                    task_id=task_id,
+                    volunteer_id=volunteer_id,
+                    reviewer_id=None if status == ReviewStatus.NEW else reviewer_id,
+                    status=status,
+                    volunteer_application_letter=self.text(40),
+                    resolution_date=None if status == ReviewStatus.NEW else self.moment(),
+                ))
+
+                if status == ReviewStatus.ACCEPTED:
+                    roles.append(ProjectTaskRole(task_id=task_id, user_id=volunteer_id,
+                                                 role=TaskRole.VOLUNTEER))
+
+                    if stage == TaskStatus.COMPLETED:
+                        reviews.append(ProjectTaskReview(
+                            task_id=task_id,
+                            volunteer_id=volunteer_id,
+                            reviewer_id=reviewer_id,
+                            volunteer_comment=self.text(20),
+                            volunteer_effort_hours=self.random.randint(5, 80),
+                            review_result=ReviewStatus.ACCEPTED,
+                            review_score=self.random.randint(Score.THREE_STARS, Score.FIVE_STARS),
+                            review_date=self.moment(),
+                        ))
+
+        self.create(VolunteerApplication, applications)
+        self.create(ProjectTaskRole, roles)
+        self.create(ProjectTaskReview, reviews)
+
+    def seed_comments(self, count, user_ids):
+        channel_ids = list(ProjectDiscussionChannel.objects.filter(
+            project__name__startswith=f'{self.prefix} project ',
+        ).order_by('id').values_list('id', flat=True))
+
+        if not channel_ids or not user_ids:
+            return
+
+        self.create(ProjectComment, (
+            ProjectComment(
+                channel_id=self.random.choice(channel_ids),
+                author_id=self.random.choice(user_ids),
+                comment=self.text(self.random.randint(5, 60)),
+            )
+            for _ in range(count)
+        ))
+
+    def seed_notifications(self, count, user_ids):
+        if not user_ids:
+            return
+
+        sources = (
+            NotificationSource.PROJECT,
+            NotificationSource.TASK,
+            NotificationSource.VOLUNTEER_APPLICATION,
+            NotificationSource.BADGE,
+        )
+
+        self.create(UserNotification, (
+            UserNotification(
+                user_id=self.random.choice(user_ids),
+                notification_description=self.text(12),
+                is_read=self.random.random() < 0.8,
+                severity=NotificationSeverity.INFO,
+                source=self.random.choice(sources),
+                target_id=self.random.randrange(1, 1000),
+            )
+            for _ in range(count)
+        ))
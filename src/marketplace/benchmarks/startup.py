@@ -0,0 +1,58 @@
+"""Process start-up: ``manage.py check``, and the boot of a web worker
+(import of the WSGI application, as by each gunicorn worker).
+
+Each is timed over fresh processes, in the environment of the benchmark
+(such that, e.g., DEBUG and EC2_HOST_DISCOVERY apply as configured). The
+problem size is the number of processes started per run.
+
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+
+from .common import result
+
+
+DEFAULT_SIZES = (5,)
+
+# (project.wsgi sets up Django and loads the middleware)
+WORKER_BOOT = 'import project.wsgi'
+
+
+def commands():
+    manage_path = os.path.join(settings.BASE_DIR, 'manage.py')
+
+    return (
+        ('manage.py check', [sys.executable, manage_path, 'check']),
+        ('worker boot', [sys.executable, '-c', WORKER_BOOT]),
+    )
+
+
+def time_process(command):
+    start = time.perf_counter()
+    subprocess.run(
+        command,
+        cwd=settings.BASE_DIR,
+        check=True,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    return time.perf_counter() - start
+
+
+def run(sizes=None, repeat=1):
+    rows = []
+
+    for size in sizes or DEFAULT_SIZES:
+        for (case, command) in commands():
+            timings = [
+                statistics.median([time_process(command) for _ in range(size)])
+                for _ in range(repeat)
+            ]
+            rows.append(result('startup', case, size, statistics.median(timings), 0))
+
+    return rows
@@ -1,5 +1,7 @@
 from django.conf import settings
 
+from marketplace.domain import marketplace
+
 
 Empty = object()
 
@@ -19,3 +21,14 @@ def include_settings(request):
             if value is not Empty
         }
     }
+
+
+def notifications(request):
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return {}
+
+    # (a callable, such that the count is retrieved only by templates which use it)
+    return {
+        'unread_notification_count': lambda: marketplace.notification.get_unread_count(user),
+    }
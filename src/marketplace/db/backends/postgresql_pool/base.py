@@ -0,0 +1,209 @@
+"""PostgreSQL, with connections drawn from a pool shared by the threads
+of the process (see: ``DATABASE_POOL``).
+
+A request's connection is taken from the pool upon its first query, and
+returned to the pool (rather than closed) at the end of the request --
+such that threaded workers needn't each hold a connection of their own,
+nor open a new one per request.
+
+At most ``DATABASE_POOL_SIZE`` connections are open at once; threads
+wait (up to ``DATABASE_POOL_TIMEOUT`` seconds) for a connection to be
+returned. Pooled connections are recycled after ``DATABASE_CONN_MAX_AGE``
+seconds, and (under ``DATABASE_CONN_HEALTH_CHECKS``) checked before reuse.
+
+Pools are created lazily, and so are private to each (forked) worker
+process.
+
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db.backends.postgresql import base
+from django.db.utils import OperationalError
+from psycopg2 import extensions
+
+from marketplace.db.connections import LOG, METRICS
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+class ConnectionPool:
+
+    def __init__(self, connect, max_size, max_age, timeout):
+        self.connect = connect
+        self.max_size = max_size
+        self.max_age = max_age
+        self.timeout = timeout
+
+        # idle connections, and when each was opened (by time.monotonic)
+        self.idle = []
+        self.size = 0
+        self.condition = threading.Condition()
+
+    def get(self):
+        """Check out a connection.
+
+        Returns the connection, when it was opened, and whether it was
+        reused from the pool.
+
+        """
+        deadline = time.monotonic() + self.timeout
+        expired = []
+
+        with self.condition:
+            while True:
+                while self.idle:
+                    (connection, opened_at) = self.idle.pop()
+                    if self.max_age is not None and time.monotonic() - opened_at > self.max_age:
+                        expired.append(connection)
+                        self.size -= 1
+                    else:
+                        break
+                else:
+                    connection = None
+
+                if connection is not None or self.size < self.max_size:
+                    break
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeout(f"no database connection available after {self.timeout}s "
+                                      f"(pool size: {self.max_size})")
+                self.condition.wait(remaining)
+
+            if connection is None:
+                self.size += 1
+
+        for expired_connection in expired:
+            self.close(expired_connection)
+
+        if connection is not None:
+            return (connection, opened_at, True)
+
+        try:
+            connection = self.connect()
+        except BaseException:
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+            raise
+
+        return (connection, time.monotonic(), False)
+
+    def put(self, connection, opened_at, discard=False):
+        """Return a checked-out connection to the pool (rolling back any
+        transaction left open), or discard it.
+
+        """
+        if not discard:
+            discard = connection.closed or not self.reset(connection)
+
+        if discard:
+            self.close(connection)
+            with self.condition:
+                self.size -= 1
+                self.condition.notify()
+        else:
+            with self.condition:
+                self.idle.append((connection, opened_at))
+                self.condition.notify()
+
+    @staticmethod
+    def reset(connection):
+        status = connection.get_transaction_status()
+        if status == extensions.TRANSACTION_STATUS_IDLE:
+            return True
+        if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+
+        try:
+            connection.rollback()
+        except Exception:
+            return False
+        return True
+
+    @staticmethod
+    def close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+POOLS = {}
+POOLS_LOCK = threading.Lock()
+
+
+def get_pool(key, connect):
+    with POOLS_LOCK:
+        try:
+            return POOLS[key]
+        except KeyError:
+            pool = POOLS[key] = ConnectionPool(
+                connect,
+                max_size=settings.DATABASE_POOL_SIZE,
+                max_age=settings.DATABASE_CONN_MAX_AGE,
+                timeout=settings.DATABASE_POOL_TIMEOUT,
+            )
+            return pool
+
+
+def is_alive(connection):
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        if not connection.autocommit:
+            connection.rollback()
+    except base.Database.Error:
+        return False
+    return True
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+
+    pooled = True
+
+    def get_new_connection(self, conn_params):
+        # (connections to other databases -- e.g. to the "postgres"
+        # database, upon test database creation -- are pooled apart)
+        self.pool = get_pool(
+            (self.alias, repr(sorted(conn_params.items()))),
+            lambda: base.Database.connect(**conn_params),
+        )
+
+        while True:
+            (connection, self.pool_opened_at, reused) = self.pool.get()
+
+            if reused and settings.DATABASE_CONN_HEALTH_CHECKS and not is_alive(connection):
+                self.pool.put(connection, self.pool_opened_at, discard=True)
+                METRICS.record_discarded()
+                LOG.warning("discarded unusable pooled database connection [alias: %s]", self.alias)
+            else:
+                break
+
+        if reused:
+            METRICS.record_reused(time.monotonic() - self.pool_opened_at)
+        else:
+            METRICS.record_opened()
+            LOG.debug("database connection opened [alias: %s] [metrics: %s]",
+                      self.alias, METRICS.snapshot())
+
+        # (as the base backend)
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+
+        return connection
+
+    def _close(self):
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.put(self.connection, self.pool_opened_at)
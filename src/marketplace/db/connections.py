@@ -0,0 +1,111 @@
+"""Database connection lifecycle: health checks and metrics.
+
+Under ``CONN_MAX_AGE`` (see: ``DATABASE_CONN_MAX_AGE``), each thread keeps
+its database connection open across requests, rather than paying for a
+new connection (and its TLS handshake and authentication) per request.
+Django closes only those persistent connections which have expired, or
+which have raised errors; a connection which died while idle (upon a
+database restart, or dropped by a proxy) would fail the next request to
+use it. Under ``DATABASE_CONN_HEALTH_CHECKS``, a connection reused at the
+start of a request is first checked, and replaced if unusable.
+
+Connection metrics -- connections opened, reused and discarded, and the
+age of connections upon reuse -- are collected per process (see:
+``METRICS``).
+
+"""
+import logging
+import threading
+import time
+import weakref
+
+from django.conf import settings
+from django.core.signals import request_started
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+LOG = logging.getLogger(__name__)
+
+
+class ConnectionMetrics:
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.opened = 0
+            self.reused = 0
+            self.discarded = 0
+            self.total_age = 0.0
+            self.max_age = 0.0
+
+    def record_opened(self):
+        with self.lock:
+            self.opened += 1
+
+    def record_reused(self, age):
+        with self.lock:
+            self.reused += 1
+            self.total_age += age
+            self.max_age = max(self.max_age, age)
+
+    def record_discarded(self):
+        with self.lock:
+            self.discarded += 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                'opened': self.opened,
+                'reused': self.reused,
+                'discarded': self.discarded,
+                'average_age': self.total_age / self.reused if self.reused else None,
+                'max_age': self.max_age,
+            }
+
+
+METRICS = ConnectionMetrics()
+
+# when each connection wrapper's current connection was opened
+# (by time.monotonic)
+OPENED_AT = weakref.WeakKeyDictionary()
+
+
+@receiver(connection_created)
+def record_connection_created(sender, connection, **kwargs):
+    # (pooled connections are accounted for by their pool)
+    if getattr(connection, 'pooled', False):
+        return
+
+    OPENED_AT[connection] = time.monotonic()
+    METRICS.record_opened()
+
+    LOG.debug("database connection opened [alias: %s] [metrics: %s]",
+              connection.alias, METRICS.snapshot())
+
+
+@receiver(request_started)
+def check_reused_connections(**kwargs):
+    """Check the health of the persistent connections about to be reused
+    by a request.
+
+    (Connected after -- and so run after -- Django's own handler, which
+    closes expired connections.)
+
+    """
+    now = time.monotonic()
+
+    for connection in connections.all():
+        if connection.connection is None or connection.in_atomic_block:
+            continue
+
+        if settings.DATABASE_CONN_HEALTH_CHECKS and not connection.is_usable():
+            connection.close()
+            METRICS.record_discarded()
+            LOG.warning("discarded unusable database connection [alias: %s]", connection.alias)
+        else:
+            METRICS.record_reused(now - OPENED_AT.get(connection, now))
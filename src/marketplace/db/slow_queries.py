@@ -0,0 +1,172 @@
+"""Slow-query log, attributing each query to its caller in the domain.
+
+Under ``SLOW_QUERY_THRESHOLD``, every database connection is given an
+execute wrapper, which logs those queries slower than the threshold (in
+seconds) to ``SLOW_QUERY_LOG`` -- one JSON object per line:
+
+    {"time": "...", "duration": 0.412, "fingerprint": "3f2a...",
+     "sql": "SELECT ... WHERE ... IN (...)",
+     "caller": "proj.ProjectService.get_user_projects_with_pending_task_requests",
+     "view": "marketplace:user_dashboard", "alias": "default"}
+
+Queries are grouped by ``fingerprint``: their SQL with literals and
+parameter lists normalized. The ``caller`` is the outermost function of
+``marketplace/domain`` on the stack -- that called by the view (or
+command) -- or, for queries issued elsewhere, the innermost function of
+the marketplace app. (Lazy querysets returned by the domain are evaluated
+upon rendering: their queries are attributed to their views alone -- or,
+those of class-based views, whose responses are rendered after the view
+returns, to no caller at all.) See: ``manage.py slow_query_report``.
+
+"""
+import datetime
+import hashlib
+import inspect
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+import marketplace
+
+
+LOG = logging.getLogger(__name__)
+
+APP_DIR = os.path.dirname(marketplace.__file__)
+DOMAIN_DIR = os.path.join(APP_DIR, 'domain')
+# (modules whose functions are not taken as callers: wrappers and
+# dispatchers of the functions which are)
+EXCLUDED_FILES = (
+    os.path.dirname(__file__),
+    os.path.join(APP_DIR, 'instrumentation.py'),
+    os.path.join(APP_DIR, 'middleware.py'),
+    os.path.join(DOMAIN_DIR, 'caching.py'),
+    os.path.join(DOMAIN_DIR, 'jobs.py'),
+)
+
+NORMALIZATIONS = (
+    (re.compile(r"'(?:[^']|'')*'"), '?'),                      # string literals
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),                    # numeric literals
+    (re.compile(r'%s'), '?'),                                   # parameters
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)'), '(...)'),       # lists thereof
+    (re.compile(r'\s+'), ' '),
+)
+
+local = threading.local()
+
+# qualified names of callers, by code object
+CALLER_NAMES = {}
+
+
+def normalize_sql(sql):
+    for (pattern, replacement) in NORMALIZATIONS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def fingerprint(normalized_sql):
+    return hashlib.md5(normalized_sql.encode()).hexdigest()[:12]
+
+
+def caller_name(frame):
+    """The name of the frame's function, qualified by its class (if any),
+    and by its module (relative to the marketplace app).
+
+    """
+    code = frame.f_code
+    name = CALLER_NAMES.get(code)
+
+    if name is None:
+        module_name = frame.f_globals.get('__name__', '')
+        qualname = code.co_name
+
+        for value in list(frame.f_globals.values()):
+            if inspect.isclass(value) and value.__module__ == module_name:
+                for attribute in vars(value).values():
+                    func = inspect.unwrap(getattr(attribute, '__func__', attribute))
+                    if getattr(func, '__code__', None) is code:
+                        qualname = f'{value.__name__}.{code.co_name}'
+                        break
+
+        if module_name.startswith('marketplace.'):
+            module_name = module_name[len('marketplace.'):]
+        if module_name.startswith('domain.'):
+            module_name = module_name[len('domain.'):]
+
+        name = CALLER_NAMES[code] = f'{module_name}.{qualname}'
+
+    return name
+
+
+def find_caller():
+    domain_frame = app_frame = None
+
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(EXCLUDED_FILES):
+            pass
+        elif filename.startswith(DOMAIN_DIR):
+            domain_frame = frame
+        elif app_frame is None and filename.startswith(APP_DIR):
+            app_frame = frame
+        frame = frame.f_back
+
+    frame = domain_frame or app_frame
+    return None if frame is None else caller_name(frame)
+
+
+def current_view_name():
+    request = getattr(local, 'request', None)
+    resolver_match = request and request.resolver_match
+    return resolver_match.view_name if resolver_match else None
+
+
+class CurrentRequest:
+    """Context manager associating the queries of the current thread with
+    the given request.
+
+    """
+    def __init__(self, request):
+        self.request = request
+
+    def __enter__(self):
+        local.request = self.request
+
+    def __exit__(self, *exc_info):
+        local.request = None
+
+
+def log_slow_queries(execute, sql, params, many, context):
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        duration = time.perf_counter() - start
+
+        if duration >= settings.SLOW_QUERY_THRESHOLD:
+            normalized_sql = normalize_sql(sql)
+            LOG.info(json.dumps({
+                'time': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+                'duration': round(duration, 6),
+                'fingerprint': fingerprint(normalized_sql),
+                'sql': normalized_sql,
+                'caller': find_caller(),
+                'view': current_view_name(),
+                'alias': context['connection'].alias,
+            }))
+
+
+@receiver(connection_created)
+def install_slow_query_log(sender, connection, **kwargs):
+    # (as the outermost wrapper: others are pushed and popped by context
+    # managers, and this may be installed within one)
+    if settings.SLOW_QUERY_THRESHOLD and log_slow_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, log_slow_queries)
@@ -3,6 +3,8 @@ from namespaces import Namespace
 from .notifications import NotificationDomain
 from .user import UserDomain
 from .proj import ProjectDomain
+from .reputation import ReputationDomain
+from .stats import StatsDomain
 
 
 marketplace = MarketplaceDomain = Namespace('marketplace')
@@ -10,3 +12,5 @@ marketplace = MarketplaceDomain = Namespace('marketplace')
 MarketplaceDomain._add_(NotificationDomain)
 MarketplaceDomain._add_(UserDomain)
 MarketplaceDomain._add_(ProjectDomain)
+MarketplaceDomain._add_(ReputationDomain)
+MarketplaceDomain._add_(StatsDomain)
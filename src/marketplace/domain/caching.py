@@ -0,0 +1,129 @@
+"""Memoization of domain functions in the configured cache.
+
+For example::
+
+    @memoize(timeout=600, invalidated_by=(Project,))
+    def get_featured_project():
+        ...
+
+Cached results are dropped when any instance of a model listed in
+``invalidated_by`` is saved or deleted (or upon explicit ``invalidate()``,
+or ``invalidate_models()`` -- for changes made without signals, such as by
+``bulk_create()``).
+Invalidation is implemented by way of a "generation" token, which forms
+part of every cache key of the function -- replacing the token orphans
+all previously-cached results at once, regardless of their arguments.
+
+Note that the default (locmem) cache is per-process: under multiple
+server processes, signal-based invalidation reaches only the process in
+which the change was made, and others will serve results up to
+``timeout`` seconds old. (See ``CACHE_BACKEND`` in settings.)
+
+"""
+import collections
+import functools
+import hashlib
+import uuid
+
+from django.core.cache import caches
+from django.db.models.signals import post_delete, post_save
+
+
+CACHE_ALIAS = 'default'
+
+MISSING = object()
+
+# memoized functions, by the models whose changes invalidate them
+MEMOIZED_BY_MODEL = collections.defaultdict(list)
+
+
+class Memoized:
+
+    def __init__(self, func, timeout, version, key, invalidated_by):
+        functools.update_wrapper(self, func)
+        self.timeout = timeout
+        self.version = version
+        self.key = key
+        self.name = f'{func.__module__}.{func.__qualname__}'
+
+        for model in invalidated_by:
+            MEMOIZED_BY_MODEL[model].append(self)
+            for signal in (post_save, post_delete):
+                signal.connect(
+                    self.invalidate,
+                    sender=model,
+                    weak=False,
+                    dispatch_uid=f'memoize:{self.name}:{signal is post_save}',
+                )
+
+    @property
+    def cache(self):
+        return caches[CACHE_ALIAS]
+
+    @property
+    def generation_key(self):
+        return f'domain:{self.name}:generation'
+
+    def get_generation(self):
+        generation = self.cache.get(self.generation_key)
+        if generation is None:
+            self.cache.add(self.generation_key, uuid.uuid4().hex, None)
+            generation = self.cache.get(self.generation_key)
+        return generation
+
+    def make_key(self, *args, **kwargs):
+        key_parts = (args, sorted(kwargs.items())) if self.key is None else self.key(*args, **kwargs)
+        digest = hashlib.md5(repr(key_parts).encode()).hexdigest()
+        return f'domain:{self.name}:v{self.version}:{self.get_generation()}:{digest}'
+
+    def __call__(self, *args, **kwargs):
+        cache_key = self.make_key(*args, **kwargs)
+
+        result = self.cache.get(cache_key, MISSING)
+        if result is MISSING:
+            result = self.__wrapped__(*args, **kwargs)
+            self.cache.set(cache_key, result, self.timeout)
+
+        return result
+
+    def invalidate(self, *args, **kwargs):
+        """Drop all cached results of the function.
+
+        (Signature-compatible with signal receivers.)
+
+        """
+        self.cache.set(self.generation_key, uuid.uuid4().hex, None)
+
+
+def invalidate_models(*models):
+    """Drop all cached results of the functions invalidated by changes to
+    the given models.
+
+    """
+    for memoized in {memoized for model in models for memoized in MEMOIZED_BY_MODEL[model]}:
+        memoized.invalidate()
+
+
+def memoize(timeout=None, version=1, key=None, invalidated_by=()):
+    """Cache the results of the decorated domain function.
+
+    ``timeout``: seconds for which results are cached (``None`` for the
+    cache's default).
+
+    ``version``: part of the cache key -- increment it whenever a change to
+    the function renders its previously-cached results invalid.
+
+    ``key``: a function of the decorated function's arguments, returning
+    those parts of them which determine its result (by default, all of
+    them). For example: ``key=lambda request_user, story_count: story_count``.
+
+    ``invalidated_by``: models whose instances' being saved or deleted
+    invalidates all cached results.
+
+    Results must be picklable (and so querysets are evaluated when cached).
+
+    """
+    def decorator(func):
+        return Memoized(func, timeout, version, key, invalidated_by)
+
+    return decorator
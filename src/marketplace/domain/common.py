@@ -1,3 +1,5 @@
+from django.db import connections, transaction
+
 from marketplace.models.common import SocialCause, TaskType
 from marketplace.models.proj import ProjectStatus
 from marketplace.models.user import BadgeType
@@ -14,6 +16,50 @@ def get_field_value(object, path):
         return get_field_value(getattr(object, first), rest)
 
 
+class PrefetchPlan:
+    """The relations which the rendering of a list of objects follows.
+
+    Applied to a list's query set, each page of the list is fetched in a
+    constant number of queries, rather than in a query per row.
+
+    """
+    def __init__(self, select_related=(), prefetch_related=()):
+        self.select_related = tuple(select_related)
+        self.prefetch_related = tuple(prefetch_related)
+
+    def apply(self, query_set):
+        if self.select_related:
+            query_set = query_set.select_related(*self.select_related)
+        if self.prefetch_related:
+            query_set = query_set.prefetch_related(*self.prefetch_related)
+        return query_set
+
+
+def bulk_insert(model, objects):
+    """Insert the given objects with ``bulk_create()``, setting their
+    primary keys (such that other objects may refer to them).
+
+    Backends which return no IDs from bulk inserts (SQLite) are read the
+    IDs of the last rows inserted, within the transaction of the insert
+    (which excludes other writers).
+
+    """
+    objects = list(objects)
+    database = model.objects.db
+
+    with transaction.atomic(using=database):
+        model.objects.bulk_create(objects)
+
+        if objects and not connections[database].features.can_return_ids_from_bulk_insert:
+            object_ids = list(model.objects.order_by('-pk').values_list('pk', flat=True)[:len(objects)])
+            for (obj, object_id) in zip(objects, reversed(object_ids)):
+                obj.pk = object_id
+                obj._state.adding = False
+                obj._state.db = database
+
+    return objects
+
+
 def validate_consistent_keys(object, error_message='Detected primary key inconsistency', *items):
     for (field_path, field_value) in items:
         if not get_field_value(object, field_path) == field_value:
@@ -0,0 +1,131 @@
+"""Facet counts of project search results.
+
+A FacetIndex holds, for each value of each facet -- social cause, status
+and year of posting -- the set of IDs of (public) projects with that value
+(its "postings"). The index is built from two queries, and is cached (see:
+``ProjectDomain.get_public_project_facet_index``), such that the counts of
+results which each filter would yield may be computed by set intersection,
+rather than by a query per filter.
+
+Counts follow the usual semantics of faceted search: selections within a
+facet are alternatives (OR), and the counts of one facet's values reflect
+the selections of all *other* facets.
+
+"""
+import itertools
+
+from django.db.models.functions import ExtractYear
+
+from ..models.proj import ProjectSocialCause
+from .common import project_status_view_model_translation, social_cause_view_model_translation
+
+
+class FacetIndex:
+
+    def __init__(self, project_ids, social_causes, statuses, years):
+        self.project_ids = project_ids
+        self.social_causes = social_causes
+        self.statuses = statuses
+        self.years = years
+
+    @classmethod
+    def build(cls, projects):
+        project_ids = set()
+        statuses = {}
+        years = {}
+        for (project_id, status, year) in projects.annotate(
+            creation_year=ExtractYear('creation_date'),
+        ).values_list('id', 'status', 'creation_year').order_by():
+            project_ids.add(project_id)
+            statuses.setdefault(status, set()).add(project_id)
+            years.setdefault(year, set()).add(project_id)
+
+        social_causes = {}
+        for (social_cause, project_id) in ProjectSocialCause.objects.filter(
+            project__in=projects,
+        ).values_list('social_cause', 'project').order_by():
+            social_causes.setdefault(social_cause, set()).add(project_id)
+
+        return cls(
+            frozenset(project_ids),
+            {key: frozenset(ids) for (key, ids) in social_causes.items()},
+            {key: frozenset(ids) for (key, ids) in statuses.items()},
+            {key: frozenset(ids) for (key, ids) in years.items()},
+        )
+
+    @property
+    def year_range(self):
+        """Years in which public projects were posted, most recent first."""
+        if not self.years:
+            return ()
+        return range(max(self.years), min(self.years) - 1, -1)
+
+    def social_cause_postings(self, social_cause):
+        return self.social_causes.get(social_cause_view_model_translation[social_cause], frozenset())
+
+    def project_status_postings(self, project_status):
+        return frozenset(itertools.chain.from_iterable(
+            self.statuses.get(status, ())
+            for status in project_status_view_model_translation[project_status]
+        ))
+
+    def posted_since_postings(self, year):
+        return frozenset(itertools.chain.from_iterable(
+            ids for (posted_year, ids) in self.years.items() if posted_year >= year
+        ))
+
+    def count(self, project_ids=None, social_cause=(), project_status=(), posted_since=None):
+        """Count the projects which each facet value would select.
+
+        `project_ids` restricts the counts to the given projects (for
+        example, those matching a text search), and otherwise they are of
+        all public projects. The remaining arguments are the facets'
+        current selections (in the terms of the project list view).
+
+        """
+        base = self.project_ids if project_ids is None else self.project_ids.intersection(project_ids)
+
+        social_causes = [sc for sc in social_cause if sc in social_cause_view_model_translation]
+        project_statuses = [ps for ps in project_status if ps in project_status_view_model_translation]
+
+        # each facet's selection, as the union of its selected values' postings
+        selections = {
+            'social_cause': (
+                frozenset().union(*map(self.social_cause_postings, social_causes))
+                if social_causes else None
+            ),
+            'project_status': (
+                frozenset().union(*map(self.project_status_postings, project_statuses))
+                if project_statuses else None
+            ),
+            'posted_since': (
+                self.posted_since_postings(posted_since)
+                if posted_since is not None else None
+            ),
+        }
+
+        def facet_base(facet):
+            ids = base
+            for (other_facet, selection) in selections.items():
+                if other_facet != facet and selection is not None:
+                    ids = ids & selection
+            return ids
+
+        social_cause_base = facet_base('social_cause')
+        project_status_base = facet_base('project_status')
+        posted_since_base = facet_base('posted_since')
+
+        return {
+            'social_cause': {
+                key: len(social_cause_base & self.social_cause_postings(key))
+                for key in social_cause_view_model_translation
+            },
+            'project_status': {
+                key: len(project_status_base & self.project_status_postings(key))
+                for key in project_status_view_model_translation
+            },
+            'posted_since': {
+                year: len(posted_since_base & self.posted_since_postings(year))
+                for year in self.year_range
+            },
+        }
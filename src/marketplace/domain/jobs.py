@@ -0,0 +1,197 @@
+"""Background jobs: side effects of domain operations, run outside of the
+request which gave rise to them.
+
+A job is a function registered by name (see: ``job``), and enqueued with
+(JSON-serializable) keyword arguments::
+
+    @job('notify_users')
+    def notify_users(user_ids, message):
+        ...
+
+    enqueue('notify_users', user_ids=[1, 2], message="Hello")
+
+Jobs are written within the caller's transaction -- such that they are
+committed, or rolled back, with the change which gave rise to them -- and
+are run by the job worker (``manage.py run_jobs``) once committed. A job
+given an idempotency ``key`` is enqueued at most once per key.
+
+Failed jobs are retried with exponential backoff, until
+``JOBS_MAX_ATTEMPTS`` is reached; and, the claims of workers which die
+mid-job expire after ``JOBS_CLAIM_TIMEOUT`` (counting as attempts). Jobs may therefore run more
+than once, and should be idempotent.
+
+Under ``JOBS_RUN_EAGERLY`` (for example, in development, without a
+worker), jobs are instead run in-process, as soon as the enqueuing
+transaction commits.
+
+"""
+import json
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from marketplace.models.jobs import Job, JobStatus
+
+
+LOG = logging.getLogger(__name__)
+
+JOBS = {}
+
+
+def job(name):
+    """Register the decorated function as the job of the given name."""
+    def decorator(func):
+        if name in JOBS:
+            raise ValueError(f"job already registered: {name}")
+        JOBS[name] = func
+        return func
+
+    return decorator
+
+
+def enqueue(name, key=None, **arguments):
+    """Enqueue the job of the given name, with the given keyword
+    arguments.
+
+    Returns the Job (or, given a ``key`` under which a job was already
+    enqueued, that job).
+
+    """
+    if name not in JOBS:
+        raise LookupError(f"no such job: {name}")
+
+    encoded_arguments = json.dumps(arguments, cls=DjangoJSONEncoder, sort_keys=True)
+
+    if key is None:
+        queued = Job.objects.create(name=name, arguments=encoded_arguments)
+    else:
+        (queued, created) = Job.objects.get_or_create(
+            key=key,
+            defaults={'name': name, 'arguments': encoded_arguments},
+        )
+        if not created:
+            return queued
+
+    if settings.JOBS_RUN_EAGERLY:
+        transaction.on_commit(lambda: run_job_eagerly(queued.pk))
+
+    return queued
+
+
+def retry_delay(attempts):
+    """Backoff before the next attempt of a job which has failed
+    ``attempts`` times.
+
+    """
+    delay = settings.JOBS_RETRY_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.JOBS_MAX_RETRY_DELAY))
+
+
+def claim_jobs(batch_size):
+    """Claim the next batch of jobs due to run (including any whose
+    previous worker's claim has expired).
+
+    Under PostgreSQL, the batch is selected with ``SELECT ... FOR UPDATE
+    SKIP LOCKED``, such that any number of workers may run concurrently.
+    Backends without row locking (SQLite) should be served by a single
+    worker.
+
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        # jobs whose every attempt killed its worker (never reaching the
+        # failure path of run_job) are given up on, rather than reclaimed
+        exhausted = Job.objects.filter(
+            status=JobStatus.RUNNING,
+            next_attempt_date__lte=now,
+            attempts__gte=settings.JOBS_MAX_ATTEMPTS,
+        ).update(
+            status=JobStatus.FAILED,
+            last_error="claim expired: the worker died on every attempt",
+        )
+        if exhausted:
+            LOG.error("jobs failed upon expiry of their last claim [count: %d]", exhausted)
+
+        due = Job.objects.filter(
+            Q(status=JobStatus.PENDING) |
+            Q(status=JobStatus.RUNNING, attempts__lt=settings.JOBS_MAX_ATTEMPTS),
+            next_attempt_date__lte=now,
+        ).order_by('next_attempt_date', 'id')
+
+        if connection.features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+
+        jobs = list(due[:batch_size])
+
+        Job.objects.filter(pk__in=[claimed.pk for claimed in jobs]).update(
+            status=JobStatus.RUNNING,
+            attempts=F('attempts') + 1,
+            next_attempt_date=now + timedelta(seconds=settings.JOBS_CLAIM_TIMEOUT),
+        )
+
+    for claimed in jobs:
+        claimed.attempts += 1
+
+    return jobs
+
+
+def run_job(claimed):
+    """Run the given (claimed) job in a transaction of its own, and record
+    its outcome.
+
+    Returns whether the job succeeded.
+
+    """
+    try:
+        function = JOBS[claimed.name]
+        with transaction.atomic():
+            function(**json.loads(claimed.arguments))
+            Job.objects.filter(pk=claimed.pk).update(
+                status=JobStatus.DONE,
+                completion_date=timezone.now(),
+            )
+    except Exception as exc:
+        LOG.exception("job failed [job: %d] [name: %s] [attempt: %d]",
+                      claimed.pk, claimed.name, claimed.attempts)
+
+        if claimed.attempts >= settings.JOBS_MAX_ATTEMPTS:
+            Job.objects.filter(pk=claimed.pk).update(
+                status=JobStatus.FAILED,
+                last_error=repr(exc),
+            )
+        else:
+            Job.objects.filter(pk=claimed.pk).update(
+                status=JobStatus.PENDING,
+                last_error=repr(exc),
+                next_attempt_date=timezone.now() + retry_delay(claimed.attempts),
+            )
+        return False
+
+    return True
+
+
+def run_job_eagerly(job_id):
+    Job.objects.filter(pk=job_id).update(
+        status=JobStatus.RUNNING,
+        attempts=F('attempts') + 1,
+        next_attempt_date=timezone.now() + timedelta(seconds=settings.JOBS_CLAIM_TIMEOUT),
+    )
+    run_job(Job.objects.get(pk=job_id))
+
+
+def run_queued_jobs(batch_size=20):
+    """Claim and run the next batch of jobs.
+
+    Returns the number of jobs which succeeded and the number which
+    failed.
+
+    """
+    jobs = claim_jobs(batch_size)
+    succeeded = sum(run_job(claimed) for claimed in jobs)
+    return (succeeded, len(jobs) - succeeded)
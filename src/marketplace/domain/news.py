@@ -2,6 +2,8 @@ import logging
 
 from marketplace.models.news import NewsPiece
 
+from .caching import memoize
+
 
 LOG = logging.getLogger(__name__)
 
@@ -9,5 +11,10 @@ LOG = logging.getLogger(__name__)
 class NewsService():
 
     @staticmethod
+    @memoize(
+        timeout=600,
+        key=lambda request_user, story_count=2: story_count,
+        invalidated_by=(NewsPiece,),
+    )
     def get_latest_news(request_user, story_count=2):
-        return NewsPiece.objects.order_by('-creation_date')[:story_count]
+        return list(NewsPiece.objects.order_by('-creation_date')[:story_count])
@@ -1,16 +1,30 @@
 import logging
+from datetime import timedelta
 from smtplib import SMTPException
 
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.cache import cache
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
 
 from namespaces import Namespace
 
-from marketplace.models.user import UserNotification
+from marketplace.models.user import EmailStatus, OutboundEmail, User, UserNotification
+
+from . import jobs
 
 
 LOG = logging.getLogger(__name__)
 
+# seconds for which users' counts of unread notifications are cached
+#
+# (notifications are also created by other processes -- other server
+# workers and the job runner -- whose invalidations don't reach a
+# per-process cache, and so this bounds the staleness of counts there)
+UNREAD_COUNT_TIMEOUT = 30
+
 
 # Namespace declaration #
 
@@ -37,37 +51,283 @@ def add_user_notification(user, notification_description, severity, source, targ
         NotificationService.send_email(
             settings.DEFAULT_FROM_EMAIL,
             user.email,
-            f"[{settings.SITE_NAME}] You have a new notification",
-            f"You have a new notification pending:\n\n{notification_description}",
+            *notification_email_content(notification_description),
+        )
+
+
+@NotificationDomain
+def get_unread_count(user):
+    """The number of the user's unread notifications.
+
+    The count is cached per user, briefly, and dropped whenever the
+    user's notifications are added or their read state changes.
+
+    """
+    cache_key = unread_count_key(user.pk)
+    count = cache.get(cache_key)
+    if count is None:
+        count = UserNotification.objects.filter(user=user, is_read=False).count()
+        cache.set(cache_key, count, UNREAD_COUNT_TIMEOUT)
+    return count
+
+
+@NotificationDomain
+def mark_all_read(user):
+    """Mark all of the user's notifications as read (in one statement).
+
+    Returns the number of notifications marked.
+
+    """
+    count = UserNotification.objects.filter(user=user, is_read=False).update(is_read=True)
+    cache.set(unread_count_key(user.pk), 0, UNREAD_COUNT_TIMEOUT)
+    return count
+
+
+def unread_count_key(user_id):
+    return f'domain:notification:unread:{user_id}'
+
+
+def invalidate_unread_counts(user_ids):
+    cache.delete_many([unread_count_key(user_id) for user_id in set(user_ids)])
+
+
+def notification_email_content(notification_description):
+    return (
+        f"[{settings.SITE_NAME}] You have a new notification",
+        f"You have a new notification pending:\n\n{notification_description}",
+    )
+
+
+def resolve_notification_recipients(users):
+    """Evaluate the given users (queryset, union or iterable) once,
+    dropping duplicates while preserving order.
+
+    """
+    recipients = {}
+    for user in users:
+        recipients.setdefault(user.pk, user)
+    return list(recipients.values())
+
+
+def retry_delay(attempts):
+    """Backoff before the next delivery attempt of an email which has
+    failed ``attempts`` times.
+
+    """
+    delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1)
+    return timedelta(seconds=min(delay, settings.EMAIL_OUTBOX_MAX_RETRY_DELAY))
+
+
+def claim_queued_emails(batch_size):
+    """Select (and, where supported, lock) the next batch of emails due for
+    delivery.
+
+    Must be called within a transaction. Under PostgreSQL the batch is
+    claimed with ``SELECT ... FOR UPDATE SKIP LOCKED``, such that any
+    number of workers may run concurrently. Backends without row locking
+    (SQLite) fall back to a plain select, and so should be served by a
+    single worker.
+
+    """
+    queued = OutboundEmail.objects.filter(
+        status=EmailStatus.PENDING,
+        next_attempt_date__lte=timezone.now(),
+    ).order_by('next_attempt_date', 'id')
+
+    if connection.features.has_select_for_update_skip_locked:
+        queued = queued.select_for_update(skip_locked=True)
+
+    return list(queued[:batch_size])
+
+
+def deliver_queued_emails(batch_size=50):
+    """Deliver the next batch of queued emails over a single mail connection.
+
+    Failed deliveries are retried with exponential backoff, until
+    ``EMAIL_OUTBOX_MAX_ATTEMPTS`` is reached.
+
+    Returns the number of emails sent and the number which failed.
+
+    """
+    with transaction.atomic():
+        emails = claim_queued_emails(batch_size)
+        if not emails:
+            return (0, 0)
+
+        mail_connection = get_connection(fail_silently=False)
+        try:
+            mail_connection.open()
+        except (OSError, SMTPException) as exc:
+            LOG.exception("mail connection failed [batch: %d]", len(emails))
+            failures = [(email, exc) for email in emails]
+        else:
+            failures = []
+            try:
+                for email in emails:
+                    message = EmailMessage(email.subject, email.body, email.from_email,
+                                           [email.to_email], connection=mail_connection)
+                    try:
+                        message.send()
+                    except Exception as exc:
+                        # (including those of the message itself, such as
+                        # BadHeaderError, lest they roll back the batch)
+                        LOG.exception("send_mail failed [from_email: %r] [to_email: %r]",
+                                      email.from_email, email.to_email)
+                        failures.append((email, exc))
+            finally:
+                mail_connection.close()
+
+        now = timezone.now()
+        failed_ids = set()
+
+        for (email, exc) in failures:
+            failed_ids.add(email.id)
+            email.attempts += 1
+            email.last_error = repr(exc)
+            if email.attempts >= settings.EMAIL_OUTBOX_MAX_ATTEMPTS:
+                email.status = EmailStatus.FAILED
+            else:
+                email.next_attempt_date = now + retry_delay(email.attempts)
+
+        for email in emails:
+            if email.id not in failed_ids:
+                email.attempts += 1
+                email.status = EmailStatus.SENT
+                email.sent_date = now
+
+        OutboundEmail.objects.bulk_update(
+            emails,
+            ['attempts', 'last_error', 'status', 'next_attempt_date', 'sent_date'],
         )
 
+    return (len(emails) - len(failures), len(failures))
+
 
 class NotificationService:
 
     @staticmethod
     def add_multiuser_notification(users, notification_description, severity, source, target_id):
-        for user in users:
-            add_user_notification(user, notification_description, severity, source, target_id)
+        """Notify many users at once.
+
+        Recipients are resolved in a single pass, their notifications are
+        written with a single bulk insert, and their emails are queued to
+        the outbox with another.
+
+        """
+        recipients = resolve_notification_recipients(users)
+        if not recipients:
+            return []
+
+        notifications = UserNotification.objects.bulk_create(
+            UserNotification(
+                user=user,
+                notification_description=notification_description,
+                severity=severity,
+                source=source,
+                target_id=target_id,
+                is_read=False,
+            )
+            for user in recipients
+        )
+        # (bulk_create sends no post_save)
+        invalidate_unread_counts(user.pk for user in recipients)
+
+        to_emails = [user.email for user in recipients if user.email]
+        if to_emails:
+            NotificationService.send_email(
+                settings.DEFAULT_FROM_EMAIL,
+                to_emails,
+                *notification_email_content(notification_description),
+            )
+
+        return notifications
+
+    @staticmethod
+    def enqueue_multiuser_notification(users, notification_description, severity, source, target_id, key=None):
+        """Notify many users, by background job (see: `domain.jobs`).
+
+        Recipients are resolved at once (such that they are those of the
+        moment of the notification), and notified by the job worker.
+
+        """
+        recipients = resolve_notification_recipients(users)
+        if not recipients:
+            return None
+
+        return jobs.enqueue(
+            'notify_users',
+            key=key,
+            user_ids=[user.pk for user in recipients],
+            notification_description=notification_description,
+            severity=severity,
+            source=source,
+            target_id=target_id,
+        )
 
     @staticmethod
     def mark_notifications_as_read(user_notification_list):
-        for notification in user_notification_list:
+        """Mark the given notifications as read, with a single UPDATE of
+        those which are unread.
+
+        Returns the number of notifications marked.
+
+        """
+        unread = [notification for notification in user_notification_list if not notification.is_read]
+        if not unread:
+            return 0
+
+        count = UserNotification.objects.filter(
+            pk__in=[notification.pk for notification in unread],
+            is_read=False,
+        ).update(is_read=True)
+
+        for notification in unread:
             notification.is_read = True
-            notification.save()
+        invalidate_unread_counts(notification.user_id for notification in unread)
+
+        return count
 
     @staticmethod
     def send_email(from_email, to_email_or_list, subject, message):
+        """Queue an email (one per recipient) to the outbox.
+
+        Emails are written within the caller's transaction, and delivered
+        by the outbox worker (`manage.py send_queued_emails`) -- such that
+        neither mail server latency nor mail failures hold up the request.
+
+        """
         if isinstance(to_email_or_list, str):
             to_email_or_list = [to_email_or_list]
 
-        try:
-            send_mail(
-                subject,
-                message,
-                from_email,
-                to_email_or_list,
-                fail_silently=False,
+        return OutboundEmail.objects.bulk_create(
+            OutboundEmail(
+                from_email=from_email,
+                to_email=to_email,
+                subject=subject,
+                body=message,
             )
-        except (OSError, SMTPException):
-            LOG.exception("send_mail failed [from_email: %r] [to_email: %r]",
-                          from_email, to_email_or_list)
+            for to_email in to_email_or_list
+        )
+
+
+# Jobs #
+
+@jobs.job('notify_users')
+def notify_users(user_ids, notification_description, severity, source, target_id):
+    NotificationService.add_multiuser_notification(
+        User.objects.filter(pk__in=user_ids).order_by('id'),
+        notification_description,
+        severity,
+        source,
+        target_id,
+    )
+
+
+# Signal receivers #
+
+def notification_changed(sender, instance, **kwargs):
+    invalidate_unread_counts([instance.user_id])
+
+
+post_save.connect(notification_changed, sender=UserNotification, dispatch_uid='notification_unread_save')
+post_delete.connect(notification_changed, sender=UserNotification, dispatch_uid='notification_unread_delete')
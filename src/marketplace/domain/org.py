@@ -1,3 +1,4 @@
+import json
 from itertools import accumulate
 
 from django.db import IntegrityError, transaction
@@ -5,24 +6,34 @@ from django.db.models import Case, Q, When, Count
 
 from ..models.common import OrgRole, ReviewStatus, SocialCause
 from ..models.org import (
-    Organization, OrganizationMembershipRequest, OrganizationRole, OrganizationSocialCause, OrganizationType,
+    Organization, OrganizationMembershipRequest, OrganizationProjectTemplate, OrganizationRole,
+    OrganizationSocialCause, OrganizationType,
 )
 from ..models.user import (
     User, NotificationSeverity, NotificationSource,
 )
-from ..models.proj import ProjectStatus
+from ..models.proj import Project, ProjectStatus
 from .notifications import NotificationDomain, NotificationService
-from .proj import ProjectService
+from .proj import ORGANIZATION_PROJECT_LIST_PLAN, ProjectService
+from . import roles
+from .caching import memoize
+from .templates import ProjectTemplate
 
-from .common import validate_consistent_keys, social_cause_view_model_translation, project_status_view_model_translation, org_type_view_model_translation
+from .common import PrefetchPlan, validate_consistent_keys, social_cause_view_model_translation, project_status_view_model_translation, org_type_view_model_translation
 
 from marketplace.authorization.common import ensure_user_has_permission
 
 
+# Prefetch plan of the relations followed by org_list.html
+ORGANIZATION_LIST_PLAN = PrefetchPlan(
+    prefetch_related=('organizationsocialcause_set',),
+)
+
+
 class OrganizationService():
     @staticmethod
     def get_all_organizations(request_user, search_config=None):
-        base_query = Organization.objects.all()
+        base_query = ORGANIZATION_LIST_PLAN.apply(Organization.objects.all())
         if search_config:
             if 'name' in search_config:
                 base_query = base_query.filter(name__icontains=search_config['name'])
@@ -57,6 +68,7 @@ class OrganizationService():
         return Organization.objects.get(pk=org_pk)
 
     @staticmethod
+    @memoize(timeout=600, invalidated_by=(Organization, Project))
     def get_featured_organization():
         # Long-term, devise a better way of selecting a featured organization.
         return Organization.objects.filter(type=OrganizationType.SOCIAL_GOOD) \
@@ -87,6 +99,26 @@ class OrganizationService():
                 new_sc.organization = organization
                 new_sc.save()
 
+    @staticmethod
+    def save_project_template(request_user, orgid, definition):
+        """Register the template of the organization's new projects, by its
+        (JSON-compatible) definition -- or, given None, revert to the
+        platform's default template.
+
+        Raises ValidationError upon an invalid definition.
+
+        """
+        organization = Organization.objects.get(pk=orgid)
+        ensure_user_has_permission(request_user, organization, 'organization.information_edit')
+        if definition is None:
+            OrganizationProjectTemplate.objects.filter(organization=organization).delete()
+        else:
+            ProjectTemplate(definition)
+            OrganizationProjectTemplate.objects.update_or_create(
+                organization=organization,
+                defaults={'definition': json.dumps(definition, indent=2)},
+            )
+
     @staticmethod
     def create_organization(request_user, organization, org_type='socialgood'):
         ensure_user_has_permission(request_user, org_type, 'organization.create')
@@ -128,15 +160,15 @@ class OrganizationService():
 
     @staticmethod
     def user_is_organization_member(user, org):
-        return user.is_authenticated and OrganizationRole.objects.filter(organization=org, user=user).exists()
+        return user.is_authenticated and roles.organization_roles(user, org).has_role()
 
     @staticmethod
     def user_is_organization_staff(user, org):
-        return user.is_authenticated and OrganizationRole.objects.filter(organization=org, user=user, role=OrgRole.STAFF).exists()
+        return user.is_authenticated and roles.organization_roles(user, org).has_role(OrgRole.STAFF)
 
     @staticmethod
     def user_is_organization_admin(user, org):
-        return user.is_authenticated and OrganizationRole.objects.filter(organization=org, user=user, role=OrgRole.ADMINISTRATOR).exists()
+        return user.is_authenticated and roles.organization_roles(user, org).has_role(OrgRole.ADMINISTRATOR)
 
     @staticmethod
     def user_is_pending_membership(user, org):
@@ -167,12 +199,13 @@ class OrganizationService():
     @staticmethod
     def get_organization_projects(request_user, org):
         if org.is_volunteer_group():
-            return ProjectService.get_all_organization_member_volunteer_projects(request_user, org)
+            projects = ProjectService.get_all_organization_member_volunteer_projects(request_user, org)
         else:
             if OrganizationService.user_is_organization_member(request_user, org):
-                return ProjectService.get_all_organization_projects(request_user, org)
+                projects = ProjectService.get_all_organization_projects(request_user, org)
             else:
-                return ProjectService.get_organization_public_projects(request_user, org)
+                projects = ProjectService.get_organization_public_projects(request_user, org)
+        return ORGANIZATION_PROJECT_LIST_PLAN.apply(projects)
 
     @staticmethod
     def create_project(request_user, orgid, project):
@@ -1,3 +1,4 @@
+import collections
 import itertools
 import re
 
@@ -18,12 +19,15 @@ from ..models.common import (
     ReviewStatus, TaskType,
 )
 from ..models.user import (
-    User, NotificationSeverity, NotificationSource, VolunteerProfile, Skill, BadgeTier, UserBadge, BadgeType,
+    User, NotificationSeverity, NotificationSource, VolunteerProfile, Skill,
 )
-from django.db.models import Case, When, Count, Q, Subquery, Avg, F
+from django.db.models import Case, When, Count, Q, Subquery, F, Prefetch
 
-from .common import validate_consistent_keys, social_cause_view_model_translation, project_status_view_model_translation
+from .common import PrefetchPlan, bulk_insert, validate_consistent_keys, social_cause_view_model_translation, project_status_view_model_translation
 from .notifications import NotificationDomain, NotificationService
+from . import reputation, roles, search, templates
+from .caching import invalidate_models, memoize
+from .facets import FacetIndex
 from marketplace.authorization.common import ensure_user_has_permission
 
 
@@ -33,6 +37,28 @@ def filter_public_projects(query_set):
                      .exclude(status=ProjectStatus.DELETED))
 
 
+# Prefetch plans: the relations followed by the templates listing these objects #
+
+# (proj_list.html)
+PUBLIC_PROJECT_LIST_PLAN = PrefetchPlan(
+    select_related=('organization',),
+    prefetch_related=('projectsocialcause_set',),
+)
+
+# (org_info.html)
+ORGANIZATION_PROJECT_LIST_PLAN = PrefetchPlan(
+    prefetch_related=('projectsocialcause_set',),
+)
+
+# (proj_info.html)
+PUBLIC_TASK_LIST_PLAN = PrefetchPlan(
+    prefetch_related=(
+        Prefetch('projecttaskrequirement_set',
+                 queryset=ProjectTaskRequirement.objects.select_related('skill')),
+    ),
+)
+
+
 # Namespace declaration #
 
 # TODO: continue/extend experiment with Namespaces over *Services
@@ -49,11 +75,12 @@ def list_public_projects(projname=None,
                          skills=None,
                          social_cause=None,
                          posted_since=None,
-                         project_status=None):
+                         project_status=None,
+                         text=None):
     # We could also add the projects that are non-public but that also belong
     # to the organizations that the user is member of. Should that be added
     # or should users access those projects through the page of their org?
-    projects = filter_public_projects(Project.objects.all())
+    projects = PUBLIC_PROJECT_LIST_PLAN.apply(filter_public_projects(Project.objects.all()))
 
     if projname:
         projects = projects.filter(name__icontains=projname)
@@ -67,9 +94,13 @@ def list_public_projects(projname=None,
         # must be datetime-like value
         projects = projects.filter(creation_date__gte=posted_since)
 
+    # (filters on related rows are applied as semi-joins, such that they
+    # needn't multiply the projects' rows, nor so require distinct())
     if skills:
         for skill in re.split(r'[,\s]+', skills):
-            projects = projects.filter(projecttask__projecttaskrequirement__skill__name__icontains=skill)
+            projects = projects.filter(id__in=ProjectTaskRequirement.objects.filter(
+                skill__name__icontains=skill,
+            ).values('task__project'))
 
     if social_cause:
         if isinstance(social_cause, str):
@@ -77,7 +108,9 @@ def list_public_projects(projname=None,
 
         social_causes = [social_cause_view_model_translation[sc] for sc in social_cause
                          if sc in social_cause_view_model_translation]
-        projects = projects.filter(projectsocialcause__social_cause__in=social_causes).distinct()
+        projects = projects.filter(id__in=ProjectSocialCause.objects.filter(
+            social_cause__in=social_causes,
+        ).values('project'))
 
     if project_status:
         if isinstance(project_status, str):
@@ -87,7 +120,12 @@ def list_public_projects(projname=None,
             project_status_view_model_translation[ps] for ps in project_status
             if ps in project_status_view_model_translation
         )
-        projects = projects.filter(status__in=project_statuses).distinct()
+        projects = projects.filter(status__in=project_statuses)
+
+    if text:
+        # full-text search (see: domain/search.py), ranking best matches first
+        projects = search.search_projects(projects, text)
+        return projects.order_by('-search_rank', '-creation_date')
 
     # Here we'll make this method order by creation_date descending, rather than by name.
     # It's only used by the project list view, which wants it this way.
@@ -99,7 +137,51 @@ def list_public_projects(projname=None,
     # And, this module can either continue to insist on name ascending, or it looks like this
     # could be safely moved to the model's Meta default.
     #
-    return projects.distinct().order_by('-creation_date')
+    return projects.order_by('-creation_date')
+
+
+@ProjectDomain
+@memoize(timeout=600, invalidated_by=(Project, ProjectSocialCause))
+def get_public_project_facet_index():
+    return FacetIndex.build(filter_public_projects(Project.objects.all()))
+
+
+@ProjectDomain
+def count_public_project_facets(projname=None,
+                                orgname=None,
+                                skills=None,
+                                social_cause=(),
+                                posted_since=None,
+                                project_status=(),
+                                text=None):
+    """Count the public projects which each value of the project list's
+    facets -- social cause, status and year of posting -- would yield,
+    given the other search arguments (as for `list_public_projects`,
+    though `posted_since` may only be a year).
+
+    """
+    if isinstance(social_cause, str):
+        social_cause = (social_cause,)
+
+    if isinstance(project_status, str):
+        project_status = (project_status,)
+
+    if projname or orgname or skills or text:
+        project_ids = list_public_projects(
+            projname=projname,
+            orgname=orgname,
+            skills=skills,
+            text=text,
+        ).order_by().values_list('id', flat=True)
+    else:
+        project_ids = None
+
+    return get_public_project_facet_index().count(
+        project_ids,
+        social_cause=social_cause,
+        project_status=project_status,
+        posted_since=posted_since,
+    )
 
 
 @ProjectDomain
@@ -119,30 +201,32 @@ def query_notification_users(project):
 def finish_project(self, user, project):
     ensure_user_has_permission(user, project, 'project.approve_as_completed')
 
-    if not project.is_completed():
-        project.status = ProjectStatus.COMPLETED
-        project.actual_end_date = timezone.now()
-        project.save()
+    with transaction.atomic():
+        if not project.is_completed():
+            project.status = ProjectStatus.COMPLETED
+            project.actual_end_date = timezone.now()
+            project.save()
 
-    message = (f"""The project "{project.name}" has been accepted as finished. """
-                """All volunteer work has been completed.""")
+        message = (f"""The project "{project.name}" has been accepted as finished. """
+                    """All volunteer work has been completed.""")
 
-    NotificationService.add_multiuser_notification(
-        self.query_notification_users(project),
-        message,
-        NotificationSeverity.INFO,
-        NotificationSource.PROJECT,
-        project.id,
-    )
+        NotificationService.enqueue_multiuser_notification(
+            self.query_notification_users(project),
+            message,
+            NotificationSeverity.INFO,
+            NotificationSource.PROJECT,
+            project.id,
+            key=f'finish_project:{project.id}',
+        )
 
-    ProjectService.add_project_change(
-        user,
-        project,
-        ProjectLogType.COMPLETE,
-        ProjectLogSource.STATUS,
-        project.id,
-        message,
-    )
+        ProjectService.add_project_change(
+            user,
+            project,
+            ProjectLogType.COMPLETE,
+            ProjectLogSource.STATUS,
+            project.id,
+            message,
+        )
 
 
 # Project user domain #
@@ -152,10 +236,7 @@ ProjectUserDomain = ProjectDomain(Namespace('user'))
 
 @ProjectUserDomain
 def is_owner(user, proj):
-    return user.is_authenticated and user.projectrole_set.filter(
-        project=proj,
-        role=ProjRole.OWNER,
-    ).exists()
+    return user.is_authenticated and roles.project_roles(user, proj).has_role(ProjRole.OWNER)
 
 
 @ProjectUserDomain
@@ -165,10 +246,7 @@ def is_follower(user, proj):
 
 @ProjectUserDomain
 def is_volunteer(user, proj):
-    return user.is_authenticated and user.projecttaskrole_set.filter(
-        role=TaskRole.VOLUNTEER,
-        task__project=proj,
-    ).exists()
+    return user.is_authenticated and roles.project_roles(user, proj).is_volunteer()
 
 
 @ProjectUserDomain
@@ -181,45 +259,34 @@ def is_active(user):
 
 @ProjectUserDomain
 def is_scoper(user, proj):
-    return user.is_authenticated and user.projecttaskrole_set.filter(
-        role=TaskRole.VOLUNTEER,
-        task__project=proj,
-        task__type=TaskType.SCOPING_TASK,
-        task__stage__in=(TaskStatus.STARTED, TaskStatus.WAITING_REVIEW),
-    ).exists()
+    return user.is_authenticated and roles.project_roles(user, proj).is_volunteer(
+        task_types=(TaskType.SCOPING_TASK,),
+        active=True,
+    )
 
 
 @ProjectUserDomain
 def is_manager(user, proj):
-    return user.is_authenticated and user.projecttaskrole_set.filter(
-        role=TaskRole.VOLUNTEER,
-        task__project=proj,
-        task__type=TaskType.PROJECT_MANAGEMENT_TASK,
-        task__stage__in=(TaskStatus.STARTED, TaskStatus.WAITING_REVIEW),
-    ).exists()
+    return user.is_authenticated and roles.project_roles(user, proj).is_volunteer(
+        task_types=(TaskType.PROJECT_MANAGEMENT_TASK,),
+        active=True,
+    )
 
 
 @ProjectUserDomain
 def is_reviewer(user, proj):
-    return (
-        user.is_authenticated and
-        user.projecttaskrole_set.filter(
-            role=TaskRole.VOLUNTEER,
-            task__project=proj,
-            task__type=TaskType.QA_TASK,
-            task__stage__in=(TaskStatus.STARTED, TaskStatus.WAITING_REVIEW),
-        ).exists()
+    return user.is_authenticated and roles.project_roles(user, proj).is_volunteer(
+        task_types=(TaskType.QA_TASK,),
+        active=True,
     )
 
 
 @ProjectUserDomain
 def is_volunteer_official(user, proj):
-    return user.is_authenticated and user.projecttaskrole_set.filter(
-        role=TaskRole.VOLUNTEER,
-        task__project=proj,
-        task__type__in=(TaskType.SCOPING_TASK, TaskType.PROJECT_MANAGEMENT_TASK),
-        task__stage__in=(TaskStatus.STARTED, TaskStatus.WAITING_REVIEW),
-    ).exists()
+    return user.is_authenticated and roles.project_roles(user, proj).is_volunteer(
+        task_types=(TaskType.SCOPING_TASK, TaskType.PROJECT_MANAGEMENT_TASK),
+        active=True,
+    )
 
 
 @ProjectUserDomain._method_
@@ -235,7 +302,7 @@ def is_official(self, user, proj):
 @ProjectUserDomain._method_
 def is_member(self, user, proj):
     return user.is_authenticated and (
-        user.projectrole_set.filter(project=proj).exists() or
+        roles.project_roles(user, proj).has_role() or
         self.is_volunteer_official(user, proj)
     )
 
@@ -283,6 +350,23 @@ def can_complete(self, user, proj):
     return self.is_official(user, proj)  # or self.is_reviewer(user, proj)
 
 
+# Defaults of new projects #
+
+def build_project_scope(project, author):
+    """Build the initial scope of the given project, from its scope fields."""
+    return ProjectScope(
+        project=project,
+        scope_goals=project.scope_goals,
+        scope_interventions=project.scope_interventions,
+        scope_available_data=project.scope_available_data,
+        scope_analysis=project.scope_analysis,
+        scope_validation_methodology=project.scope_validation_methodology,
+        scope_implementation=project.scope_implementation,
+        author=author,
+        version_notes="Initial scope at project creation time.",
+    )
+
+
 class ProjectService:
 
     @staticmethod
@@ -301,6 +385,7 @@ class ProjectService:
         ).distinct().order_by('name')
 
     @staticmethod
+    @memoize(timeout=600, invalidated_by=(Project, ProjectTask, ProjectTaskRole))
     def get_featured_project():
         # Long-term, make a more intelligent selection, choosing for example
         # the project with best average task review score, the one with the
@@ -425,120 +510,10 @@ class ProjectService:
             project_admin_role.save()
 
             # Create project scope
-            project_scope = ProjectScope()
-            project_scope.project = project
-            project_scope.scope_goals = project.scope_goals
-            project_scope.scope_interventions = project.scope_interventions
-            project_scope.scope_available_data = project.scope_available_data
-            project_scope.scope_analysis = project.scope_analysis
-            project_scope.scope_validation_methodology = project.scope_validation_methodology
-            project_scope.scope_implementation = project.scope_implementation
-            project_scope.author = request_user
-            project_scope.version_notes = "Initial scope at project creation time."
-            project_scope.save()
-
-            # Create default tasks
-            scoping_task = ProjectTask()
-            scoping_task.name = 'Project scoping'
-            scoping_task.short_summary = 'Project scoping task to define the project work.'
-            scoping_task.description = 'This project is new and needs help being defined. The project scoping includes defining the problem being solved, defining what form the soluntion will take, splitting the work into the necessary tasks, and specifying the expertise needed to complete each task. Project scopers will also review volunteer applications and will QA the work done by volunteers.'
-            scoping_task.onboarding_instructions = 'Describe in detail the volunteer onboarding instructions for project scoping.'
-            scoping_task.stage = TaskStatus.NOT_STARTED
-            scoping_task.type = TaskType.SCOPING_TASK
-            scoping_task.accepting_volunteers = False
-            scoping_task.project = project
-            scoping_task.percentage_complete = 0
-            scoping_task.business_area = 'no'
-            scoping_task.estimated_start_date = date.today()
-            scoping_task.estimated_end_date = date.today()
-            scoping_task.save()
-
-            project_management_task = ProjectTask()
-            project_management_task.name = 'Project management'
-            project_management_task.short_summary = 'Project management task to ensure the project is successful.'
-            project_management_task.description = 'This project needs experienced project managers that can ensure the project gets successfully completed on time. Duties include managing the status of all the tasks in the project, ensuring work gets done at the required pace, foreseeing risks to the project and preventing blockers. Project managers will also review volunteer applications and will QA the work done by volunteers.'
-            project_management_task.onboarding_instructions = 'Describe in detail the volunteer onboarding instructions for project management.'
-            project_management_task.stage = TaskStatus.DRAFT
-            project_management_task.type = TaskType.PROJECT_MANAGEMENT_TASK
-            project_management_task.accepting_volunteers = False
-            project_management_task.project = project
-            project_management_task.percentage_complete = 0
-            project_management_task.business_area = 'no'
-            project_management_task.estimated_start_date = date.today()
-            project_management_task.estimated_end_date = date.today()
-            project_management_task.save()
-
-            domain_work_task = ProjectTask()
-            domain_work_task.name = 'Example domain work task'
-            domain_work_task.short_summary = 'Project work description.'
-            domain_work_task.description = 'Domain work tasks represent the tasks that need to be completed to finish the project. '
-            domain_work_task.onboarding_instructions = 'Describe in detail the volunteer onboarding instructions for this domain work task.'
-            domain_work_task.stage = TaskStatus.DRAFT
-            domain_work_task.type = TaskType.DOMAIN_WORK_TASK
-            domain_work_task.accepting_volunteers = False
-            domain_work_task.project = project
-            domain_work_task.percentage_complete = 0
-            domain_work_task.business_area = 'no'
-            domain_work_task.estimated_start_date = date.today()
-            domain_work_task.estimated_end_date = date.today()
-            domain_work_task.save()
-
-            qa_task = ProjectTask()
-            qa_task.name = 'Task and project QA'
-            qa_task.short_summary = 'Task for performing QA on the domain tasks.'
-            qa_task.description = 'This project needs experienced volunteers to work on ensuring that the tasks that are completed by other volunteers meet the requirements and the expected levels of delivery quality. Duties include reviewing work that volunteers complete, giving constructive feedback, deciding when tasks are ready to be marked as completed, and reviewing the status of the project before the final signoff.'
-            qa_task.onboarding_instructions = 'Describe in detail the volunteer onboarding instructions for this QA task.'
-            qa_task.stage = TaskStatus.DRAFT
-            qa_task.type = TaskType.QA_TASK
-            qa_task.accepting_volunteers = False
-            qa_task.project = project
-            qa_task.percentage_complete = 0
-            qa_task.business_area = 'no'
-            qa_task.estimated_start_date = date.today()
-            qa_task.estimated_end_date = date.today()
-            qa_task.save()
-
-            # Create default discussion channels
-            general_channel = ProjectDiscussionChannel()
-            general_channel.project = project
-            general_channel.name = "General discussion"
-            general_channel.description = "Discussion channel for general topics about the project."
-            general_channel.save()
-
-            technical_channel = ProjectDiscussionChannel()
-            technical_channel.project = project
-            technical_channel.name = "Technical talk"
-            technical_channel.description = "Discussion channel for technical topics that are not specific to a single task."
-            technical_channel.save()
-
-            project_management_channel = ProjectDiscussionChannel()
-            project_management_channel.project = project
-            project_management_channel.name = "Project management"
-            project_management_channel.related_task = project_management_task
-            project_management_channel.description = "Discussion channel for the task Project management."
-            project_management_channel.save()
-
-            scoping_channel = ProjectDiscussionChannel()
-            scoping_channel.project = project
-            scoping_channel.name = "Project scoping"
-            scoping_channel.related_task = scoping_task
-            scoping_channel.description = "Discussion channel for the task Project scoping."
-            scoping_channel.save()
-
-            domain_work_channel = ProjectDiscussionChannel()
-            domain_work_channel.project = project
-            domain_work_channel.name = "Domain work"
-            domain_work_channel.related_task = domain_work_task
-            domain_work_channel.description = "Discussion channel for the task Domain work."
-            domain_work_channel.save()
-
-            qa_channel = ProjectDiscussionChannel()
-            qa_channel.project = project
-            qa_channel.name = "QA"
-            qa_channel.related_task = qa_task
-            qa_channel.description = "Discussion channel for the QA task."
-            qa_channel.save()
+            build_project_scope(project, request_user).save()
 
+            # Create the tasks and discussion channels of the organization's template
+            templates.get_project_template(organization.id).create([project])
 
             message = "The project {0} was created by {1} within the organization {2}.".format(project.name, request_user.standard_display_name, organization.name)
             NotificationService.add_multiuser_notification(organization_members,
@@ -547,13 +522,90 @@ class ProjectService:
                                                      NotificationSource.PROJECT,
                                                      project.id)
             NotificationDomain.add_user_notification(request_user,
-                                                     "The project {0} was created successfully and you have been made project administrator. The next step is to define the project scope and to review the three default tasks that were created automatically.".format(project.name),
+                                                     "The project {0} was created successfully and you have been made project administrator. The next step is to define the project scope and to review the default tasks that were created automatically.".format(project.name),
                                                      NotificationSeverity.INFO,
                                                      NotificationSource.PROJECT,
                                                      project.id)
 
             return project
 
+    @staticmethod
+    def bulk_create_projects(owned_projects):
+        """Create the given projects in bulk.
+
+        ``owned_projects``: pairs of owner and (unsaved) project, whose
+        organization is set.
+
+        Projects are created as by ``create_project`` -- along with their
+        owner's role, initial scope, and the tasks and discussion channels
+        of their organization's template -- but by a single insert per
+        model, keeping their given status, and without notifications (see:
+        ``notify_projects_created``).
+
+        """
+        owned_projects = list(owned_projects)
+        for (owner, organization) in {(owner, project.organization) for (owner, project) in owned_projects}:
+            ensure_user_has_permission(owner, organization, 'organization.project_create')
+
+        projects = [project for (_owner, project) in owned_projects]
+        for project in projects:
+            project.status = project.status or ProjectStatus.DRAFT
+            # (bulk_create doesn't call save())
+            project.render_markdown()
+
+        with transaction.atomic():
+            bulk_insert(Project, projects)
+
+            ProjectRole.objects.bulk_create(
+                ProjectRole(user=owner, project=project, role=ProjRole.OWNER)
+                for (owner, project) in owned_projects
+            )
+
+            scopes = [build_project_scope(project, owner) for (owner, project) in owned_projects]
+            for scope in scopes:
+                scope.render_markdown()
+            ProjectScope.objects.bulk_create(scopes)
+
+            by_organization = collections.OrderedDict()
+            for project in projects:
+                by_organization.setdefault(project.organization_id, []).append(project)
+            for (organization_id, organization_projects) in by_organization.items():
+                templates.get_project_template(organization_id).create(organization_projects)
+
+            search.update_search_documents([project.id for project in projects])
+
+        # (bulk_create sends no post_save)
+        invalidate_models(Project, ProjectRole)
+        roles.clear_role_snapshots()
+
+        return projects
+
+    @staticmethod
+    def notify_projects_created(owned_projects):
+        """Notify of projects created in bulk: once per organization (to its
+        members), and once per owner within each organization, rather than
+        once per project.
+
+        """
+        by_organization = collections.OrderedDict()
+        by_owner = collections.OrderedDict()
+        for (owner, project) in owned_projects:
+            by_organization.setdefault(project.organization, []).append(project)
+            by_owner.setdefault((owner, project.organization), []).append(project)
+
+        for (organization, projects) in by_organization.items():
+            NotificationService.add_multiuser_notification(User.objects.filter(organizationrole__organization=organization),
+                                                     "{0} projects were created within the organization {1}.".format(len(projects), organization.name),
+                                                     NotificationSeverity.INFO,
+                                                     NotificationSource.ORGANIZATION,
+                                                     organization.id)
+        for ((owner, organization), projects) in by_owner.items():
+            NotificationDomain.add_user_notification(owner,
+                                                     "{0} projects were created within the organization {1} and you have been made their project administrator.".format(len(projects), organization.name),
+                                                     NotificationSeverity.INFO,
+                                                     NotificationSource.ORGANIZATION,
+                                                     organization.id)
+
     @staticmethod
     def save_project(request_user, projid, project):
         validate_consistent_keys(project, ('id', projid))
@@ -854,7 +906,7 @@ class ProjectTaskService():
         if not request_user.is_anonymous:
             query_set = query_set.annotate(already_applied=Count('volunteerapplication', filter=Q(volunteerapplication__volunteer=request_user, volunteerapplication__status=ReviewStatus.NEW), distinct=True)) \
                                  .annotate(already_volunteer=Count('projecttaskrole', filter=Q(projecttaskrole__user=request_user, projecttaskrole__role=TaskRole.VOLUNTEER), distinct=True))
-        return query_set.order_by( '-stage','-accepting_volunteers')
+        return PUBLIC_TASK_LIST_PLAN.apply(query_set).order_by( '-stage','-accepting_volunteers')
 
     @staticmethod
     def get_project_tasks_summary(request_user, proj):
@@ -908,7 +960,7 @@ class ProjectTaskService():
 
     @staticmethod
     def user_is_task_volunteer(user, task):
-        return user.is_authenticated and ProjectTaskRole.objects.filter(user=user, role=TaskRole.VOLUNTEER, task=task).exists()
+        return user.is_authenticated and roles.project_roles(user, task.project_id).is_volunteer(task_id=task.pk)
 
     @staticmethod
     def user_can_view_task_review(user, task_review):
@@ -941,17 +993,17 @@ class ProjectTaskService():
 
     @staticmethod
     def save_task_internal(request_user, projid, taskid, project_task):
-        # The notifications are inside the transaction block and that is not ideal,
-        # but the logic is not trivial and there is no obvious way to separate
-        # them from the project/task db modifications.
+        # Notifications are enqueued as jobs, and committed (then delivered)
+        # with the project/task modifications.
         with transaction.atomic():
             current_task = ProjectTask.objects.get(pk=project_task.id)
             project_task.save()
-            if project_task.name != current_task.name and project_task.projectdiscussionchannel:
-                channel = project_task.projectdiscussionchannel
-                channel.name = project_task.name
-                channel.description = "Discussion channel for the project task {0}".format(project_task.name)
-                channel.save()
+            if project_task.name != current_task.name:
+                channel = getattr(project_task, 'projectdiscussionchannel', None)
+                if channel:
+                    channel.name = project_task.name
+                    channel.description = "Discussion channel for the project task {0}".format(project_task.name)
+                    channel.save()
             project = project_task.project
             if project_task.stage != current_task.stage:
                 if project_task.type == TaskType.SCOPING_TASK:
@@ -966,7 +1018,7 @@ class ProjectTaskService():
                             project.status = ProjectStatus.WAITING_STAFF
                             project.save()
                             message = "The status of project {0} has changed to 'Staffing', so users can now apply to volunteer in the project tasks.".format(project.name)
-                            NotificationService.add_multiuser_notification(ProjectDomain.query_notification_users(project),
+                            NotificationService.enqueue_multiuser_notification(ProjectDomain.query_notification_users(project),
                                                                      message,
                                                                      NotificationSeverity.INFO,
                                                                      NotificationSource.PROJECT,
@@ -983,7 +1035,7 @@ class ProjectTaskService():
                             project.status = ProjectStatus.WAITING_DESIGN_APPROVAL
                             project.save()
                             message = "The status of project {0} has changed to 'Scoping QA'; the project's staff will review the current scope and determine if it is final and thus the project work can begin, or if the current scope needs further modifications.".format(project.name)
-                            NotificationService.add_multiuser_notification(ProjectDomain.query_notification_users(project),
+                            NotificationService.enqueue_multiuser_notification(ProjectDomain.query_notification_users(project),
                                                                      message,
                                                                      NotificationSeverity.INFO,
                                                                      NotificationSource.PROJECT,
@@ -1004,7 +1056,7 @@ class ProjectTaskService():
                             project.status = ProjectStatus.WAITING_REVIEW
                             project.save()
                             message = "The status of project {0} has changed to 'Final QA'; the project's work has finished and the staff will now verify if the project can be considered finished or if additional work needs to be completed.".format(project.name)
-                            NotificationService.add_multiuser_notification(ProjectDomain.query_notification_users(project),
+                            NotificationService.enqueue_multiuser_notification(ProjectDomain.query_notification_users(project),
                                                                      message,
                                                                      NotificationSeverity.INFO,
                                                                      NotificationSource.PROJECT,
@@ -1017,7 +1069,7 @@ class ProjectTaskService():
                                                                message)
                         elif not ProjectTask.objects.filter(project=project, type=TaskType.DOMAIN_WORK_TASK).exclude(stage=TaskStatus.COMPLETED).exists():
                             message = "The last domain work task of project {0} has been finished, but there are still other tasks (non-domain work) open.".format(project.name)
-                            NotificationService.add_multiuser_notification(ProjectService.get_project_officials(request_user, project),
+                            NotificationService.enqueue_multiuser_notification(ProjectService.get_project_officials(request_user, project),
                                                                      message,
                                                                      NotificationSeverity.WARNING,
                                                                      NotificationSource.PROJECT,
@@ -1096,11 +1148,11 @@ class ProjectTaskService():
             raise ValueError('Cannot delete a completed task')
         if ProjectTaskService.task_has_volunteers(request_user, project_task.id):
             raise ValueError('Cannot delete a task with active volunteers. Remove them or assign them to a different task before deleting this task.')
-        if project_task.projectdiscussionchannel:
+        channel = getattr(project_task, 'projectdiscussionchannel', None)
+        if channel:
             if project_task.stage == TaskStatus.NOT_STARTED:
-                project_task.projectdiscussionchannel.delete()
+                channel.delete()
             else:
-                channel = project_task.projectdiscussionchannel
                 channel.related_task = None
                 channel.is_read_only = True
                 channel.save()
@@ -1202,138 +1254,13 @@ class ProjectTaskService():
                 project_task.actual_effort_hours = task_review.volunteer_effort_hours
                 project_task.actual_end_date = timezone.now()
                 ProjectTaskService.save_task_internal(request_user, projid, taskid, project_task)
-                for role in project_task.projecttaskrole_set.all():
-                    ProjectTaskService.update_user_task_count(role.user)
-                    ProjectTaskService.update_user_review_score(role.user)
-                    ProjectTaskService.update_user_work_speed(role.user)
+                reputation.enqueue_reputation_update(project_task.projecttaskrole_set.values_list('user', flat=True),
+                                                     key=f'task_review:{task_review.id}:{task_review.review_result}')
             elif task_review.review_result == ReviewStatus.REJECTED and project_task.stage != TaskStatus.COMPLETED:
                 project_task.stage = TaskStatus.STARTED
                 ProjectTaskService.save_task_internal(request_user, projid, taskid, project_task)
-                for role in project_task.projecttaskrole_set.all():
-                    ProjectTaskService.update_user_review_score(role.user)
-
-
-    @staticmethod
-    def update_user_badge(request_user, badge_type, badge_tier, badge_name):
-        if badge_tier is not None:
-            try:
-                current_badge = UserBadge.objects.get(user=request_user, type=badge_type)
-                if current_badge.tier != badge_tier:
-                    is_better_badge = current_badge.tier < badge_tier
-                    current_badge.tier = badge_tier
-                    current_badge.save()
-                    if is_better_badge:
-                        message = "Congratulations! Your award for {0} has increased to {1}. Keep up with the good work!".format(badge_name, current_badge.get_tier_display())
-                    else:
-                        message = "Unfortunately your award for {0} has decreased to {1}.".format(badge_name, current_badge.get_tier_display())
-                    NotificationDomain.add_user_notification(request_user,
-                                                             message,
-                                                             NotificationSeverity.INFO,
-                                                             NotificationSource.BADGE,
-                                                             current_badge.id)
-            except:
-                new_badge = UserBadge()
-                new_badge.type = badge_type
-                new_badge.tier = badge_tier
-                new_badge.user = request_user
-                new_badge.save()
-                message = "Congratulations! You have been awarded a new badge ({0}) for {1}. Keep up with the good work!".format(new_badge.get_tier_display(), badge_name)
-                NotificationDomain.add_user_notification(request_user,
-                                                         message,
-                                                         NotificationSeverity.INFO,
-                                                         NotificationSource.BADGE,
-                                                         new_badge.id)
-        else:
-            try:
-                current_badge = UserBadge.objects.get(user=request_user, type=badge_type)
-                current_badge.delete()
-                message = "Unfortunately your award for {0} was removed.".format(badge_name, current_badge.get_tier_display())
-                NotificationDomain.add_user_notification(request_user,
-                                                         message,
-                                                         NotificationSeverity.INFO,
-                                                         NotificationSource.BADGE,
-                                                         current_badge.id)
-            except:
-                pass
-
-
-    @staticmethod
-    def update_user_task_count(request_user):
-        try:
-            completed_task_count = ProjectTaskRole.objects.filter(task__stage=TaskStatus.COMPLETED, user=request_user).count()
-            try:
-                request_user.volunteerprofile.completed_task_count = completed_task_count
-                request_user.volunteerprofile.save()
-            except:
-                pass
-            badge_tier = None
-            if completed_task_count > 10:
-                badge_tier = BadgeTier.MASTER
-            elif completed_task_count > 5:
-                badge_tier = BadgeTier.ADVANCED
-            elif completed_task_count > 0:
-                badge_tier = BadgeTier.BASIC
-            ProjectTaskService.update_user_badge(request_user, BadgeType.NUMBER_OF_PROJECTS, badge_tier, "completing tasks")
-        except:
-            pass # TODO log this exception
-
-
-    @staticmethod
-    def update_user_review_score(request_user):
-        try:
-            average_review_score = ProjectTaskReview.objects.filter(volunteer=request_user, review_result=ReviewStatus.ACCEPTED).aggregate(Avg('review_score'))['review_score__avg']
-            if average_review_score is not None:
-                try:
-                    request_user.volunteerprofile.average_review_score = average_review_score
-                    request_user.volunteerprofile.save()
-                except:
-                    pass
-                badge_tier = None
-                if average_review_score >= 4:
-                    badge_tier = BadgeTier.MASTER
-                elif average_review_score >= 3:
-                    badge_tier = BadgeTier.ADVANCED
-                elif average_review_score >= 2:
-                    badge_tier = BadgeTier.BASIC
-                ProjectTaskService.update_user_badge(request_user, BadgeType.REVIEW_SCORE, badge_tier, "getting great reviews")
-        except:
-            pass # TODO log this exception
-
-
-    @staticmethod
-    def update_user_work_speed(request_user):
-        try:
-            completed_tasks = ProjectTaskRole.objects.filter(task__stage=TaskStatus.COMPLETED, user=request_user)
-            completed_task_count = completed_tasks.count()
-
-            if completed_task_count > 0:
-                # TODO make this query work instead of iterating over all the tasks
-                # ahead_of_time_count = ProjectTaskRole.objects.filter(task__stage=TaskStatus.COMPLETED, user=request_user, \
-                #                             task__actual_end_date__lt=F('task__estimated_end_date') - F('task__estimated_start_date') + F('task__actual_start_date')).count()
-                ahead_of_time_count = 0
-                for task_role in completed_tasks.all():
-                    task = task_role.task
-                    if task and task.estimated_end_date is not None and task.estimated_start_date is not None \
-                        and task.actual_end_date is not None and task.actual_start_date is not None:
-                        if task.estimated_end_date - task.estimated_start_date > task.actual_end_date - task.actual_start_date:
-                            ahead_of_time_count += 1
-
-                percentage_fast = float(ahead_of_time_count) / float(completed_task_count)
-                try:
-                    request_user.volunteerprofile.ahead_of_time_task_ratio = percentage_fast
-                    request_user.volunteerprofile.save()
-                except:
-                    pass
-                badge_tier = None
-                if percentage_fast >= 0.85:
-                    badge_tier = BadgeTier.MASTER
-                elif percentage_fast >= 0.75:
-                    badge_tier = BadgeTier.ADVANCED
-                elif percentage_fast >= 0.5:
-                    badge_tier = BadgeTier.BASIC
-                ProjectTaskService.update_user_badge(request_user, BadgeType.WORK_SPEED, badge_tier, "being ahead of schedule")
-        except:
-            pass # TODO log this exception
+                reputation.enqueue_reputation_update(project_task.projecttaskrole_set.values_list('user', flat=True),
+                                                     key=f'task_review:{task_review.id}:{task_review.review_result}')
 
 
     @staticmethod
@@ -1349,12 +1276,12 @@ class ProjectTaskService():
         project_task = task_review.task
         project = project_task.project
         message = "The task {0} from project {1} has been accepted during its QA phase and it's now completed.".format(project_task.name, project.name)
-        NotificationService.add_multiuser_notification(ProjectService.get_project_members(request_user, project),
+        NotificationService.enqueue_multiuser_notification(ProjectService.get_project_members(request_user, project),
                                                     message,
                                                     NotificationSeverity.INFO,
                                                     NotificationSource.TASK,
                                                     project_task.id)
-        NotificationService.add_multiuser_notification(ProjectTaskService.get_task_volunteers(request_user, project_task.id),
+        NotificationService.enqueue_multiuser_notification(ProjectTaskService.get_task_volunteers(request_user, project_task.id),
                                                     "Congratulations! Your task {0} of project {1} has been reviewed by the project staff and accepted as finished, so your work has been completed. The staff comments are: {2}.".format(project_task.name, project.name, task_review.public_reviewer_comments),
                                                     NotificationSeverity.INFO,
                                                     NotificationSource.TASK,
@@ -1379,12 +1306,12 @@ class ProjectTaskService():
         project_task = task_review.task
         project = project_task.project
         message = "The task {0} from project {1} has been rejected during QA phase.".format(project_task.name, project.name)
-        NotificationService.add_multiuser_notification(ProjectService.get_project_members(request_user, project),
+        NotificationService.enqueue_multiuser_notification(ProjectService.get_project_members(request_user, project),
                                                     message,
                                                     NotificationSeverity.WARNING,
                                                     NotificationSource.TASK,
                                                     project_task.id)
-        NotificationDomain.add_user_notification(task_review.volunteer,
+        NotificationService.enqueue_multiuser_notification([task_review.volunteer],
                                                     "Your task {0} of project {1} has been reviewed by the project staff and rejected as finished, so it has been reopened. The staff comments are: {2}.".format(project_task.name, project.name, task_review.public_reviewer_comments),
                                                     NotificationSeverity.ERROR,
                                                     NotificationSource.TASK,
@@ -1401,7 +1328,7 @@ class ProjectTaskService():
                 project.status = ProjectStatus.DESIGN
                 project.save()
                 message = "The status of project {0} has changed to 'Scoping' as the project's staff determined that the scope needs modifications.".format(project.name)
-                NotificationService.add_multiuser_notification(ProjectDomain.query_notification_users(project),
+                NotificationService.enqueue_multiuser_notification(ProjectDomain.query_notification_users(project),
                                                          message,
                                                          NotificationSeverity.INFO,
                                                          NotificationSource.PROJECT,
@@ -1520,7 +1447,7 @@ class ProjectTaskService():
                         project.status = ProjectStatus.DESIGN
                         project.save()
                         message = "The status of project {0} has changed to 'Scoping', as new volunteers have been accepted to work on the project scope.".format(project.name)
-                        NotificationService.add_multiuser_notification(ProjectDomain.query_notification_users(project),
+                        NotificationService.enqueue_multiuser_notification(ProjectDomain.query_notification_users(project),
                                                                  message,
                                                                  NotificationSeverity.INFO,
                                                                  NotificationSource.PROJECT,
@@ -1537,7 +1464,7 @@ class ProjectTaskService():
                         project.status = ProjectStatus.IN_PROGRESS
                         project.save()
                         message = "The status of project {0} has changed to 'In progress', as volunteers have been accepted to work on the project tasks.".format(project.name)
-                        NotificationService.add_multiuser_notification(ProjectDomain.query_notification_users(project),
+                        NotificationService.enqueue_multiuser_notification(ProjectDomain.query_notification_users(project),
                                                                  message,
                                                                  NotificationSeverity.INFO,
                                                                  NotificationSource.PROJECT,
@@ -1563,12 +1490,12 @@ class ProjectTaskService():
         project_task = volunteer_application.task
         project = project_task.project
         message = "The user {0} has been accepted as volunteer for task {1} of project {2}.".format(volunteer_application.volunteer.standard_display_name, project_task.name, project.name)
-        NotificationService.add_multiuser_notification(ProjectService.get_project_members(request_user, project),
+        NotificationService.enqueue_multiuser_notification(ProjectService.get_project_members(request_user, project),
                                                     message,
                                                     NotificationSeverity.INFO,
                                                     NotificationSource.VOLUNTEER_APPLICATION,
                                                     volunteer_application.id)
-        NotificationDomain.add_user_notification(volunteer_application.volunteer,
+        NotificationService.enqueue_multiuser_notification([volunteer_application.volunteer],
                                                     "Congratulations! Your volunteer application for task {0} of project {1} has been accepted! You can now start working on this project. The reviewer's comments are: {2}".format(project_task.name, project.name, volunteer_application.public_reviewer_comments),
                                                     NotificationSeverity.INFO,
                                                     NotificationSource.VOLUNTEER_APPLICATION,
@@ -1594,12 +1521,12 @@ class ProjectTaskService():
         project_task = volunteer_application.task
         project = project_task.project
         message = "The user {0} has been rejected as volunteer for task {1} of project {2}.".format(volunteer_application.volunteer.standard_display_name, project_task.name, project.name)
-        NotificationService.add_multiuser_notification(ProjectService.get_project_members(request_user, project),
+        NotificationService.enqueue_multiuser_notification(ProjectService.get_project_members(request_user, project),
                                                     message,
                                                     NotificationSeverity.INFO,
                                                     NotificationSource.VOLUNTEER_APPLICATION,
                                                     volunteer_application.id)
-        NotificationDomain.add_user_notification(volunteer_application.volunteer,
+        NotificationService.enqueue_multiuser_notification([volunteer_application.volunteer],
                                                     "Your volunteer application for task {0} of project {1} has been rejected. The reviewer's comments are: {2}.".format(project_task.name, project.name, volunteer_application.public_reviewer_comments),
                                                     NotificationSeverity.ERROR,
                                                     NotificationSource.VOLUNTEER_APPLICATION,
@@ -1654,7 +1581,7 @@ class ProjectTaskService():
                     task_role.role = TaskRole.SUPPORT_STAFF
                     task_role.save()
                     message = "You have been added as support staff of task {0} of project {1}.".format(project_task.name, project.name)
-                    NotificationDomain.add_user_notification(task_role.user,
+                    NotificationService.enqueue_multiuser_notification([task_role.user],
                                                              message,
                                                              NotificationSeverity.INFO,
                                                              NotificationSource.TASK,
@@ -1664,13 +1591,13 @@ class ProjectTaskService():
                     user = task_role.user
                     task_role.delete()
                     message = "You have been removed as support staff from task {0} of project {1}.".format(project_task.name, project.name)
-                    NotificationDomain.add_user_notification(user,
+                    NotificationService.enqueue_multiuser_notification([user],
                                                              message,
                                                              NotificationSeverity.WARNING,
                                                              NotificationSource.TASK,
                                                              project_task.id)
         message = "The staff assignments for task {0} of project {1} have changed.".format(project_task.name, project.name)
-        NotificationService.add_multiuser_notification(ProjectService.get_project_members(request_user, project),
+        NotificationService.enqueue_multiuser_notification(ProjectService.get_project_members(request_user, project),
                                                  message,
                                                  NotificationSeverity.INFO,
                                                  NotificationSource.TASK,
@@ -0,0 +1,280 @@
+"""Volunteers' reputation.
+
+A volunteer's reputation consists of their number of completed tasks, the
+average score of their accepted task reviews, and the share of their
+completed tasks which took less time than estimated. Each is stored on
+their VolunteerProfile, and earns them a badge (of a tier according to
+``BADGE_TIERS``).
+
+Reputations are computed in a single (grouped) query for any number of
+users, and written back in bulk -- such that they may be recomputed upon
+each task review, or for all volunteers at once (see:
+``manage.py recompute_reputation``).
+
+"""
+from django.db import transaction
+from django.db.models import Avg, Count, F, FloatField, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.query import QuerySet
+
+from namespaces import Namespace
+
+from marketplace.models.common import ReviewStatus
+from marketplace.models.proj import ProjectTaskReview, ProjectTaskRole, TaskStatus
+from marketplace.models.user import (
+    BadgeTier, BadgeType, NotificationSeverity, NotificationSource, User, UserBadge,
+    VolunteerProfile,
+)
+
+from . import jobs
+from .notifications import NotificationDomain
+
+
+ReputationDomain = Namespace('reputation')
+
+
+# Badge tiers, by badge type: the tiers' thresholds (on the reputation's
+# measure), best first, and whether the threshold is inclusive
+BADGE_TIERS = {
+    BadgeType.NUMBER_OF_PROJECTS: (
+        ((BadgeTier.MASTER, 10), (BadgeTier.ADVANCED, 5), (BadgeTier.BASIC, 0)),
+        False,
+    ),
+    BadgeType.REVIEW_SCORE: (
+        ((BadgeTier.MASTER, 4), (BadgeTier.ADVANCED, 3), (BadgeTier.BASIC, 2)),
+        True,
+    ),
+    BadgeType.WORK_SPEED: (
+        ((BadgeTier.MASTER, 0.85), (BadgeTier.ADVANCED, 0.75), (BadgeTier.BASIC, 0.5)),
+        True,
+    ),
+}
+
+# Names of the achievements for which badges are awarded
+BADGE_ACHIEVEMENTS = {
+    BadgeType.NUMBER_OF_PROJECTS: "completing tasks",
+    BadgeType.REVIEW_SCORE: "getting great reviews",
+    BadgeType.WORK_SPEED: "being ahead of schedule",
+}
+
+BADGE_TIER_NAMES = dict(BadgeTier.get_choices())
+
+
+class Reputation:
+
+    def __init__(self, user_id, completed_task_count, ahead_of_time_task_count,
+                 average_review_score):
+        self.user_id = user_id
+        self.completed_task_count = completed_task_count
+        self.ahead_of_time_task_count = ahead_of_time_task_count
+        self.average_review_score = average_review_score
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__}: user {self.user_id}: '
+                f'{self.completed_task_count} tasks, '
+                f'{self.average_review_score} score, '
+                f'{self.ahead_of_time_task_ratio} ahead of time>')
+
+    @property
+    def ahead_of_time_task_ratio(self):
+        if self.completed_task_count:
+            return self.ahead_of_time_task_count / self.completed_task_count
+        return None
+
+    def measures(self):
+        """The reputation's measure of each type of badge (or None, where
+        it cannot yet be measured).
+
+        """
+        return {
+            BadgeType.NUMBER_OF_PROJECTS: self.completed_task_count,
+            BadgeType.REVIEW_SCORE: self.average_review_score,
+            BadgeType.WORK_SPEED: self.ahead_of_time_task_ratio,
+        }
+
+
+def badge_tier(badge_type, measure):
+    (thresholds, inclusive) = BADGE_TIERS[badge_type]
+    for (tier, threshold) in thresholds:
+        if measure > threshold or (inclusive and measure == threshold):
+            return tier
+    return None
+
+
+def count_subquery(query_set):
+    return Coalesce(
+        Subquery(
+            query_set.order_by().values('user').annotate(count=Count('id')).values('count'),
+            output_field=IntegerField(),
+        ),
+        0,
+        output_field=IntegerField(),
+    )
+
+
+@ReputationDomain
+def compute_reputations(users):
+    """Compute the reputations of the given users (queryset or iterable
+    of users or their IDs), in a single query.
+
+    """
+    if not isinstance(users, QuerySet):
+        users = [getattr(user, 'pk', user) for user in users]
+
+    completed_roles = ProjectTaskRole.objects.filter(
+        user=OuterRef('pk'),
+        task__stage=TaskStatus.COMPLETED,
+    )
+    ahead_of_time_roles = completed_roles.annotate(
+        estimated_duration=F('task__estimated_end_date') - F('task__estimated_start_date'),
+        actual_duration=F('task__actual_end_date') - F('task__actual_start_date'),
+    ).filter(
+        estimated_duration__gt=F('actual_duration'),
+    )
+    average_review_score = ProjectTaskReview.objects.filter(
+        volunteer=OuterRef('pk'),
+        review_result=ReviewStatus.ACCEPTED,
+    ).order_by().values('volunteer').annotate(score=Avg('review_score')).values('score')
+
+    return [
+        Reputation(*values)
+        for values in User.objects.filter(pk__in=users).annotate(
+            completed_task_count=count_subquery(completed_roles),
+            ahead_of_time_task_count=count_subquery(ahead_of_time_roles),
+            average_review_score=Subquery(average_review_score, output_field=FloatField()),
+        ).values_list(
+            'id',
+            'completed_task_count',
+            'ahead_of_time_task_count',
+            'average_review_score',
+        ).order_by('id')
+    ]
+
+
+@ReputationDomain._method_
+def update_reputations(self, users, notify=True):
+    """Recompute the reputations of the given users (queryset or iterable
+    of users or their IDs), and update their volunteer profiles and
+    badges accordingly.
+
+    Users are notified of changes to their badges unless ``notify`` is
+    false.
+
+    Returns the number of badges awarded, changed and removed.
+
+    """
+    reputations = {
+        reputation.user_id: reputation for reputation in self.compute_reputations(users)
+    }
+
+    with transaction.atomic():
+        profiles = list(
+            VolunteerProfile.objects.filter(user__in=list(reputations)).only('id', 'user')
+        )
+        for profile in profiles:
+            reputation = reputations[profile.user_id]
+            profile.completed_task_count = reputation.completed_task_count
+            if reputation.average_review_score is not None:
+                profile.average_review_score = reputation.average_review_score
+            if reputation.ahead_of_time_task_ratio is not None:
+                profile.ahead_of_time_task_ratio = reputation.ahead_of_time_task_ratio
+        VolunteerProfile.objects.bulk_update(
+            profiles,
+            ['completed_task_count', 'average_review_score', 'ahead_of_time_task_ratio'],
+        )
+
+        current_badges = {
+            (badge.user_id, badge.type): badge
+            for badge in UserBadge.objects.filter(user__in=list(reputations),
+                                                  type__in=list(BADGE_TIERS))
+        }
+
+        (awarded, changed, removed) = ([], [], [])
+        for reputation in reputations.values():
+            for (badge_type, measure) in reputation.measures().items():
+                # (badges aren't revised until their measure is available)
+                if measure is None:
+                    continue
+
+                tier = badge_tier(badge_type, measure)
+                badge = current_badges.get((reputation.user_id, badge_type))
+                if badge is None:
+                    if tier is not None:
+                        awarded.append(UserBadge(user_id=reputation.user_id, type=badge_type,
+                                                 tier=tier))
+                elif tier is None:
+                    removed.append(badge)
+                elif tier != badge.tier:
+                    changed.append((badge, badge.tier))
+                    badge.tier = tier
+
+        UserBadge.objects.bulk_create(awarded)
+        UserBadge.objects.bulk_update([badge for (badge, _previous_tier) in changed], ['tier'])
+        UserBadge.objects.filter(pk__in=[badge.pk for badge in removed]).delete()
+
+        if notify and (awarded or changed or removed):
+            notify_badge_changes(awarded, changed, removed)
+
+    return (len(awarded), len(changed), len(removed))
+
+
+def notify_badge_changes(awarded, changed, removed):
+    users = User.objects.in_bulk({
+        badge.user_id for badge in awarded + removed + [badge for (badge, _tier) in changed]
+    })
+
+    # (bulk_create doesn't set primary keys under all databases)
+    awarded_ids = {}
+    if awarded:
+        for (badge_id, user_id, badge_type) in UserBadge.objects.filter(
+            user__in={badge.user_id for badge in awarded},
+        ).values_list('id', 'user', 'type'):
+            awarded_ids[(user_id, badge_type)] = badge_id
+
+    for badge in awarded:
+        message = (
+            "Congratulations! You have been awarded a new badge ({0}) for {1}. "
+            "Keep up with the good work!"
+        ).format(BADGE_TIER_NAMES[badge.tier], BADGE_ACHIEVEMENTS[badge.type])
+        notify_badge_change(users[badge.user_id], message,
+                            awarded_ids.get((badge.user_id, badge.type)))
+
+    for (badge, previous_tier) in changed:
+        if previous_tier < badge.tier:
+            message = (
+                "Congratulations! Your award for {0} has increased to {1}. "
+                "Keep up with the good work!"
+            ).format(BADGE_ACHIEVEMENTS[badge.type], BADGE_TIER_NAMES[badge.tier])
+        else:
+            message = "Unfortunately your award for {0} has decreased to {1}.".format(
+                BADGE_ACHIEVEMENTS[badge.type], BADGE_TIER_NAMES[badge.tier])
+        notify_badge_change(users[badge.user_id], message, badge.id)
+
+    for badge in removed:
+        message = "Unfortunately your award for {0} was removed.".format(
+            BADGE_ACHIEVEMENTS[badge.type])
+        notify_badge_change(users[badge.user_id], message, badge.id)
+
+
+def notify_badge_change(user, message, badge_id):
+    NotificationDomain.add_user_notification(
+        user,
+        message,
+        NotificationSeverity.INFO,
+        NotificationSource.BADGE,
+        badge_id,
+    )
+
+
+@ReputationDomain
+def enqueue_reputation_update(user_ids, key=None):
+    """Recompute the reputations of the given users (by ID) by
+    background job (see: ``domain.jobs``).
+
+    """
+    return jobs.enqueue('update_reputations', key=key, user_ids=list(user_ids))
+
+
+@jobs.job('update_reputations')
+def update_reputations_job(user_ids):
+    ReputationDomain.update_reputations(user_ids)
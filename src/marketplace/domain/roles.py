@@ -0,0 +1,129 @@
+"""Snapshots of a user's roles within a project or organization.
+
+Permission predicates consult the user's ``ProjectRole``,
+``ProjectTaskRole`` and ``OrganizationRole`` rows, and a single page may
+evaluate a great many of them. Rather than querying for each, predicates
+answer from a snapshot of the relevant rows.
+
+Within a snapshot scope -- by default, each request (see:
+``marketplace.middleware.role_snapshot_middleware``) -- snapshots are
+loaded once per user and project/organization, and discarded whenever a
+role (or task) is saved or deleted. Outside of any scope, a fresh snapshot
+is loaded for each predicate.
+
+"""
+import contextlib
+import threading
+
+from django.db.models.signals import post_delete, post_save
+
+from ..models.org import OrganizationRole
+from ..models.proj import ProjectRole, ProjectTask, ProjectTaskRole, TaskRole, TaskStatus
+
+
+ACTIVE_TASK_STAGES = (TaskStatus.STARTED, TaskStatus.WAITING_REVIEW)
+
+
+class ProjectRoleSnapshot:
+
+    def __init__(self, user, project_id):
+        self.project_roles = frozenset(
+            ProjectRole.objects.filter(
+                user=user,
+                project_id=project_id,
+            ).values_list('role', flat=True)
+        )
+        self.volunteer_tasks = tuple(
+            ProjectTaskRole.objects.filter(
+                user=user,
+                role=TaskRole.VOLUNTEER,
+                task__project_id=project_id,
+            ).values_list('task_id', 'task__type', 'task__stage')
+        )
+
+    def has_role(self, role=None):
+        if role is None:
+            return bool(self.project_roles)
+        return role in self.project_roles
+
+    def is_volunteer(self, task_types=None, active=False, task_id=None):
+        return any(
+            (task_types is None or task_type in task_types) and
+            (not active or stage in ACTIVE_TASK_STAGES) and
+            (task_id is None or task_id == volunteer_task_id)
+            for (volunteer_task_id, task_type, stage) in self.volunteer_tasks
+        )
+
+
+class OrganizationRoleSnapshot:
+
+    def __init__(self, user, organization_id):
+        self.roles = frozenset(
+            OrganizationRole.objects.filter(
+                user=user,
+                organization_id=organization_id,
+            ).values_list('role', flat=True)
+        )
+
+    def has_role(self, role=None):
+        if role is None:
+            return bool(self.roles)
+        return role in self.roles
+
+
+_scope = threading.local()
+
+
+@contextlib.contextmanager
+def role_snapshot_scope():
+    """Reuse role snapshots for the duration of the enclosed block."""
+    outer = getattr(_scope, 'snapshots', None)
+    _scope.snapshots = {}
+    try:
+        yield
+    finally:
+        _scope.snapshots = outer
+
+
+def clear_role_snapshots(*args, **kwargs):
+    snapshots = getattr(_scope, 'snapshots', None)
+    if snapshots:
+        snapshots.clear()
+
+
+def _get_snapshot(snapshot_class, user, target):
+    target_id = getattr(target, 'pk', target)
+    snapshots = getattr(_scope, 'snapshots', None)
+
+    if snapshots is None:
+        return snapshot_class(user, target_id)
+
+    key = (snapshot_class, user.pk, target_id)
+    try:
+        return snapshots[key]
+    except KeyError:
+        snapshot = snapshots[key] = snapshot_class(user, target_id)
+        return snapshot
+
+
+def project_roles(user, project):
+    """Snapshot of the (authenticated) user's roles in the given project
+    (instance or ID).
+
+    """
+    return _get_snapshot(ProjectRoleSnapshot, user, project)
+
+
+def organization_roles(user, organization):
+    """Snapshot of the (authenticated) user's roles in the given
+    organization (instance or ID).
+
+    """
+    return _get_snapshot(OrganizationRoleSnapshot, user, organization)
+
+
+for sender in (ProjectRole, ProjectTaskRole, ProjectTask, OrganizationRole):
+    post_save.connect(clear_role_snapshots, sender=sender,
+                      dispatch_uid=f'clear_role_snapshots_{sender.__name__}_save')
+    post_delete.connect(clear_role_snapshots, sender=sender,
+                        dispatch_uid=f'clear_role_snapshots_{sender.__name__}_delete')
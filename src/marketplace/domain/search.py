@@ -0,0 +1,274 @@
+"""Full-text search of projects.
+
+Each project has a search document (ProjectSearchDocument), denormalizing
+the text by which it may be found: its name, short summary, organization
+name, required skills and social causes. Documents are kept in sync by
+signal receivers (below), and may be rebuilt wholesale by
+`manage.py rebuild_search_index`.
+
+Documents are indexed by database-specific means:
+
+* PostgreSQL: a weighted tsvector column, under a GIN index
+
+* SQLite: an FTS5 virtual table (where the SQLite build supports it)
+
+Lacking either, search falls back to (unranked) substring matching.
+
+"""
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connection, transaction
+from django.db.models import F, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+
+from ..models.common import SocialCause
+from ..models.org import Organization
+from ..models.proj import (
+    Project, ProjectSearchDocument, ProjectSocialCause, ProjectTask, ProjectTaskRequirement,
+)
+from ..models.user import Skill
+
+
+SEARCH_CONFIG = 'english'
+
+FTS_TABLE = 'marketplace_projectsearch_fts'
+
+# Column weights, in order: name, organization_name, skills, social_causes, short_summary
+FTS_WEIGHTS = (10.0, 5.0, 2.0, 2.0, 1.0)
+
+SOCIAL_CAUSE_NAMES = dict(SocialCause.get_choices())
+
+
+def tokenize(text):
+    return re.findall(r'\w+', text)
+
+
+class PostgresSearchBackend:
+
+    @staticmethod
+    def index(project_ids):
+        ProjectSearchDocument.objects.filter(project__in=project_ids).update(
+            search_vector=(
+                SearchVector('name', weight='A', config=SEARCH_CONFIG) +
+                SearchVector('organization_name', weight='B', config=SEARCH_CONFIG) +
+                SearchVector('skills', 'social_causes', weight='C', config=SEARCH_CONFIG) +
+                SearchVector('short_summary', weight='D', config=SEARCH_CONFIG)
+            )
+        )
+
+    @staticmethod
+    def unindex(project_ids):
+        pass  # (documents' deletion suffices)
+
+    @staticmethod
+    def search(projects, tokens):
+        query = SearchQuery(
+            ' & '.join(f'{token}:*' for token in tokens),
+            config=SEARCH_CONFIG,
+            search_type='raw',
+        )
+        return projects.filter(
+            search_document__search_vector=query,
+        ).annotate(
+            search_rank=SearchRank(F('search_document__search_vector'), query),
+        )
+
+
+class SqliteSearchBackend:
+
+    @staticmethod
+    def index(project_ids):
+        SqliteSearchBackend.unindex(project_ids)
+
+        placeholders = ', '.join(['%s'] * len(project_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {FTS_TABLE} '
+                '(rowid, name, organization_name, skills, social_causes, short_summary) '
+                'SELECT project_id, name, organization_name, skills, social_causes, short_summary '
+                f'FROM {ProjectSearchDocument._meta.db_table} WHERE project_id IN ({placeholders})',
+                project_ids,
+            )
+
+    @staticmethod
+    def unindex(project_ids):
+        placeholders = ', '.join(['%s'] * len(project_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', project_ids)
+
+    @staticmethod
+    def search(projects, tokens):
+        query = ' '.join(f'"{token}"*' for token in tokens)
+        weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+        # (filter(id__in=RawSQL(...)) would wrap the subquery in a second pair of
+        # parentheses, which SQLite reads as a scalar subquery)
+        return projects.extra(
+            where=[f'{Project._meta.db_table}.id IN (SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s)'],
+            params=[query],
+        ).annotate(
+            # (bm25 scores better matches lower)
+            search_rank=RawSQL(
+                f'SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid = {Project._meta.db_table}.id',
+                [query],
+            ),
+        )
+
+
+class SubstringSearchBackend:
+
+    @staticmethod
+    def index(project_ids):
+        pass
+
+    @staticmethod
+    def unindex(project_ids):
+        pass
+
+    @staticmethod
+    def search(projects, tokens):
+        for token in tokens:
+            projects = projects.filter(
+                Q(search_document__name__icontains=token) |
+                Q(search_document__organization_name__icontains=token) |
+                Q(search_document__skills__icontains=token) |
+                Q(search_document__social_causes__icontains=token) |
+                Q(search_document__short_summary__icontains=token)
+            )
+        return projects.annotate(search_rank=Value(0))
+
+
+def get_backend():
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend
+
+    if connection.vendor == 'sqlite':
+        has_fts_table = getattr(connection, '_marketplace_has_fts_table', None)
+        if has_fts_table is None:
+            has_fts_table = FTS_TABLE in connection.introspection.table_names()
+            connection._marketplace_has_fts_table = has_fts_table
+
+        if has_fts_table:
+            return SqliteSearchBackend
+
+    return SubstringSearchBackend
+
+
+def search_projects(projects, text):
+    """Filter the given Project queryset to those matching all words of
+    the given text (as word prefixes), annotated by `search_rank`
+    (greater is better).
+
+    """
+    tokens = tokenize(text)
+    if not tokens:
+        return projects.annotate(search_rank=Value(0))
+
+    return get_backend().search(projects, tokens)
+
+
+def build_search_documents(project_ids):
+    skills = {}
+    for (project_id, skill_name) in (
+        ProjectTaskRequirement.objects
+        .filter(task__project__in=project_ids)
+        .values_list('task__project', 'skill__name')
+        .distinct()
+    ):
+        skills.setdefault(project_id, []).append(skill_name)
+
+    social_causes = {}
+    for (project_id, social_cause) in (
+        ProjectSocialCause.objects
+        .filter(project__in=project_ids)
+        .values_list('project', 'social_cause')
+    ):
+        social_causes.setdefault(project_id, []).append(SOCIAL_CAUSE_NAMES.get(social_cause, ''))
+
+    return [
+        ProjectSearchDocument(
+            project_id=project_id,
+            name=name,
+            short_summary=short_summary or '',
+            organization_name=organization_name or '',
+            skills='\n'.join(sorted(skills.get(project_id, ()))),
+            social_causes='\n'.join(sorted(social_causes.get(project_id, ()))),
+        )
+        for (project_id, name, short_summary, organization_name) in (
+            Project.objects
+            .filter(pk__in=project_ids)
+            .values_list('id', 'name', 'short_summary', 'organization__name')
+        )
+    ]
+
+
+def update_search_documents(project_ids):
+    project_ids = list(project_ids)
+    if not project_ids:
+        return
+
+    documents = build_search_documents(project_ids)
+
+    with transaction.atomic():
+        ProjectSearchDocument.objects.filter(project__in=project_ids).delete()
+        ProjectSearchDocument.objects.bulk_create(documents)
+        get_backend().index(project_ids)
+
+
+def remove_search_documents(project_ids):
+    project_ids = list(project_ids)
+
+    # (deletion of a project's related rows, as it cascades, may have
+    # rebuilt the document after its collection for deletion)
+    ProjectSearchDocument.objects.filter(project__in=project_ids).delete()
+    get_backend().unindex(project_ids)
+
+
+# Signal receivers #
+
+def project_saved(sender, instance, **kwargs):
+    update_search_documents([instance.pk])
+
+
+def project_deleted(sender, instance, **kwargs):
+    remove_search_documents([instance.pk])
+
+
+def organization_saved(sender, instance, **kwargs):
+    update_search_documents(instance.project_set.values_list('id', flat=True))
+
+
+def project_social_cause_changed(sender, instance, **kwargs):
+    update_search_documents([instance.project_id])
+
+
+def task_requirement_changed(sender, instance, **kwargs):
+    update_search_documents(
+        ProjectTask.objects.filter(pk=instance.task_id).values_list('project', flat=True)
+    )
+
+
+def skill_saved(sender, instance, **kwargs):
+    update_search_documents(
+        ProjectTaskRequirement.objects
+        .filter(skill=instance)
+        .values_list('task__project', flat=True)
+        .distinct()
+    )
+
+
+post_save.connect(project_saved, sender=Project, dispatch_uid='search_project_saved')
+post_delete.connect(project_deleted, sender=Project, dispatch_uid='search_project_deleted')
+post_save.connect(organization_saved, sender=Organization, dispatch_uid='search_organization_saved')
+post_save.connect(skill_saved, sender=Skill, dispatch_uid='search_skill_saved')
+
+for (sender, receiver) in (
+    (ProjectSocialCause, project_social_cause_changed),
+    (ProjectTaskRequirement, task_requirement_changed),
+):
+    post_save.connect(receiver, sender=sender,
+                      dispatch_uid=f'search_{sender.__name__}_save')
+    post_delete.connect(receiver, sender=sender,
+                        dispatch_uid=f'search_{sender.__name__}_delete')
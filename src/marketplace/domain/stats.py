@@ -0,0 +1,92 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from namespaces import Namespace
+
+from marketplace.models.common import SkillLevel
+from marketplace.models.proj import Project, ProjectStatus
+from marketplace.models.stats import PlatformStatistics
+from marketplace.models.user import VolunteerProfile
+
+from .org import OrganizationService
+from .proj import ProjectService
+from .user import UserService
+
+
+StatsDomain = Namespace('stats')
+
+
+# The (singleton) row of platform statistics
+PLATFORM_STATISTICS_ID = 1
+
+
+@StatsDomain
+def compute_platform_statistics():
+    avg_days_month = 365.25 / 12
+    one_avg_month = timedelta(days=avg_days_month)
+    now = timezone.now()
+    one_avg_month_ago = now - one_avg_month
+
+    featured_volunteer = UserService.get_featured_volunteer()
+    if featured_volunteer:
+        featured_volunteer_skills = (
+            featured_volunteer.user.volunteerskill_set
+            .filter(level=SkillLevel.EXPERT)
+            .values_list('skill__name', flat=True)
+        )
+    else:
+        featured_volunteer_skills = ()
+
+    return PlatformStatistics(
+        id=PLATFORM_STATISTICS_ID,
+        projects_in_design=Project.objects.filter(status=ProjectStatus.DESIGN).count(),
+        projects_this_month=Project.objects.filter(creation_date__gte=one_avg_month_ago).count(),
+        volunteers_this_month=VolunteerProfile.objects.filter(creation_date__gte=one_avg_month_ago).count(),
+        featured_project=ProjectService.get_featured_project(),
+        featured_organization=OrganizationService.get_featured_organization(),
+        featured_volunteer=featured_volunteer,
+        featured_volunteer_task_count=featured_volunteer.taskcount if featured_volunteer else 0,
+        featured_volunteer_skills=", ".join(featured_volunteer_skills),
+        computation_date=now,
+    )
+
+
+@StatsDomain._method_
+def refresh_platform_statistics(self):
+    statistics = self.compute_platform_statistics()
+
+    try:
+        with transaction.atomic():
+            statistics.save()
+    except IntegrityError:
+        # another process has concurrently created the row; (theirs will do)
+        pass
+
+    return statistics
+
+
+@StatsDomain._method_
+def get_platform_statistics(self, max_age=None):
+    """Retrieve the platform statistics, recomputing them only if they
+    are older than `max_age` (by default: PLATFORM_STATISTICS_MAX_AGE)
+    seconds.
+
+    """
+    if max_age is None:
+        max_age = settings.PLATFORM_STATISTICS_MAX_AGE
+
+    statistics = (
+        PlatformStatistics.objects
+        .select_related('featured_project', 'featured_organization', 'featured_volunteer__user')
+        .prefetch_related('featured_volunteer__user__userbadge_set')
+        .filter(id=PLATFORM_STATISTICS_ID)
+        .first()
+    )
+
+    if statistics is None or statistics.computation_date < timezone.now() - timedelta(seconds=max_age):
+        return self.refresh_platform_statistics()
+
+    return statistics
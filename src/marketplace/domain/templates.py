@@ -0,0 +1,266 @@
+"""Project templates: the tasks and discussion channels with which new
+projects are created, defined as data.
+
+A template is a JSON-compatible definition, for example::
+
+    {
+        "tasks": [
+            {"key": "scoping", "name": "Project scoping", "type": "SCT", "stage": "NOT", ...},
+            ...
+        ],
+        "channels": [
+            {"name": "General discussion", "description": "..."},
+            {"name": "Project scoping", "task": "scoping", "description": "..."},
+            ...
+        ]
+    }
+
+Tasks may be given any of ``TASK_FIELDS``, and channels any of
+``CHANNEL_FIELDS``; a channel's ``task`` refers to the ``key`` of the task
+it discusses. Tasks without a channel are given a default one, and at
+least one task must be a scoping task.
+
+Organizations may register their own template (see:
+``OrganizationService.save_project_template``); others' projects are
+created from ``DEFAULT_PROJECT_TEMPLATE``. Templates are instantiated by a
+single bulk insert of tasks and another of channels, regardless of their
+size.
+
+"""
+import itertools
+import json
+from datetime import date
+
+from django.core.exceptions import ValidationError
+
+from marketplace.models.common import TaskType
+from marketplace.models.org import OrganizationProjectTemplate
+from marketplace.models.proj import ProjectDiscussionChannel, ProjectTask, TaskStatus
+
+from . import roles
+from .caching import invalidate_models, memoize
+from .common import bulk_insert
+
+
+TASK_FIELDS = ('name', 'short_summary', 'description', 'onboarding_instructions', 'type', 'stage')
+
+CHANNEL_FIELDS = ('name', 'description')
+
+
+DEFAULT_PROJECT_TEMPLATE = {
+    'tasks': [
+        {
+            'key': 'scoping',
+            'name': 'Project scoping',
+            'short_summary': 'Project scoping task to define the project work.',
+            'description': 'This project is new and needs help being defined. The project scoping includes defining the problem being solved, defining what form the soluntion will take, splitting the work into the necessary tasks, and specifying the expertise needed to complete each task. Project scopers will also review volunteer applications and will QA the work done by volunteers.',
+            'onboarding_instructions': 'Describe in detail the volunteer onboarding instructions for project scoping.',
+            'type': TaskType.SCOPING_TASK,
+            'stage': TaskStatus.NOT_STARTED,
+        },
+        {
+            'key': 'project_management',
+            'name': 'Project management',
+            'short_summary': 'Project management task to ensure the project is successful.',
+            'description': 'This project needs experienced project managers that can ensure the project gets successfully completed on time. Duties include managing the status of all the tasks in the project, ensuring work gets done at the required pace, foreseeing risks to the project and preventing blockers. Project managers will also review volunteer applications and will QA the work done by volunteers.',
+            'onboarding_instructions': 'Describe in detail the volunteer onboarding instructions for project management.',
+            'type': TaskType.PROJECT_MANAGEMENT_TASK,
+            'stage': TaskStatus.DRAFT,
+        },
+        {
+            'key': 'domain_work',
+            'name': 'Example domain work task',
+            'short_summary': 'Project work description.',
+            'description': 'Domain work tasks represent the tasks that need to be completed to finish the project. ',
+            'onboarding_instructions': 'Describe in detail the volunteer onboarding instructions for this domain work task.',
+            'type': TaskType.DOMAIN_WORK_TASK,
+            'stage': TaskStatus.DRAFT,
+        },
+        {
+            'key': 'qa',
+            'name': 'Task and project QA',
+            'short_summary': 'Task for performing QA on the domain tasks.',
+            'description': 'This project needs experienced volunteers to work on ensuring that the tasks that are completed by other volunteers meet the requirements and the expected levels of delivery quality. Duties include reviewing work that volunteers complete, giving constructive feedback, deciding when tasks are ready to be marked as completed, and reviewing the status of the project before the final signoff.',
+            'onboarding_instructions': 'Describe in detail the volunteer onboarding instructions for this QA task.',
+            'type': TaskType.QA_TASK,
+            'stage': TaskStatus.DRAFT,
+        },
+    ],
+    'channels': [
+        {
+            'name': 'General discussion',
+            'description': 'Discussion channel for general topics about the project.',
+        },
+        {
+            'name': 'Technical talk',
+            'description': 'Discussion channel for technical topics that are not specific to a single task.',
+        },
+        {
+            'name': 'Project management',
+            'task': 'project_management',
+            'description': 'Discussion channel for the task Project management.',
+        },
+        {
+            'name': 'Project scoping',
+            'task': 'scoping',
+            'description': 'Discussion channel for the task Project scoping.',
+        },
+        {
+            'name': 'Domain work',
+            'task': 'domain_work',
+            'description': 'Discussion channel for the task Domain work.',
+        },
+        {
+            'name': 'QA',
+            'task': 'qa',
+            'description': 'Discussion channel for the QA task.',
+        },
+    ],
+}
+
+
+def validate_fields(model, definition, field_names, required=('name',)):
+    unknown = set(definition) - set(field_names)
+    if unknown:
+        raise ValidationError("Unknown fields: {0}.".format(', '.join(sorted(unknown))))
+
+    missing = [field_name for field_name in required if not definition.get(field_name)]
+    if missing:
+        raise ValidationError("Missing fields: {0}.".format(', '.join(missing)))
+
+    instance = model(**definition)
+    instance.clean_fields(exclude=[field.name for field in model._meta.fields if field.name not in definition])
+
+
+def validate_list(definition, name):
+    items = definition.get(name, [])
+    if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+        raise ValidationError("The {0} of a template are a list of objects.".format(name))
+    return items
+
+
+def validate_key(key):
+    if key is not None and not isinstance(key, str):
+        raise ValidationError("Task keys are strings: {0!r}.".format(key))
+
+
+class ProjectTemplate:
+    """The tasks and discussion channels of new projects, as defined by
+    the given (JSON-compatible) ``definition``.
+
+    Raises ValidationError upon an invalid definition.
+
+    """
+    def __init__(self, definition):
+        if not isinstance(definition, dict) or set(definition) - {'tasks', 'channels'}:
+            raise ValidationError("A template defines (only) its tasks and channels.")
+
+        self.tasks = []
+        task_keys = {}
+        for (index, task) in enumerate(validate_list(definition, 'tasks')):
+            task = dict(task)
+            key = task.pop('key', None)
+            validate_key(key)
+            validate_fields(ProjectTask, task, TASK_FIELDS)
+            if key is not None:
+                if key in task_keys:
+                    raise ValidationError("Duplicate task key: {0}.".format(key))
+                task_keys[key] = index
+            self.tasks.append(task)
+
+        self.channels = []
+        for channel in validate_list(definition, 'channels'):
+            channel = dict(channel)
+            task_key = channel.pop('task', None)
+            validate_key(task_key)
+            validate_fields(ProjectDiscussionChannel, channel, CHANNEL_FIELDS)
+            if task_key is not None and task_key not in task_keys:
+                raise ValidationError("Unknown task of channel {0}: {1}.".format(channel['name'], task_key))
+            self.channels.append((channel, task_keys.get(task_key)))
+
+        discussed = [task_index for (_channel, task_index) in self.channels if task_index is not None]
+        if len(set(discussed)) < len(discussed):
+            raise ValidationError("Tasks may be discussed by a single channel each.")
+
+        # the project workflow begins with the completion of its scoping
+        task_type_default = ProjectTask._meta.get_field('type').default
+        if not any(task.get('type', task_type_default) == TaskType.SCOPING_TASK for task in self.tasks):
+            raise ValidationError("A template defines at least one scoping task.")
+
+        # every task is discussed by a channel, as those of create_task
+        for (index, task) in enumerate(self.tasks):
+            if index not in discussed:
+                self.channels.append((
+                    {
+                        'name': task['name'],
+                        'description': "Discussion channel for the project task {0}".format(task['name']),
+                    },
+                    index,
+                ))
+
+    @classmethod
+    def from_json(cls, text):
+        try:
+            definition = json.loads(text)
+        except ValueError as error:
+            raise ValidationError("Invalid JSON: {0}".format(error))
+        return cls(definition)
+
+    def build_tasks(self, project):
+        return [
+            ProjectTask(
+                project=project,
+                accepting_volunteers=False,
+                percentage_complete=0,
+                business_area='no',
+                estimated_start_date=date.today(),
+                estimated_end_date=date.today(),
+                **task
+            )
+            for task in self.tasks
+        ]
+
+    def build_channels(self, project, tasks):
+        """Build the channels of the given project, discussing its (saved)
+        ``tasks``, as built by ``build_tasks``.
+
+        """
+        return [
+            ProjectDiscussionChannel(
+                project=project,
+                related_task=None if task_index is None else tasks[task_index],
+                **channel
+            )
+            for (channel, task_index) in self.channels
+        ]
+
+    def create(self, projects):
+        """Create the tasks and channels of the given (saved) projects, by
+        a bulk insert of each.
+
+        """
+        project_tasks = [self.build_tasks(project) for project in projects]
+        tasks = list(itertools.chain.from_iterable(project_tasks))
+        for task in tasks:
+            # (bulk_create doesn't call save())
+            task.render_markdown()
+        bulk_insert(ProjectTask, tasks)
+
+        ProjectDiscussionChannel.objects.bulk_create(
+            channel
+            for (project, tasks) in zip(projects, project_tasks)
+            for channel in self.build_channels(project, tasks)
+        )
+
+        # (bulk_create sends no post_save)
+        invalidate_models(ProjectTask, ProjectDiscussionChannel)
+        roles.clear_role_snapshots()
+
+
+@memoize(timeout=600, invalidated_by=(OrganizationProjectTemplate,))
+def get_project_template(organization_id):
+    """The template of the given organization's new projects."""
+    project_template = OrganizationProjectTemplate.objects.filter(organization_id=organization_id).first()
+    if project_template is None:
+        return ProjectTemplate(DEFAULT_PROJECT_TEMPLATE)
+    return ProjectTemplate.from_json(project_template.definition)
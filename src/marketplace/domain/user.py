@@ -1,5 +1,3 @@
-import requests
-
 from django.conf import settings
 from django.db import transaction
 from django.db.models import Q, Count, F
@@ -11,6 +9,7 @@ from marketplace.authorization.common import ensure_user_has_permission, ensure_
 
 from marketplace.models.common import ReviewStatus, SkillLevel
 from marketplace.models.org import OrganizationRole
+from marketplace.models.proj import ProjectTaskRole
 from marketplace.models.user import (
     User,
     UserType,
@@ -31,6 +30,7 @@ from .common import validate_consistent_keys, award_view_model_translation, task
 from .org import OrganizationService
 from .proj import ProjectService
 from .notifications import NotificationDomain, NotificationService
+from .caching import memoize
 
 
 # Namespace declaration #
@@ -94,13 +94,23 @@ def verify_captcha(answer):
     if settings.RECAPTCHA_SECRET_KEY is None:
         return True
 
-    service_response = requests.post(
-        'https://www.google.com/recaptcha/api/siteverify',
-        data={
-            'secret': settings.RECAPTCHA_SECRET_KEY,
-            'response': answer,
-        }
-    )
+    # (imported upon use, rather than upon the start of every process)
+    import requests
+
+    try:
+        service_response = requests.post(
+            'https://www.google.com/recaptcha/api/siteverify',
+            data={
+                'secret': settings.RECAPTCHA_SECRET_KEY,
+                'response': answer,
+            },
+            # (don't hold the worker thread for an unresponsive service)
+            timeout=settings.RECAPTCHA_TIMEOUT,
+        )
+        service_response.raise_for_status()
+    except requests.RequestException as exc:
+        raise ValueError('The reCAPTCHA answer could not be verified; please try again') from exc
+
     return service_response.json().get('success') is True
 
 
@@ -251,8 +261,10 @@ class UserService():
         return base_query.distinct().order_by('user__first_name', 'user__last_name')
 
     @staticmethod
+    @memoize(timeout=600, version=2, invalidated_by=(VolunteerProfile, ProjectTaskRole))
     def get_featured_volunteer():
         return VolunteerProfile.objects.filter(volunteer_status=ReviewStatus.ACCEPTED) \
+            .select_related('user') \
             .annotate(taskcount=Count('user__projecttaskrole')) \
             .order_by('-average_review_score', '-taskcount') \
             .first()
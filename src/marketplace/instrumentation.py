@@ -0,0 +1,154 @@
+"""Per-request timing of the database, templates and domain.
+
+Timings are collected only within ``request_timing()`` (as entered by
+``marketplace.middleware.request_instrumentation_middleware``), into a
+record private to the thread serving the request::
+
+    with request_timing() as timing:
+        response = get_response(request)
+
+    timing.durations  # {'db': 0.012, 'template': 0.034, 'domain': 0.021}
+    timing.query_count
+
+Database time is measured by way of connections' execute wrappers.
+Template and domain time require that their entry points be wrapped (see
+``install()``) -- only outermost calls are timed, such that nested
+rendering and domain calls are not counted twice.
+
+Note that these categories overlap: e.g., queries issued by a domain
+function count both toward database and domain time.
+
+"""
+import contextlib
+import functools
+import inspect
+import threading
+import time
+
+from django.db import connections
+
+
+local = threading.local()
+
+installed = False
+
+
+class RequestTiming:
+
+    def __init__(self):
+        self.durations = {}
+        self.query_count = 0
+        self.depths = {}
+
+    def add(self, name, duration):
+        self.durations[name] = self.durations.get(name, 0) + duration
+
+
+def get_current_timing():
+    return getattr(local, 'timing', None)
+
+
+@contextlib.contextmanager
+def request_timing():
+    timing = local.timing = RequestTiming()
+
+    try:
+        with contextlib.ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(time_query))
+
+            yield timing
+    finally:
+        local.timing = None
+
+
+@contextlib.contextmanager
+def timed(name):
+    """Time the enclosed block toward the current request's ``name``
+    duration (unless it is nested within another such block).
+
+    """
+    timing = get_current_timing()
+
+    if timing is None or timing.depths.get(name):
+        yield
+        return
+
+    timing.depths[name] = 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timing.add(name, time.perf_counter() - start)
+        timing.depths[name] = 0
+
+
+def time_query(execute, sql, params, many, context):
+    timing = get_current_timing()
+    if timing is not None:
+        timing.query_count += 1
+
+    with timed('db'):
+        return execute(sql, params, many, context)
+
+
+def timed_function(name, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with timed(name):
+            return func(*args, **kwargs)
+
+    wrapper.__instrumented__ = True
+    return wrapper
+
+
+def instrument_namespace(namespace, name):
+    from namespaces import Namespace
+
+    for (key, value) in list(vars(namespace).items()):
+        if isinstance(value, Namespace) and not key.startswith('__'):
+            instrument_namespace(value, name)
+        elif inspect.isfunction(value) and not hasattr(value, '__instrumented__'):
+            # (namespaces resist reassignment)
+            namespace.__dict__[key] = timed_function(name, value)
+
+
+def instrument_class(cls, name):
+    for (key, value) in list(vars(cls).items()):
+        if isinstance(value, staticmethod) and not hasattr(value.__func__, '__instrumented__'):
+            setattr(cls, key, staticmethod(timed_function(name, value.__func__)))
+
+
+def install():
+    """Wrap the entry points of template rendering and the domain for
+    timing.
+
+    Wrapped functions time their calls only within ``request_timing()``;
+    otherwise, their overhead is that of a thread-local look-up.
+
+    """
+    global installed
+
+    if installed:
+        return
+
+    from django.template.backends.django import Template
+
+    from marketplace import domain
+    from marketplace.domain import news, notifications, org, proj, user
+
+    Template.render = timed_function('template', Template.render)
+
+    instrument_namespace(domain.marketplace, 'domain')
+
+    for service in (
+        news.NewsService,
+        notifications.NotificationService,
+        org.OrganizationService,
+        proj.ProjectService,
+        proj.ProjectTaskService,
+        user.UserService,
+    ):
+        instrument_class(service, 'domain')
+
+    installed = True
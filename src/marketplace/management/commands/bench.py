@@ -0,0 +1,80 @@
+import datetime
+import json
+import platform
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from marketplace import benchmarks
+
+
+def describe_run(suites, repeat):
+    return {
+        'date': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'suites': suites,
+        'repeat': repeat,
+        'app_version': settings.APP_VERSION,
+        'database': connection.vendor,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'host': platform.node(),
+    }
+
+
+class Command(BaseCommand):
+
+    help = (
+        "run a benchmark suite against the configured database "
+        "(all changes made by the suite are rolled back)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'suites',
+            metavar='suite',
+            nargs='+',
+            choices=benchmarks.SUITES,
+            help="benchmark suite(s) to run (choices: %(choices)s)",
+        )
+        parser.add_argument(
+            '--size',
+            action='append',
+            dest='sizes',
+            type=int,
+            metavar='N',
+            help="problem size(s) to run the suite at (default: suite-specific)",
+        )
+        parser.add_argument(
+            '--repeat',
+            default=3,
+            type=int,
+            help="number of runs per case, of which the median is reported "
+                 "(default: %(default)s)",
+        )
+        parser.add_argument(
+            '--json',
+            dest='json_path',
+            metavar='path',
+            help="also write results to the given file as JSON (with a description "
+                 "of the run, for the tracking of trends across runs)",
+        )
+
+    def handle(self, suites, sizes, repeat, json_path, **options):
+        rows = []
+
+        for name in suites:
+            suite = benchmarks.load_suite(name)
+            for row in suite.run(sizes=sizes, repeat=repeat):
+                self.stdout.write(
+                    "{suite:<16} {case:<44} {size:>8} {seconds:>12.6f}s {queries:>8} queries"
+                    .format(**row)
+                )
+                rows.append(row)
+
+        if json_path:
+            with open(json_path, 'w') as json_file:
+                json.dump({'run': describe_run(suites, repeat), 'results': rows}, json_file, indent=2)
+
+            self.stdout.write(self.style.SUCCESS(f'Wrote {len(rows)} results to {json_path}'))
@@ -1,15 +1,42 @@
+from django.core.exceptions import ValidationError
 from django.core.management.base import BaseCommand, CommandError
 from django.conf import settings
 from argparse import RawTextHelpFormatter
 from csv import DictReader
 import os
+import time
 
 from marketplace.domain.org import OrganizationService
 from marketplace.domain.proj import ProjectService
-from marketplace.models.proj import Project
+from marketplace.models.org import Organization
+from marketplace.models.proj import Project, ProjectStatus
 from marketplace.models.user import User
 
 
+PROJECT_FIELDS = (
+    'name', 'short_summary', 'motivation', 'solution_description', 'project_impact',
+    'stakeholders', 'available_staff', 'banner_image_url', 'project_cause',
+    'scope_goals', 'scope_interventions', 'scope_available_data', 'scope_analysis',
+    'scope_validation_methodology', 'scope_implementation', 'developer_agreement',
+    'intended_start_date', 'intended_end_date', 'status', 'deliverables_description',
+    'deliverable_github_url', 'deliverable_management_url',
+    'deliverable_documentation_url', 'deliverable_reports_url', 'is_demo',
+)
+
+COLUMNS = ('user_pk', 'org_pk') + PROJECT_FIELDS
+
+
+def build_project(row):
+    return Project(**{field_name: row[field_name] for field_name in PROJECT_FIELDS})
+
+
+def parse_pk(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
 class Command(BaseCommand):
     help = '''Loads a list of projects from a csv file.
 
@@ -47,7 +74,12 @@ The 'project_cause' field must be set to one of:
         ID    		International development
         PS    		Public Safety
         EC    		Economic Development
-        OT    		Other'''
+        OT    		Other
+
+With --bulk, the whole file is validated before any project is created, and
+projects are then created in batches, each by a single transaction of bulk
+inserts. Rather than with notifications per project, organization members and
+project owners are notified with a summary (or not at all, with --no-notify).'''
 
     def add_arguments(self, parser):
         super(Command, self).add_arguments(parser)
@@ -56,10 +88,26 @@ The 'project_cause' field must be set to one of:
             '--file', dest='file_path', default=os.path.join(settings.BASE_DIR,'marketplace','data','sample_projects.csv'),
             help='Specifies the CSV file to load project data from. If not provided, the command will load sample projects fom marketplace/data/sample_projects.csv',
         )
+        parser.add_argument(
+            '--bulk', action='store_true',
+            help='Validates the whole file, then creates its projects in bulk.',
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Specifies the number of projects created per transaction with --bulk (default: %(default)s).',
+        )
+        parser.add_argument(
+            '--no-notify', dest='notify', action='store_false',
+            help='Suppresses the notifications of projects created with --bulk.',
+        )
 
     def handle(self, *args, **options):
         path = options.get('file_path')
         self.stdout.write('Loading projects file {0}'.format(path))
+        if options['bulk']:
+            self.load_bulk(path, options['batch_size'], options['notify'])
+            return
+
         with open(path) as csvfile:
             reader = DictReader(csvfile)
             # ['user_pk', 'org_pk',
@@ -72,32 +120,7 @@ The 'project_cause' field must be set to one of:
             #     'deliverable_documentation_url', 'deliverable_reports_url',
             #     'is_demo'])
             for row in reader:
-                new_project = Project()
-                new_project.name = row['name']
-                new_project.short_summary = row['short_summary']
-                new_project.motivation = row['motivation']
-                new_project.solution_description = row['solution_description']
-                new_project.project_impact = row['project_impact']
-                new_project.stakeholders = row['stakeholders']
-                new_project.available_staff = row['available_staff']
-                new_project.banner_image_url = row['banner_image_url']
-                new_project.project_cause = row['project_cause']
-                new_project.scope_goals = row['scope_goals']
-                new_project.scope_interventions = row['scope_interventions']
-                new_project.scope_available_data = row['scope_available_data']
-                new_project.scope_analysis = row['scope_analysis']
-                new_project.scope_validation_methodology = row['scope_validation_methodology']
-                new_project.scope_implementation = row['scope_implementation']
-                new_project.developer_agreement = row['developer_agreement']
-                new_project.intended_start_date = row['intended_start_date']
-                new_project.intended_end_date =  row['intended_end_date']
-                new_project.status = row['status']
-                new_project.deliverables_description = row['deliverables_description']
-                new_project.deliverable_github_url = row['deliverable_github_url']
-                new_project.deliverable_management_url = row['deliverable_management_url']
-                new_project.deliverable_documentation_url = row['deliverable_documentation_url']
-                new_project.deliverable_reports_url = row['deliverable_reports_url']
-                new_project.is_demo = row['is_demo']
+                new_project = build_project(row)
                 try:
                     organization_pk = int(row['org_pk'])
                     user_pk = int(row['user_pk'])
@@ -110,3 +133,78 @@ The 'project_cause' field must be set to one of:
                 except Exception as e:
                     self.stdout.write(self.style.WARNING('Failed to create project {0}: {1}'.format(new_project, str(e))))
         self.stdout.write(self.style.SUCCESS('Finished loading projects.'))
+
+    def load_bulk(self, path, batch_size, notify):
+        with open(path) as csvfile:
+            reader = DictReader(csvfile)
+            missing = [column for column in COLUMNS if column not in (reader.fieldnames or ())]
+            if missing:
+                raise CommandError('Missing columns: {0}'.format(', '.join(missing)))
+            rows = list(reader)
+
+        owned_projects = self.validate_rows(rows)
+
+        started = time.perf_counter()
+        for offset in range(0, len(owned_projects), batch_size):
+            batch = owned_projects[offset:offset + batch_size]
+            ProjectService.bulk_create_projects(batch)
+            count = offset + len(batch)
+            self.stdout.write('Created {0}/{1} projects ({2:.1f} projects/s)'.format(
+                count, len(owned_projects), count / (time.perf_counter() - started)))
+
+        if notify:
+            ProjectService.notify_projects_created(owned_projects)
+
+        self.stdout.write(self.style.SUCCESS('Finished loading {0} projects in {1:.1f}s.'.format(
+            len(owned_projects), time.perf_counter() - started)))
+
+    def validate_rows(self, rows):
+        """Build the project of every row, paired with its owner, or raise
+        CommandError (having listed every invalid row).
+
+        """
+        users = User.objects.in_bulk({parse_pk(row['user_pk']) for row in rows} - {None})
+        organizations = Organization.objects.in_bulk({parse_pk(row['org_pk']) for row in rows} - {None})
+        permitted = {}
+
+        owned_projects = []
+        errors = []
+        # (line 1 being the header)
+        for (line, row) in enumerate(rows, start=2):
+            owner = users.get(parse_pk(row['user_pk']))
+            if owner is None:
+                errors.append('line {0}: user {1!r} does not exist'.format(line, row['user_pk']))
+                continue
+
+            organization = organizations.get(parse_pk(row['org_pk']))
+            if organization is None:
+                errors.append('line {0}: organization {1!r} does not exist'.format(line, row['org_pk']))
+                continue
+
+            if (owner.pk, organization.pk) not in permitted:
+                permitted[(owner.pk, organization.pk)] = owner.has_perm('organization.project_create', organization)
+            if not permitted[(owner.pk, organization.pk)]:
+                errors.append('line {0}: user {1} cannot create projects in organization {2}'.format(
+                    line, owner.pk, organization.pk))
+                continue
+
+            project = build_project(row)
+            project.organization = organization
+            project.status = project.status or ProjectStatus.DRAFT
+            try:
+                project.full_clean(validate_unique=False)
+            except ValidationError as error:
+                errors.extend(
+                    'line {0}: {1}: {2}'.format(line, field_name, ' '.join(messages))
+                    for (field_name, messages) in error.message_dict.items()
+                )
+                continue
+
+            owned_projects.append((owner, project))
+
+        if errors:
+            for error in errors:
+                self.stderr.write(error)
+            raise CommandError('{0} errors in {1} rows: no projects were loaded.'.format(len(errors), len(rows)))
+
+        return owned_projects
@@ -0,0 +1,128 @@
+import json
+import random
+import threading
+import time
+
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+
+from marketplace.utils import percentile
+
+
+class Command(BaseCommand):
+
+    help = (
+        "load-test a running server with mixed CPU-bound and I/O-bound traffic\n\n"
+        "CPU-bound requests are for the project list page; I/O-bound requests are "
+        "for an endpoint which blocks as on an external service (which the server "
+        "must enable via LOADTEST_ENDPOINTS). reports throughput and latency "
+        "percentiles of each."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'base_url',
+            help="URL of the server under test (e.g. http://localhost:8000)",
+        )
+        parser.add_argument(
+            '--concurrency',
+            default=16,
+            type=int,
+            help="number of concurrent clients (default: %(default)s)",
+        )
+        parser.add_argument(
+            '--duration',
+            default=30,
+            type=float,
+            help="seconds to run (default: %(default)s)",
+        )
+        parser.add_argument(
+            '--io-share',
+            default=0.5,
+            type=float,
+            help="share of requests which are I/O-bound (default: %(default)s)",
+        )
+        parser.add_argument(
+            '--io-delay',
+            default=0.2,
+            type=float,
+            help="seconds for which I/O-bound requests block (default: %(default)s)",
+        )
+        parser.add_argument(
+            '--json',
+            dest='json_path',
+            metavar='path',
+            help="also write results to the given file as JSON",
+        )
+
+    def handle(self, base_url, concurrency, duration, io_share, io_delay, json_path, **options):
+        base_url = base_url.rstrip('/')
+        paths = {
+            'cpu': reverse('marketplace:proj_list'),
+            'io': f'/loadtest/io?delay={io_delay}',
+        }
+
+        response = requests.get(base_url + paths['io'])
+        if response.status_code != 200:
+            raise CommandError(f"I/O-bound endpoint unavailable ({response.status_code}): "
+                               "set LOADTEST_ENDPOINTS on the server under test")
+
+        samples = []
+        samples_lock = threading.Lock()
+        deadline = time.monotonic() + duration
+
+        def client(seed):
+            session = requests.Session()
+            chooser = random.Random(seed)
+            thread_samples = []
+
+            while time.monotonic() < deadline:
+                kind = 'io' if chooser.random() < io_share else 'cpu'
+                start = time.perf_counter()
+                try:
+                    ok = session.get(base_url + paths[kind]).status_code == 200
+                except requests.RequestException:
+                    ok = False
+                thread_samples.append((kind, time.perf_counter() - start, ok))
+
+            with samples_lock:
+                samples.extend(thread_samples)
+
+        threads = [threading.Thread(target=client, args=(seed,)) for seed in range(concurrency)]
+        start = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.monotonic() - start
+
+        rows = []
+        for kind in ('cpu', 'io', 'all'):
+            latencies = sorted(latency for (sample_kind, latency, _ok) in samples
+                               if kind in ('all', sample_kind))
+            if not latencies:
+                continue
+
+            rows.append({
+                'kind': kind,
+                'requests': len(latencies),
+                'errors': sum(1 for (sample_kind, _latency, ok) in samples
+                              if kind in ('all', sample_kind) and not ok),
+                'requests_per_second': round(len(latencies) / elapsed, 1),
+                'p50': percentile(latencies, 0.5),
+                'p99': percentile(latencies, 0.99),
+            })
+
+        for row in rows:
+            self.stdout.write(
+                "{kind:<4} {requests:>8} requests {errors:>6} errors "
+                "{requests_per_second:>9.1f} req/s   p50 {p50:>8.3f}s   p99 {p99:>8.3f}s"
+                .format(**row)
+            )
+
+        if json_path:
+            with open(json_path, 'w') as json_file:
+                json.dump(rows, json_file, indent=2)
+
+            self.stdout.write(self.style.SUCCESS(f'Wrote {len(rows)} results to {json_path}'))
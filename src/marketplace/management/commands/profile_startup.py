@@ -0,0 +1,118 @@
+import json
+import os
+import re
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# a worker's boot, up to its readiness to serve requests: the WSGI
+# application, and the URLconf (with it, the views)
+WORKER_BOOT = 'import project.wsgi; import django.urls; django.urls.get_resolver().url_patterns'
+
+IMPORT_TIME_PATTERN = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$')
+
+
+def parse_import_times(output):
+    """Parse the output of ``python -X importtime``.
+
+    Returns a list of (module, self seconds, cumulative seconds, depth).
+
+    """
+    timings = []
+    for line in output.splitlines():
+        match = IMPORT_TIME_PATTERN.match(line)
+        if match:
+            (self_time, cumulative_time, indent, module) = match.groups()
+            timings.append((module, int(self_time) / 1e6, int(cumulative_time) / 1e6, (len(indent) - 1) // 2))
+    return timings
+
+
+class Command(BaseCommand):
+
+    help = (
+        "report the import-time cost of starting a process, by module\n\n"
+        "by default, profiles the boot of a web worker (up to loading the URLconf); "
+        "given a management command (and its arguments), profiles that command. "
+        "modules are listed by cumulative import time (including their own imports)."
+    )
+
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'profiled_command',
+            metavar='command',
+            nargs='*',
+            help="management command (and arguments) to profile, rather than a worker's boot",
+        )
+        parser.add_argument(
+            '--limit',
+            default=30,
+            type=int,
+            help="number of modules to report (default: %(default)s)",
+        )
+        parser.add_argument(
+            '--prefix',
+            help="report only modules whose names begin with the given prefix (e.g. marketplace)",
+        )
+        parser.add_argument(
+            '--json',
+            dest='json_path',
+            metavar='path',
+            help="also write results to the given file as JSON",
+        )
+
+    def handle(self, profiled_command, limit, prefix, json_path, **options):
+        if profiled_command:
+            target = [os.path.join(settings.BASE_DIR, 'manage.py')] + profiled_command
+        else:
+            target = ['-c', WORKER_BOOT]
+
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime'] + target,
+            cwd=settings.BASE_DIR,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        timings = parse_import_times(process.stderr)
+
+        if process.returncode != 0:
+            raise CommandError(f"profiled process failed ({process.returncode}):\n" +
+                               '\n'.join(line for line in process.stderr.splitlines()
+                                         if not line.startswith('import time:')))
+
+        # (the cumulative times of top-level imports sum to the total)
+        total = sum(cumulative for (_module, _self, cumulative, depth) in timings if depth == 0)
+
+        reported = sorted(
+            (timing for timing in timings if prefix is None or timing[0].startswith(prefix)),
+            key=lambda timing: timing[2],
+            reverse=True,
+        )[:limit]
+
+        self.stdout.write(f"{'cumulative':>12} {'self':>10}   module")
+        for (module, self_time, cumulative_time, _depth) in reported:
+            self.stdout.write(f"{cumulative_time * 1000:>10.1f}ms {self_time * 1000:>8.1f}ms   {module}")
+        self.stdout.write(self.style.SUCCESS(
+            f'Total: {total * 1000:.1f}ms importing {len(timings)} modules'
+        ))
+
+        if json_path:
+            with open(json_path, 'w') as json_file:
+                json.dump(
+                    {
+                        'total': total,
+                        'modules': [
+                            {'module': module, 'self': self_time, 'cumulative': cumulative_time, 'depth': depth}
+                            for (module, self_time, cumulative_time, depth) in timings
+                        ],
+                    },
+                    json_file,
+                    indent=2,
+                )
+
+            self.stdout.write(self.style.SUCCESS(f'Wrote {len(timings)} results to {json_path}'))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from marketplace.domain import search
+from marketplace.models.proj import Project
+
+
+class Command(BaseCommand):
+
+    help = "rebuild the search documents (and index) of all projects"
+
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            default=500,
+            type=int,
+            help="projects to rebuild at once (default: %(default)s)",
+        )
+
+    def handle(self, batch_size, **options):
+        project_ids = list(Project.objects.order_by('id').values_list('id', flat=True))
+
+        for offset in range(0, len(project_ids), batch_size):
+            search.update_search_documents(project_ids[offset:offset + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt search index of {len(project_ids)} projects'))
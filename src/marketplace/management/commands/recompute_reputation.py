@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from marketplace.domain import marketplace
+from marketplace.models.user import User
+
+
+class Command(BaseCommand):
+
+    help = "recompute volunteers' reputations (task counts, review scores, work speed) and badges"
+
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'users',
+            nargs='*',
+            metavar='username',
+            help="users whose reputations to recompute",
+        )
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help="recompute the reputations of all volunteers",
+        )
+        parser.add_argument(
+            '--batch-size',
+            default=500,
+            type=int,
+            help="users to recompute at once (default: %(default)s)",
+        )
+        parser.add_argument(
+            '--notify',
+            action='store_true',
+            help="notify users of changes to their badges",
+        )
+
+    def handle(self, users, all, batch_size, notify, **options):
+        if all == bool(users):
+            raise CommandError("specify either usernames or --all")
+
+        if all:
+            user_ids = list(User.objects.filter(volunteerprofile__isnull=False)
+                                        .order_by('id').values_list('id', flat=True))
+        else:
+            user_ids = list(User.objects.filter(username__in=users).values_list('id', flat=True))
+            if len(user_ids) != len(set(users)):
+                raise CommandError("unknown username(s)")
+
+        totals = [0, 0, 0]
+        for offset in range(0, len(user_ids), batch_size):
+            counts = marketplace.reputation.update_reputations(user_ids[offset:offset + batch_size], notify=notify)
+            totals = [total + count for (total, count) in zip(totals, counts)]
+
+        self.stdout.write(self.style.SUCCESS(
+            'Recomputed reputation of {} users: {} badges awarded, {} changed, {} removed'.format(
+                len(user_ids), *totals)
+        ))
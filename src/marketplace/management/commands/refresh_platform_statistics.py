@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from marketplace.domain import marketplace
+
+
+class Command(BaseCommand):
+
+    help = "recompute the platform statistics presented by the home page"
+
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help="keep running, recomputing the statistics periodically",
+        )
+        parser.add_argument(
+            '--interval',
+            default=300,
+            type=float,
+            help="seconds between recomputations, with --loop (default: %(default)s)",
+        )
+
+    def handle(self, loop, interval, **options):
+        try:
+            while True:
+                statistics = marketplace.stats.refresh_platform_statistics()
+                self.stdout.write(self.style.SUCCESS(f'Refreshed {statistics}'))
+
+                if not loop:
+                    break
+
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from marketplace.models.proj import Project, ProjectScope, ProjectTask
+
+
+MODELS = (Project, ProjectScope, ProjectTask)
+
+
+class Command(BaseCommand):
+
+    help = (
+        "render the Markdown fields of projects, scopes and tasks to HTML\n\n"
+        "backfills the stored HTML of rows saved without it (or rendered from "
+        "since-changed source); rows whose HTML is current are left untouched."
+    )
+
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            default=500,
+            type=int,
+            help="rows to render (and update) at once (default: %(default)s)",
+        )
+
+    def handle(self, batch_size, **options):
+        for model in MODELS:
+            (rendered_count, total_count) = (0, 0)
+            object_ids = list(model.objects.order_by('id').values_list('id', flat=True))
+
+            for offset in range(0, len(object_ids), batch_size):
+                with transaction.atomic():
+                    instances = model.objects.filter(id__in=object_ids[offset:offset + batch_size])
+                    rendered = [instance for instance in instances if instance.render_markdown()]
+                    model.objects.bulk_update(rendered, ['rendered_markdown'])
+
+                rendered_count += len(rendered)
+                total_count += len(instances)
+
+            self.stdout.write(self.style.SUCCESS(
+                f'Rendered {rendered_count} of {total_count} {model._meta.verbose_name_plural}'
+            ))
@@ -0,0 +1,103 @@
+import threading
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from marketplace.domain.jobs import run_queued_jobs
+
+
+class Command(BaseCommand):
+
+    help = (
+        "run jobs enqueued by domain operations\n\n"
+        "jobs are claimed in batches, each run in a transaction of its own; failed "
+        "jobs are retried with exponential backoff. under PostgreSQL, any number of "
+        "workers (and worker threads) may run concurrently."
+    )
+
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--concurrency',
+            default=1,
+            type=int,
+            help="number of worker threads (default: %(default)s)",
+        )
+        parser.add_argument(
+            '--batch-size',
+            default=20,
+            type=int,
+            help="maximum number of jobs to claim per batch (default: %(default)s)",
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help="keep running, polling for queued jobs (rather than exiting "
+                 "once the queue is drained)",
+        )
+        parser.add_argument(
+            '--interval',
+            default=5,
+            type=float,
+            help="seconds to sleep between polls of an empty queue, with --loop "
+                 "(default: %(default)s)",
+        )
+
+    def handle(self, concurrency, batch_size, loop, interval, **options):
+        if concurrency > 1 and not connection.features.has_select_for_update_skip_locked:
+            self.stderr.write(self.style.WARNING(
+                f'{connection.vendor} does not support concurrent workers: running a single thread'
+            ))
+            concurrency = 1
+
+        self.totals = [0, 0]
+        self.lock = threading.Lock()
+        self.stopping = threading.Event()
+
+        if concurrency == 1:
+            self.work(batch_size, loop, interval)
+        else:
+            threads = [
+                threading.Thread(target=self.work_in_thread, args=(batch_size, loop, interval), daemon=True)
+                for _index in range(concurrency)
+            ]
+            for thread in threads:
+                thread.start()
+            try:
+                for thread in threads:
+                    while thread.is_alive():
+                        thread.join(1)
+            except KeyboardInterrupt:
+                self.stopping.set()
+                for thread in threads:
+                    thread.join()
+
+        (total_succeeded, total_failed) = self.totals
+        self.stdout.write(self.style.SUCCESS(
+            f'Finished: ran {total_succeeded} job(s), {total_failed} failed'
+        ))
+
+    def work(self, batch_size, loop, interval):
+        try:
+            while not self.stopping.is_set():
+                (succeeded, failed) = run_queued_jobs(batch_size)
+
+                if succeeded or failed:
+                    with self.lock:
+                        self.totals[0] += succeeded
+                        self.totals[1] += failed
+                    self.stdout.write(f'Ran {succeeded} job(s), {failed} failed')
+                elif loop:
+                    self.stopping.wait(interval)
+                else:
+                    break
+        except KeyboardInterrupt:
+            pass
+
+    def work_in_thread(self, batch_size, loop, interval):
+        # (each thread has a database connection of its own)
+        try:
+            self.work(batch_size, loop, interval)
+        finally:
+            connection.close()
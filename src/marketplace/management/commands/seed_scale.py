@@ -0,0 +1,91 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from marketplace.benchmarks.seed import SCALE_PASSWORD, ScaleGraph
+from marketplace.models.user import User
+from marketplace.domain import search
+
+
+class Command(BaseCommand):
+
+    help = (
+        "populate the database with a synthetic graph at production scale\n\n"
+        "organizations, projects (with their default tasks, scopes, roles and "
+        "channels), volunteers (with skills), applications, reviews, badges, "
+        "comments and notifications are inserted in bulk. the graph is "
+        "determined by --seed and --as-of. skills are those loaded by "
+        "init_skills (if any). all users' passwords are '" + SCALE_PASSWORD + "'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--projects',
+            default=1000,
+            type=int,
+            help="number of projects (default: %(default)s); organizations number a tenth",
+        )
+        parser.add_argument(
+            '--volunteers',
+            default=5000,
+            type=int,
+            help="number of volunteers (default: %(default)s)",
+        )
+        parser.add_argument(
+            '--comments',
+            default=50000,
+            type=int,
+            help="number of comments in projects' discussion channels (default: %(default)s)",
+        )
+        parser.add_argument(
+            '--notifications',
+            type=int,
+            help="number of user notifications (default: 100 per volunteer)",
+        )
+        parser.add_argument(
+            '--seed',
+            default=0,
+            type=int,
+            help="seed of the random generator (default: %(default)s)",
+        )
+        parser.add_argument(
+            '--as-of',
+            type=datetime.date.fromisoformat,
+            metavar='YYYY-MM-DD',
+            help="date to which the graph's dates are relative (default: today)",
+        )
+        parser.add_argument(
+            '--prefix',
+            default='scale',
+            help="prefix of the names of seeded users, organizations and projects "
+                 "(default: %(default)s)",
+        )
+        parser.add_argument(
+            '--batch-size',
+            default=5000,
+            type=int,
+            help="rows to insert at once (default: %(default)s)",
+        )
+
+    def handle(self, projects, volunteers, comments, notifications, seed, as_of, prefix, batch_size,
+               **options):
+        if User.objects.filter(username__startswith=f'{prefix}-').exists():
+            raise CommandError(f"users prefixed {prefix!r} already exist: choose another --prefix")
+
+        if notifications is None:
+            notifications = 100 * volunteers
+
+        graph = ScaleGraph(seed=seed, as_of=as_of, prefix=prefix, batch_size=batch_size)
+
+        with transaction.atomic():
+            counts = graph.seed(projects, volunteers, comments, notifications)
+
+        self.stdout.write("Rebuilding search index...")
+        project_ids = list(graph.project_ids)
+        for offset in range(0, len(project_ids), 500):
+            search.update_search_documents(project_ids[offset:offset + 500])
+
+        for (name, count) in counts.items():
+            self.stdout.write(f"{count:>12} {name}")
+        self.stdout.write(self.style.SUCCESS(f"Seeded graph {prefix!r} (seed: {seed})"))
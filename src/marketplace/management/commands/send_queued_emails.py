@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from marketplace.domain.notifications import deliver_queued_emails
+
+
+class Command(BaseCommand):
+
+    help = (
+        "deliver emails queued to the outbox\n\n"
+        "emails are claimed in batches, each of which is sent over a single mail "
+        "connection; failed deliveries are retried with exponential backoff. "
+        "under PostgreSQL, any number of workers may run concurrently."
+    )
+
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            default=50,
+            type=int,
+            help="maximum number of emails to claim per batch (default: %(default)s)",
+        )
+        parser.add_argument(
+            '--loop',
+            action='store_true',
+            help="keep running, polling for queued emails (rather than exiting "
+                 "once the outbox is drained)",
+        )
+        parser.add_argument(
+            '--interval',
+            default=5,
+            type=float,
+            help="seconds to sleep between polls of an empty outbox, with --loop "
+                 "(default: %(default)s)",
+        )
+
+    def handle(self, batch_size, loop, interval, **options):
+        (total_sent, total_failed) = (0, 0)
+
+        try:
+            while True:
+                (sent, failed) = deliver_queued_emails(batch_size)
+                total_sent += sent
+                total_failed += failed
+
+                if sent or failed:
+                    self.stdout.write(f'Sent {sent} email(s), {failed} failed')
+                elif loop:
+                    time.sleep(interval)
+                else:
+                    break
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Finished: sent {total_sent} email(s), {total_failed} failed'
+        ))
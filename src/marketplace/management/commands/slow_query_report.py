@@ -0,0 +1,125 @@
+import collections
+import glob
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from marketplace.utils import percentile
+
+
+ORDERINGS = ('total', 'count', 'p95')
+
+
+def read_entries(paths):
+    for path in paths:
+        with open(path) as log_file:
+            for line in log_file:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    continue
+
+
+def aggregate(entries):
+    """Aggregate slow-query log entries by fingerprint."""
+    groups = {}
+
+    for entry in entries:
+        group = groups.setdefault(entry['fingerprint'], {
+            'fingerprint': entry['fingerprint'],
+            'sql': entry['sql'],
+            'durations': [],
+            'callers': collections.Counter(),
+            'views': collections.Counter(),
+        })
+        group['durations'].append(entry['duration'])
+        group['callers'][entry['caller']] += 1
+        group['views'][entry['view']] += 1
+
+    stats = []
+    for group in groups.values():
+        durations = sorted(group['durations'])
+        stats.append({
+            'fingerprint': group['fingerprint'],
+            'sql': group['sql'],
+            'count': len(durations),
+            'total': sum(durations),
+            'p50': percentile(durations, 0.5),
+            'p95': percentile(durations, 0.95),
+            'max': durations[-1],
+            'callers': group['callers'].most_common(),
+            'views': group['views'].most_common(),
+        })
+
+    return stats
+
+
+class Command(BaseCommand):
+
+    help = (
+        "report the queries of the slow-query log, by fingerprint\n\n"
+        "queries logged under SLOW_QUERY_THRESHOLD are grouped by their normalized "
+        "SQL, and reported with their counts, timings, and the domain functions "
+        "and views which issued them."
+    )
+
+    requires_system_checks = False
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'paths',
+            metavar='path',
+            nargs='*',
+            help="slow-query log file(s) to read (default: SLOW_QUERY_LOG and its backups)",
+        )
+        parser.add_argument(
+            '--order-by',
+            choices=ORDERINGS,
+            default='total',
+            help="order fingerprints by total time, count or 95th-percentile time "
+                 "(default: %(default)s)",
+        )
+        parser.add_argument(
+            '--limit',
+            default=20,
+            type=int,
+            help="number of fingerprints to report (default: %(default)s)",
+        )
+        parser.add_argument(
+            '--json',
+            dest='json_path',
+            metavar='path',
+            help="also write results to the given file as JSON",
+        )
+
+    def handle(self, paths, order_by, limit, json_path, **options):
+        if not paths:
+            paths = sorted(glob.glob(glob.escape(settings.SLOW_QUERY_LOG) + '*'))
+            if not paths:
+                raise CommandError(f"no slow-query log found at {settings.SLOW_QUERY_LOG}")
+
+        stats = sorted(aggregate(read_entries(paths)), key=lambda group: group[order_by], reverse=True)
+
+        for group in stats[:limit]:
+            self.stdout.write(
+                f"{group['fingerprint']}  count={group['count']}  total={group['total']:.3f}s  "
+                f"p50={group['p50'] * 1000:.1f}ms  p95={group['p95'] * 1000:.1f}ms  "
+                f"max={group['max'] * 1000:.1f}ms"
+            )
+            self.stdout.write(f"    {group['sql'][:300]}")
+            for (caller, count) in group['callers'][:3]:
+                self.stdout.write(f"    caller: {caller or '<none>'} ({count})")
+            for (view, count) in group['views'][:3]:
+                self.stdout.write(f"    view: {view or '<none>'} ({count})")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Total: {sum(group['count'] for group in stats)} slow queries "
+            f"of {len(stats)} fingerprints"
+        ))
+
+        if json_path:
+            with open(json_path, 'w') as json_file:
+                json.dump(stats, json_file, indent=2)
+
+            self.stdout.write(self.style.SUCCESS(f'Wrote {len(stats)} results to {json_path}'))
@@ -1,7 +1,20 @@
+import contextlib
+import cProfile
+import logging
+import os
+import random
+import re
+import time
+
 from django.conf import settings
 from django.core.exceptions import MiddlewareNotUsed
 
-from marketplace import utils
+from marketplace import instrumentation, utils
+from marketplace.db import slow_queries
+from marketplace.domain.roles import role_snapshot_scope
+
+
+logger = logging.getLogger(__name__)
 
 
 def version_header_middleware(get_response):
@@ -19,6 +32,112 @@ def version_header_middleware(get_response):
     return middleware
 
 
+def request_instrumentation_middleware(get_response):
+    """Instrument requests for performance analysis.
+
+    Under ``REQUEST_TIMING``, responses report the time spent in the
+    database, templates and domain (and the number of queries) by way of
+    the ``Server-Timing`` header.
+
+    Under ``REQUEST_PROFILING_SAMPLE_RATE``, that fraction of requests are
+    profiled (with cProfile); the profiles of those slower than
+    ``REQUEST_PROFILING_THRESHOLD`` are saved to ``REQUEST_PROFILING_DIR``,
+    named for the view which served them.
+
+    """
+    timing_enabled = settings.REQUEST_TIMING
+    sample_rate = settings.REQUEST_PROFILING_SAMPLE_RATE
+
+    if not timing_enabled and not sample_rate:
+        raise MiddlewareNotUsed
+
+    if timing_enabled:
+        instrumentation.install()
+
+    def middleware(request):
+        profiler = cProfile.Profile() if sample_rate and random.random() < sample_rate else None
+        timing_context = instrumentation.request_timing() if timing_enabled else contextlib.nullcontext()
+
+        with timing_context as timing:
+            start = time.perf_counter()
+
+            if profiler is None:
+                response = get_response(request)
+            else:
+                response = profiler.runcall(get_response, request)
+
+            total = time.perf_counter() - start
+
+        if timing_enabled:
+            response['Server-Timing'] = server_timing(timing, total)
+
+        if profiler is not None and total >= settings.REQUEST_PROFILING_THRESHOLD:
+            save_profile(profiler, request, total)
+
+        return response
+
+    return middleware
+
+
+def server_timing(timing, total):
+    metrics = [
+        f'db;dur={timing.durations.get("db", 0) * 1000:.1f};desc="{timing.query_count} queries"',
+        f'template;dur={timing.durations.get("template", 0) * 1000:.1f}',
+        f'domain;dur={timing.durations.get("domain", 0) * 1000:.1f}',
+        f'total;dur={total * 1000:.1f}',
+    ]
+    return ', '.join(metrics)
+
+
+def save_profile(profiler, request, total):
+    resolver_match = request.resolver_match
+    view_name = resolver_match.view_name if resolver_match else 'unresolved'
+
+    file_name = '{timestamp}-{view}-{duration}ms-{pid}.prof'.format(
+        timestamp=time.strftime('%Y%m%dT%H%M%S'),
+        view=re.sub(r'[^\w.-]+', '.', view_name),
+        duration=round(total * 1000),
+        pid=os.getpid(),
+    )
+    path = os.path.join(settings.REQUEST_PROFILING_DIR, file_name)
+
+    try:
+        os.makedirs(settings.REQUEST_PROFILING_DIR, exist_ok=True)
+        profiler.dump_stats(path)
+    except OSError:
+        logger.exception("failed to save profile of slow request to %s", path)
+    else:
+        logger.warning("slow request (%.0fms) to %s: profile saved to %s",
+                       total * 1000, request.path, path)
+
+
+def slow_query_middleware(get_response):
+    """Attribute slow queries (see: ``SLOW_QUERY_THRESHOLD``) to the view
+    of the request which issued them.
+
+    """
+    if not settings.SLOW_QUERY_THRESHOLD:
+        raise MiddlewareNotUsed
+
+    def middleware(request):
+        with slow_queries.CurrentRequest(request):
+            return get_response(request)
+
+    return middleware
+
+
+def role_snapshot_middleware(get_response):
+    """Share users' role snapshots among the permission checks of a
+    request.
+
+    """
+    def middleware(request):
+        with role_snapshot_scope():
+            return get_response(request)
+
+    return middleware
+
+
 class UserTypeMiddleware:
 
     selector_url_name = 'marketplace:user_type_select'
@@ -0,0 +1,30 @@
+# Generated by Django 2.2.20 on 2026-10-18 03:33
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketplace', '0081_auto_20200827_1423'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OutboundEmail',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('from_email', models.CharField(max_length=254)),
+                ('to_email', models.CharField(max_length=254)),
+                ('subject', models.TextField()),
+                ('body', models.TextField()),
+                ('status', models.CharField(choices=[('PEN', 'Pending'), ('SNT', 'Sent'), ('FAI', 'Failed')], default='PEN', max_length=3)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('creation_date', models.DateTimeField(auto_now_add=True)),
+                ('next_attempt_date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('sent_date', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
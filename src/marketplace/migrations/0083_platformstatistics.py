@@ -0,0 +1,32 @@
+# Generated by Django 2.2.20 on 2026-10-18 03:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketplace', '0082_outboundemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStatistics',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('projects_in_design', models.PositiveIntegerField(default=0)),
+                ('projects_this_month', models.PositiveIntegerField(default=0)),
+                ('volunteers_this_month', models.PositiveIntegerField(default=0)),
+                ('featured_volunteer_task_count', models.PositiveIntegerField(default=0)),
+                ('featured_volunteer_skills', models.TextField(blank=True)),
+                ('computation_date', models.DateTimeField()),
+                ('featured_organization', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='marketplace.Organization')),
+                ('featured_project', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='marketplace.Project')),
+                ('featured_volunteer', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='marketplace.VolunteerProfile')),
+            ],
+            options={
+                'verbose_name_plural': 'platform statistics',
+            },
+        ),
+    ]
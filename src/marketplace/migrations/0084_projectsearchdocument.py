@@ -0,0 +1,119 @@
+# Generated by Django 2.2.20 on 2026-10-18 03:43
+
+import django.contrib.postgres.search
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Search documents of existing projects are built below, and may be rebuilt
+# by: manage.py rebuild_search_index
+
+FTS_TABLE = 'marketplace_projectsearch_fts'
+
+
+def sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        return ('ENABLE_FTS5',) in cursor.fetchall()
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE INDEX marketplace_projectsearch_vector_gin '
+            'ON marketplace_projectsearchdocument USING gin (search_vector)'
+        )
+    elif connection.vendor == 'sqlite' and sqlite_has_fts5(connection):
+        schema_editor.execute(
+            f'CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5('
+            'name, organization_name, skills, social_causes, short_summary, '
+            "tokenize = 'porter unicode61')"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS marketplace_projectsearch_vector_gin')
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {FTS_TABLE}')
+
+
+def build_search_documents(apps, schema_editor):
+    # (as by marketplace.domain.search, but of the historical models)
+    Project = apps.get_model('marketplace', 'Project')
+    ProjectSearchDocument = apps.get_model('marketplace', 'ProjectSearchDocument')
+    ProjectSocialCause = apps.get_model('marketplace', 'ProjectSocialCause')
+    ProjectTaskRequirement = apps.get_model('marketplace', 'ProjectTaskRequirement')
+
+    social_cause_names = dict(ProjectSocialCause._meta.get_field('social_cause').choices)
+
+    skills = {}
+    for (project_id, skill_name) in (
+        ProjectTaskRequirement.objects.values_list('task__project', 'skill__name').distinct()
+    ):
+        skills.setdefault(project_id, []).append(skill_name)
+
+    social_causes = {}
+    for (project_id, social_cause) in ProjectSocialCause.objects.values_list('project', 'social_cause'):
+        social_causes.setdefault(project_id, []).append(social_cause_names.get(social_cause, ''))
+
+    ProjectSearchDocument.objects.bulk_create(
+        (
+            ProjectSearchDocument(
+                project_id=project_id,
+                name=name,
+                short_summary=short_summary or '',
+                organization_name=organization_name or '',
+                skills='\n'.join(sorted(skills.get(project_id, ()))),
+                social_causes='\n'.join(sorted(social_causes.get(project_id, ()))),
+            )
+            for (project_id, name, short_summary, organization_name) in
+            Project.objects.values_list('id', 'name', 'short_summary', 'organization__name')
+        ),
+        batch_size=500,
+    )
+
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        ProjectSearchDocument.objects.update(
+            search_vector=(
+                SearchVector('name', weight='A', config='english') +
+                SearchVector('organization_name', weight='B', config='english') +
+                SearchVector('skills', 'social_causes', weight='C', config='english') +
+                SearchVector('short_summary', weight='D', config='english')
+            )
+        )
+    elif connection.vendor == 'sqlite' and sqlite_has_fts5(connection):
+        schema_editor.execute(
+            f'INSERT INTO {FTS_TABLE} '
+            '(rowid, name, organization_name, skills, social_causes, short_summary) '
+            'SELECT project_id, name, organization_name, skills, social_causes, short_summary '
+            'FROM marketplace_projectsearchdocument'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketplace', '0083_platformstatistics'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProjectSearchDocument',
+            fields=[
+                ('project', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='marketplace.Project')),
+                ('name', models.TextField(blank=True)),
+                ('short_summary', models.TextField(blank=True)),
+                ('organization_name', models.TextField(blank=True)),
+                ('skills', models.TextField(blank=True)),
+                ('social_causes', models.TextField(blank=True)),
+                ('search_vector', django.contrib.postgres.search.SearchVectorField(blank=True, null=True)),
+            ],
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+        migrations.RunPython(build_search_documents, migrations.RunPython.noop),
+    ]
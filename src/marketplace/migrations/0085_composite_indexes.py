@@ -0,0 +1,49 @@
+# Generated by Django 2.2.20 on 2026-10-18 03:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketplace', '0084_projectsearchdocument'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(fields=['status', '-creation_date'], name='project_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='project',
+            index=models.Index(condition=models.Q(models.Q(_negated=True, status='DR'), models.Q(_negated=True, status='EX'), models.Q(_negated=True, status='RM')), fields=['-creation_date'], name='project_public_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectcomment',
+            index=models.Index(fields=['channel', '-comment_date', '-id'], name='comment_channel_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projectlog',
+            index=models.Index(fields=['project', '-change_date', '-id'], name='projectlog_project_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projecttask',
+            index=models.Index(fields=['project', 'stage', 'accepting_volunteers'], name='task_project_stage_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='projecttaskrole',
+            index=models.Index(fields=['user', 'role', 'task'], name='taskrole_user_role_task_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='usernotification',
+            index=models.Index(fields=['user', '-notification_date', '-id'], name='notification_user_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteerapplication',
+            index=models.Index(fields=['task', 'status'], name='application_task_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='volunteerprofile',
+            index=models.Index(fields=['volunteer_status'], name='volunteer_status_idx'),
+        ),
+    ]
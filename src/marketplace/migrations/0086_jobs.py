@@ -0,0 +1,33 @@
+# Generated by Django 2.2.20 on 2026-10-18 04:21
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketplace', '0085_composite_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('arguments', models.TextField(default='{}', help_text='Keyword arguments of the job (JSON)')),
+                ('key', models.CharField(blank=True, help_text='Idempotency key: at most one job is enqueued per key', max_length=200, null=True, unique=True)),
+                ('status', models.CharField(choices=[('PEN', 'Pending'), ('RUN', 'Running'), ('DON', 'Done'), ('FAI', 'Failed')], default='PEN', max_length=3)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('last_error', models.TextField(blank=True)),
+                ('creation_date', models.DateTimeField(auto_now_add=True)),
+                ('next_attempt_date', models.DateTimeField(default=django.utils.timezone.now)),
+                ('completion_date', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['status', 'next_attempt_date'], name='job_status_due_idx'),
+        ),
+    ]
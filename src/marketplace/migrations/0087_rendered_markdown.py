@@ -0,0 +1,28 @@
+# Generated by Django 2.2.20 on 2026-10-18 04:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketplace', '0086_jobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='rendered_markdown',
+            field=models.TextField(blank=True, default='', editable=False, help_text='HTML rendered from the Markdown fields, with digests of their source (JSON)'),
+        ),
+        migrations.AddField(
+            model_name='projectscope',
+            name='rendered_markdown',
+            field=models.TextField(blank=True, default='', editable=False, help_text='HTML rendered from the Markdown fields, with digests of their source (JSON)'),
+        ),
+        migrations.AddField(
+            model_name='projecttask',
+            name='rendered_markdown',
+            field=models.TextField(blank=True, default='', editable=False, help_text='HTML rendered from the Markdown fields, with digests of their source (JSON)'),
+        ),
+    ]
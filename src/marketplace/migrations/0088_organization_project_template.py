@@ -0,0 +1,23 @@
+# Generated by Django 2.2.20 on 2026-10-18 05:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('marketplace', '0087_rendered_markdown'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OrganizationProjectTemplate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('definition', models.TextField(help_text='JSON definition of the tasks and discussion channels of new projects.', verbose_name='Template definition')),
+                ('last_modified_date', models.DateTimeField(auto_now=True)),
+                ('organization', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='project_template', to='marketplace.Organization', verbose_name='Organization')),
+            ],
+        ),
+    ]
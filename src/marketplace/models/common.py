@@ -1,6 +1,11 @@
+import hashlib
+import json
+
 from django.core.validators import RegexValidator
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.utils.functional import cached_property
+from django.utils.safestring import mark_safe
 
 class SocialCause():
     EDUCATION = 'ED'
@@ -101,3 +106,108 @@ class TaskType():
                     (TaskType.DOMAIN_WORK_TASK, 'Data science'),
                     (TaskType.QA_TASK, 'QA'),
                 )
+
+
+def markdown_digest(text):
+    """Digest of Markdown source, identifying the HTML rendered from it.
+
+    (The version of the renderer forms part of the digest, such that
+    upgrading it invalidates all previously-rendered HTML.)
+
+    """
+    import markdown2
+    return hashlib.md5(f'{markdown2.__version__}\n{text}'.encode()).hexdigest()
+
+
+def render_markdown(text):
+    # (as does the markdown filter of markdown_deux, in its default style)
+    from markdown_deux import markdown
+    return markdown(text)
+
+
+class RenderedMarkdown:
+    """The HTML of a model's Markdown fields, by field name.
+
+    Pre-rendered HTML is served only where its digest matches the field's
+    current source; otherwise, the field is rendered upon access.
+
+    """
+    def __init__(self, instance):
+        self.instance = instance
+        self.stored = json.loads(instance.rendered_markdown or '{}')
+
+    def __getitem__(self, field_name):
+        if field_name not in self.instance.markdown_fields:
+            raise KeyError(field_name)
+
+        text = getattr(self.instance, field_name)
+        if not text:
+            return ''
+
+        (digest, html) = self.stored.get(field_name, (None, None))
+        if digest != markdown_digest(text):
+            html = render_markdown(text)
+
+        return mark_safe(html)
+
+
+class RenderedMarkdownModel(models.Model):
+    """Abstract model storing the rendered HTML of its ``markdown_fields``.
+
+    HTML is regenerated upon save, for those fields whose source has
+    changed, and presented to templates by way of ``rendered``. For
+    example::
+
+        {{ project.rendered.motivation }}
+
+    (Rows saved otherwise -- by ``update()`` or ``bulk_create()`` -- are
+    rendered upon access, until backfilled by ``manage.py
+    render_markdown``.)
+
+    """
+    markdown_fields = ()
+
+    rendered_markdown = models.TextField(
+        blank=True,
+        default='',
+        editable=False,
+        help_text="HTML rendered from the Markdown fields, with digests of their source (JSON)",
+    )
+
+    class Meta:
+        abstract = True
+
+    @cached_property
+    def rendered(self):
+        return RenderedMarkdown(self)
+
+    def render_markdown(self):
+        """Render those Markdown fields whose source has changed.
+
+        Returns whether any stored HTML was changed.
+
+        """
+        stored = json.loads(self.rendered_markdown or '{}')
+        rendered = {}
+
+        for field_name in self.markdown_fields:
+            text = getattr(self, field_name)
+            if text:
+                digest = markdown_digest(text)
+                (stored_digest, html) = stored.get(field_name, (None, None))
+                rendered[field_name] = (digest, html if stored_digest == digest else render_markdown(text))
+
+        if rendered == {field_name: tuple(value) for (field_name, value) in stored.items()}:
+            return False
+
+        self.rendered_markdown = json.dumps(rendered, sort_keys=True)
+        return True
+
+    def save(self, *args, **kwargs):
+        self.render_markdown()
+
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(self.markdown_fields):
+            kwargs['update_fields'] = set(update_fields) | {'rendered_markdown'}
+
+        super().save(*args, **kwargs)
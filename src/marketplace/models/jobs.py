@@ -0,0 +1,60 @@
+from django.db import models
+from django.utils import timezone
+
+
+class JobStatus():
+    PENDING = 'PEN'
+    RUNNING = 'RUN'
+    DONE = 'DON'
+    FAILED = 'FAI'
+
+    def get_choices():
+        return (
+                    (JobStatus.PENDING, 'Pending'),
+                    (JobStatus.RUNNING, 'Running'),
+                    (JobStatus.DONE, 'Done'),
+                    (JobStatus.FAILED, 'Failed'),
+                )
+
+
+class Job(models.Model):
+    """A side effect of a domain operation, awaiting (or having undergone)
+    execution by the job worker.
+
+    See: `marketplace.domain.jobs` and `manage.py run_jobs`.
+
+    """
+    name = models.CharField(max_length=100)
+    arguments = models.TextField(
+        help_text="Keyword arguments of the job (JSON)",
+        default='{}',
+    )
+    key = models.CharField(
+        help_text="Idempotency key: at most one job is enqueued per key",
+        max_length=200,
+        unique=True,
+        blank=True,
+        null=True,
+    )
+    status = models.CharField(
+        max_length=3,
+        choices=JobStatus.get_choices(),
+        default=JobStatus.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    creation_date = models.DateTimeField(auto_now_add=True)
+    # when pending: when next due; when running: when its worker's claim expires
+    next_attempt_date = models.DateTimeField(default=timezone.now)
+    completion_date = models.DateTimeField(
+        blank=True,
+        null=True,
+    )
+
+    def __str__(self):
+        return f"{self.name} [{self.get_status_display()}]"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_date'], name='job_status_due_idx'),
+        ]
@@ -373,3 +373,25 @@ class OrganizationSocialCause(models.Model):
 
     class Meta:
         unique_together = ('social_cause','organization')
+
+
+class OrganizationProjectTemplate(models.Model):
+    """The tasks and discussion channels with which the organization's new
+    projects are created, in place of the platform's default (see:
+    marketplace.domain.templates).
+
+    """
+    organization = models.OneToOneField(
+        Organization,
+        on_delete=models.CASCADE,
+        verbose_name="Organization",
+        related_name="project_template",
+    )
+    definition = models.TextField(
+        verbose_name="Template definition",
+        help_text="JSON definition of the tasks and discussion channels of new projects.",
+    )
+    last_modified_date = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return "Project template of {0}".format(self.organization)
@@ -1,12 +1,13 @@
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from django.db.models import Count
+from django.db.models import Count, Q
 from django_countries.fields import CountryField
 
 from .common import (
     SocialCause, ReviewStatus, Score,
     SkillLevel, validate_image_size,
-    TaskType,
+    TaskType, RenderedMarkdownModel,
 )
 from .org import Organization
 from .user import Skill
@@ -44,7 +45,17 @@ class ProjectQuerySet(models.QuerySet):
         return self.annotate(follower_count=Count('projectfollower'))
 
 
-class Project(models.Model):
+class Project(RenderedMarkdownModel):
+
+    markdown_fields = (
+        'motivation',
+        'solution_description',
+        'project_impact',
+        'stakeholders',
+        'available_staff',
+        'developer_agreement',
+        'deliverables_description',
+    )
 
     name = models.CharField(
         verbose_name="Name",
@@ -313,6 +324,20 @@ class Project(models.Model):
     def is_social_cause_other(self):
         return self.project_cause == SocialCause.OTHER
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', '-creation_date'], name='project_status_date_idx'),
+            # public projects (see: domain/proj.py:filter_public_projects)
+            models.Index(
+                fields=['-creation_date'],
+                name='project_public_date_idx',
+                # (expressed just as that filter, such that query planners match it)
+                condition=(~Q(status=ProjectStatus.DRAFT) &
+                           ~Q(status=ProjectStatus.EXPIRED) &
+                           ~Q(status=ProjectStatus.DELETED)),
+            ),
+        ]
+
 class ProjectSocialCause(models.Model):
     social_cause = models.CharField(
         verbose_name="Social cause",
@@ -363,7 +388,43 @@ class ProjectSocialCause(models.Model):
     class Meta:
         unique_together = ('social_cause','project')
 
-class ProjectScope(models.Model):
+class ProjectSearchDocument(models.Model):
+    """Denormalized text of a project, maintained for its full-text search.
+
+    See: marketplace.domain.search.
+
+    """
+    project = models.OneToOneField(
+        Project,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_document',
+    )
+    name = models.TextField(blank=True)
+    short_summary = models.TextField(blank=True)
+    organization_name = models.TextField(blank=True)
+    skills = models.TextField(blank=True)
+    social_causes = models.TextField(blank=True)
+
+    # (populated and GIN-indexed under PostgreSQL only)
+    search_vector = SearchVectorField(
+        blank=True,
+        null=True,
+    )
+
+
+class ProjectScope(RenderedMarkdownModel):
+
+    markdown_fields = (
+        'scope_goals',
+        'scope_interventions',
+        'scope_available_data',
+        'scope_analysis',
+        'scope_validation_methodology',
+        'scope_implementation',
+        'version_notes',
+    )
+
     # ==========================
     scope_goals = models.TextField(
         verbose_name="Project goal(s)",
@@ -538,6 +599,11 @@ class ProjectLog(models.Model):
     def __str__(self):
         return self.change_date.strftime('%Y-%m-%d %H:%M') + ": " + self.change_description
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', '-change_date', '-id'], name='projectlog_project_date_idx'),
+        ]
+
 
 class ProjectFollower(models.Model):
     project = models.ForeignKey(
@@ -572,7 +638,10 @@ class TaskStatus():
                     (TaskStatus.DELETED, 'Deleted')
                 )
 
-class ProjectTask(models.Model):
+class ProjectTask(RenderedMarkdownModel):
+
+    markdown_fields = ('description', 'onboarding_instructions')
+
     name = models.CharField(
         verbose_name="Name",
         help_text="Descriptive name that identifies the task within the project.",
@@ -703,6 +772,11 @@ class ProjectTask(models.Model):
     def is_type_qa(self):
         return self.type == TaskType.QA_TASK
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['project', 'stage', 'accepting_volunteers'], name='task_project_stage_idx'),
+        ]
+
 class ProjectDiscussionChannel(models.Model):
     name = models.TextField(
         max_length=100,
@@ -747,6 +821,11 @@ class ProjectComment(models.Model):
     def __str__(self):
         return self.comment_date.strftime('%Y-%m-%d %H:%M') + self.author.username + ": " + self.comment[:100]
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['channel', '-comment_date', '-id'], name='comment_channel_date_idx'),
+        ]
+
 class ProjectTaskReview(models.Model):
     volunteer_comment = models.TextField(
         verbose_name="Volunteer's comments",
@@ -987,6 +1066,11 @@ class VolunteerApplication(models.Model):
     def is_rejected(self):
         return self.status == ReviewStatus.REJECTED
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['task', 'status'], name='application_task_status_idx'),
+        ]
+
 class ProjRole():
     OWNER = 0
     STAFF = 1
@@ -1055,3 +1139,6 @@ class ProjectTaskRole(models.Model):
 
     class Meta:
         unique_together = ('user', 'task', 'role')
+        indexes = [
+            models.Index(fields=['user', 'role', 'task'], name='taskrole_user_role_task_idx'),
+        ]
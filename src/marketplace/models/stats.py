@@ -0,0 +1,43 @@
+from django.db import models
+
+
+class PlatformStatistics(models.Model):
+    """Platform-wide statistics, as presented by the home page.
+
+    A single row, recomputed periodically (see: `manage.py
+    refresh_platform_statistics`) or upon being read once stale.
+
+    """
+    projects_in_design = models.PositiveIntegerField(default=0)
+    projects_this_month = models.PositiveIntegerField(default=0)
+    volunteers_this_month = models.PositiveIntegerField(default=0)
+    featured_project = models.ForeignKey(
+        'marketplace.Project',
+        on_delete=models.SET_NULL,
+        related_name='+',
+        blank=True,
+        null=True,
+    )
+    featured_organization = models.ForeignKey(
+        'marketplace.Organization',
+        on_delete=models.SET_NULL,
+        related_name='+',
+        blank=True,
+        null=True,
+    )
+    featured_volunteer = models.ForeignKey(
+        'marketplace.VolunteerProfile',
+        on_delete=models.SET_NULL,
+        related_name='+',
+        blank=True,
+        null=True,
+    )
+    featured_volunteer_task_count = models.PositiveIntegerField(default=0)
+    featured_volunteer_skills = models.TextField(blank=True)
+    computation_date = models.DateTimeField()
+
+    class Meta:
+        verbose_name_plural = 'platform statistics'
+
+    def __str__(self):
+        return f"Platform statistics as of {self.computation_date}"
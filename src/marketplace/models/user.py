@@ -5,6 +5,7 @@ from django.contrib.auth.models import (
 )
 from django.contrib.postgres.fields import CIEmailField
 from django.db import models
+from django.utils import timezone
 
 from .common import (
     ReviewStatus,
@@ -240,6 +241,50 @@ class UserNotification(models.Model):
     def is_source_badge(self):
         return self.source == NotificationSource.BADGE
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', '-notification_date', '-id'], name='notification_user_date_idx'),
+        ]
+
+class EmailStatus():
+    PENDING = 'PEN'
+    SENT = 'SNT'
+    FAILED = 'FAI'
+
+    def get_choices():
+        return (
+                    (EmailStatus.PENDING, 'Pending'),
+                    (EmailStatus.SENT, 'Sent'),
+                    (EmailStatus.FAILED, 'Failed'),
+                )
+
+class OutboundEmail(models.Model):
+    """An email awaiting (or having undergone) delivery by the outbox worker.
+
+    See: `manage.py send_queued_emails`.
+
+    """
+    from_email = models.CharField(max_length=254)
+    to_email = models.CharField(max_length=254)
+    subject = models.TextField()
+    body = models.TextField()
+    status = models.CharField(
+        max_length=3,
+        choices=EmailStatus.get_choices(),
+        default=EmailStatus.PENDING,
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    creation_date = models.DateTimeField(auto_now_add=True)
+    next_attempt_date = models.DateTimeField(default=timezone.now)
+    sent_date = models.DateTimeField(
+        blank=True,
+        null=True,
+    )
+
+    def __str__(self):
+        return f"{self.subject} <{self.to_email}>"
+
 class Skill(models.Model):
     area = models.CharField(max_length=100)
     name = models.CharField(max_length=100)
@@ -387,6 +432,11 @@ class VolunteerProfile(models.Model):
     def is_rejected(self):
         return self.volunteer_status == ReviewStatus.REJECTED
 
+    class Meta:
+        indexes = [
+            models.Index(fields=['volunteer_status'], name='volunteer_status_idx'),
+        ]
+
 
 class VolunteerSkill(models.Model):
     level = models.IntegerField(
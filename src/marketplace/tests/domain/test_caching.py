@@ -0,0 +1,54 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from marketplace.domain.caching import memoize
+from marketplace.domain.news import NewsService
+from marketplace.models.news import NewsPiece
+
+
+calls = []
+
+
+@memoize(key=lambda request_user, count: count, invalidated_by=(NewsPiece,))
+def count_news(request_user, count):
+    calls.append(count)
+    return NewsPiece.objects.count() + count
+
+
+class MemoizeTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        calls.clear()
+
+    def test_memoize(self):
+        "results are cached per key, across irrelevant arguments"
+        self.assertEqual(count_news('user-a', 1), 1)
+        self.assertEqual(count_news('user-b', 1), 1)
+        self.assertEqual(count_news('user-a', 2), 2)
+        self.assertEqual(calls, [1, 2])
+
+    def test_invalidation(self):
+        "results are invalidated by model signals and explicitly"
+        self.assertEqual(count_news(None, 0), 0)
+
+        news = NewsPiece.objects.create(title="News", contents="Contents")
+        self.assertEqual(count_news(None, 0), 1)
+
+        news.delete()
+        self.assertEqual(count_news(None, 0), 0)
+        self.assertEqual(calls, [0, 0, 0])
+
+        count_news.invalidate()
+        count_news(None, 0)
+        self.assertEqual(len(calls), 4)
+
+    def test_get_latest_news(self):
+        NewsPiece.objects.create(title="First", contents="Contents")
+        self.assertEqual([news.title for news in NewsService.get_latest_news(None)], ["First"])
+
+        with self.assertNumQueries(0):
+            NewsService.get_latest_news(None)
+
+        NewsPiece.objects.create(title="Second", contents="Contents")
+        self.assertEqual(len(NewsService.get_latest_news(None)), 2)
@@ -0,0 +1,154 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from marketplace.domain import jobs, marketplace
+from marketplace.domain.notifications import NotificationService
+from marketplace.models.jobs import Job, JobStatus
+from marketplace.models.user import NotificationSeverity, NotificationSource, UserNotification
+
+from . import common
+
+
+class JobsTestCase(TestCase):
+
+    def setUp(self):
+        self.calls = []
+
+        def record(**arguments):
+            self.calls.append(arguments)
+
+        def fail(**arguments):
+            raise RuntimeError('failed')
+
+        patcher = mock.patch.dict(jobs.JOBS, {'record': record, 'fail': fail})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def make_due(self):
+        Job.objects.update(next_attempt_date=timezone.now())
+
+    def test_run_queued_jobs(self):
+        queued = jobs.enqueue('record', value=1)
+        self.assertEqual(queued.status, JobStatus.PENDING)
+        self.assertEqual(self.calls, [])
+
+        self.assertEqual(jobs.run_queued_jobs(), (1, 0))
+        self.assertEqual(self.calls, [{'value': 1}])
+
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, JobStatus.DONE)
+        self.assertEqual(queued.attempts, 1)
+        self.assertIsNotNone(queued.completion_date)
+
+        self.assertEqual(jobs.run_queued_jobs(), (0, 0))
+
+    def test_unknown_job(self):
+        with self.assertRaises(LookupError):
+            jobs.enqueue('no such job')
+
+    def test_idempotency_key(self):
+        first = jobs.enqueue('record', key='once', value=1)
+        second = jobs.enqueue('record', key='once', value=2)
+        self.assertEqual(first.pk, second.pk)
+
+        jobs.run_queued_jobs()
+        jobs.enqueue('record', key='once', value=3)
+        self.assertEqual(jobs.run_queued_jobs(), (0, 0))
+        self.assertEqual(self.calls, [{'value': 1}])
+
+    @override_settings(JOBS_MAX_ATTEMPTS=2, JOBS_RETRY_DELAY=30)
+    def test_retries(self):
+        queued = jobs.enqueue('fail')
+
+        with self.assertLogs('marketplace.domain.jobs', 'ERROR'):
+            self.assertEqual(jobs.run_queued_jobs(), (0, 1))
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, JobStatus.PENDING)
+        self.assertEqual(queued.attempts, 1)
+        self.assertIn('failed', queued.last_error)
+        self.assertGreater(queued.next_attempt_date, timezone.now() + timedelta(seconds=20))
+
+        # backing off
+        self.assertEqual(jobs.run_queued_jobs(), (0, 0))
+
+        self.make_due()
+        with self.assertLogs('marketplace.domain.jobs', 'ERROR'):
+            self.assertEqual(jobs.run_queued_jobs(), (0, 1))
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, JobStatus.FAILED)
+        self.assertEqual(queued.attempts, 2)
+
+        self.make_due()
+        self.assertEqual(jobs.run_queued_jobs(), (0, 0))
+
+    def test_expired_claim(self):
+        queued = jobs.enqueue('record', value=1)
+        self.assertEqual(len(jobs.claim_jobs(10)), 1)
+
+        # claimed jobs aren't reclaimed until their claim expires
+        self.assertEqual(jobs.run_queued_jobs(), (0, 0))
+
+        self.make_due()
+        self.assertEqual(jobs.run_queued_jobs(), (1, 0))
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, JobStatus.DONE)
+        self.assertEqual(queued.attempts, 2)
+
+    @override_settings(JOBS_MAX_ATTEMPTS=2)
+    def test_expired_last_claim(self):
+        queued = jobs.enqueue('record', value=1)
+
+        # the worker dies on every attempt
+        for _attempt in range(2):
+            self.assertEqual(len(jobs.claim_jobs(10)), 1)
+            self.make_due()
+
+        with self.assertLogs('marketplace.domain.jobs', 'ERROR'):
+            self.assertEqual(jobs.run_queued_jobs(), (0, 0))
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, JobStatus.FAILED)
+        self.assertEqual(queued.attempts, 2)
+        self.assertIn('claim expired', queued.last_error)
+        self.assertEqual(self.calls, [])
+
+    def test_enqueue_multiuser_notification(self):
+        volunteer = common.example_volunteer_user()
+        marketplace.user.add_user(volunteer, 'volunteer')
+        UserNotification.objects.all().delete()
+
+        NotificationService.enqueue_multiuser_notification(
+            [volunteer, volunteer],
+            "Hello",
+            NotificationSeverity.INFO,
+            NotificationSource.PROJECT,
+            1,
+        )
+        self.assertFalse(UserNotification.objects.exists())
+
+        self.assertEqual(jobs.run_queued_jobs(), (1, 0))
+        self.assertEqual(
+            list(UserNotification.objects.values_list('user', 'notification_description')),
+            [(volunteer.pk, "Hello")],
+        )
+
+        # notifying nobody enqueues nothing
+        self.assertIsNone(NotificationService.enqueue_multiuser_notification(
+            [], "Hello", NotificationSeverity.INFO, NotificationSource.PROJECT, 1,
+        ))
+
+    def test_run_jobs_command(self):
+        jobs.enqueue('record', value=1)
+        jobs.enqueue('fail')
+
+        stdout = StringIO()
+        stderr = StringIO()
+        with self.assertLogs('marketplace.domain.jobs', 'ERROR'):
+            call_command('run_jobs', '--batch-size=1', '--concurrency=2', stdout=stdout, stderr=stderr)
+        self.assertIn('ran 1 job(s), 1 failed', stdout.getvalue())
+        self.assertIn('does not support concurrent workers', stderr.getvalue())
+        self.assertEqual(self.calls, [{'value': 1}])
@@ -0,0 +1,124 @@
+import csv
+import io
+import os
+import tempfile
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from marketplace.domain import marketplace
+from marketplace.domain.org import OrganizationService
+from marketplace.domain.proj import ProjectService
+from marketplace.models.proj import Project, ProjectRole, ProjRole, ProjectStatus
+from marketplace.models.user import UserNotification
+
+from marketplace.tests.domain.common import (
+    example_organization, example_organization_user, example_project, example_staff_user,
+)
+
+
+SAMPLE_PROJECTS = os.path.join(settings.BASE_DIR, 'marketplace', 'data', 'sample_projects.csv')
+
+
+def project_structure(project):
+    return (
+        [(task.name, task.stage, task.type) for task in project.projecttask_set.order_by('id')],
+        [(channel.name, channel.related_task and channel.related_task.name)
+         for channel in project.projectdiscussionchannel_set.order_by('id')],
+        [(scope.version_notes, scope.author) for scope in project.projectscope_set.all()],
+        [(role.user, role.role) for role in project.projectrole_set.all()],
+    )
+
+
+class BulkLoadProjectsTestCase(TestCase):
+
+    def setUp(self):
+        # domain results are memoized; don't inherit those of other tests
+        cache.clear()
+
+        self.owner_user = example_organization_user()
+        marketplace.user.add_user(self.owner_user, 'organization')
+        self.staff_user = example_staff_user()
+        marketplace.user.add_user(self.staff_user, 'organization')
+
+        self.organization = example_organization()
+        OrganizationService.create_organization(self.owner_user, self.organization)
+        OrganizationService.add_staff_member_by_id(self.owner_user, self.organization.id, self.staff_user.id, None)
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def write_projects(self, **values):
+        path = os.path.join(self.directory.name, 'projects.csv')
+        with open(SAMPLE_PROJECTS) as sample_file, open(path, 'w') as csv_file:
+            reader = csv.DictReader(sample_file)
+            writer = csv.DictWriter(csv_file, reader.fieldnames)
+            writer.writeheader()
+            for row in reader:
+                row.update(user_pk=self.owner_user.pk, org_pk=self.organization.pk)
+                row.update(values)
+                writer.writerow(row)
+        return path
+
+    def load_projects(self, path, **options):
+        call_command('load_projects', file_path=path, bulk=True, stdout=io.StringIO(),
+                     stderr=io.StringIO(), **options)
+
+    def test_bulk_load(self):
+        self.assertIsNone(ProjectService.get_featured_project())
+        notifications = UserNotification.objects.count()
+
+        self.load_projects(self.write_projects(), batch_size=2)
+
+        projects = list(Project.objects.order_by('id'))
+        self.assertEqual([project.name for project in projects], ['Demo project 1', 'Demo project 2', 'Demo project 3'])
+        self.assertTrue(all(project.status == ProjectStatus.NEW for project in projects))
+        self.assertEqual(set(marketplace.project.list_public_projects()), set(projects))
+        self.assertIn(ProjectService.get_featured_project(), projects)
+        self.assertEqual(list(marketplace.project.list_public_projects(projname='Demo project 2')), [projects[1]])
+        self.assertIn('<p>This is the motivation of the project.</p>', projects[0].rendered_markdown)
+        self.assertTrue(marketplace.project.user.is_owner(self.owner_user, projects[2]))
+
+        # projects are structured as those created one at a time
+        single_project = example_project()
+        OrganizationService.create_project(self.owner_user, self.organization.id, single_project)
+        for project in projects:
+            self.assertEqual(project_structure(project), project_structure(single_project))
+
+        # notifications are summarized
+        summaries = UserNotification.objects.filter(id__gt=notifications).exclude(target_id=single_project.id)
+        self.assertEqual(
+            sorted((notification.user.pk, notification.notification_description) for notification in summaries),
+            sorted([
+                (self.owner_user.pk, "3 projects were created within the organization {0}.".format(self.organization.name)),
+                (self.staff_user.pk, "3 projects were created within the organization {0}.".format(self.organization.name)),
+                (self.owner_user.pk, "3 projects were created within the organization {0} and you have been made "
+                                  "their project administrator.".format(self.organization.name)),
+            ]),
+        )
+
+    def test_bulk_load_without_notifications(self):
+        notifications = UserNotification.objects.count()
+        self.load_projects(self.write_projects(), notify=False)
+
+        self.assertEqual(Project.objects.count(), 3)
+        self.assertEqual(ProjectRole.objects.filter(role=ProjRole.OWNER).count(), 3)
+        self.assertEqual(UserNotification.objects.count(), notifications)
+
+    def test_invalid_file(self):
+        for (values, error) in (
+            ({'status': 'XX'}, "line 2: status: Value 'XX' is not a valid choice."),
+            ({'intended_start_date': 'soon'}, "line 3: intended_start_date:"),
+            ({'user_pk': 0}, "line 4: user '0' does not exist"),
+            ({'user_pk': self.staff_user.pk}, "line 2: user {0} cannot create projects".format(self.staff_user.pk)),
+        ):
+            stderr = io.StringIO()
+            with self.subTest(values=values), self.assertRaises(CommandError):
+                call_command('load_projects', file_path=self.write_projects(**values), bulk=True,
+                             stdout=io.StringIO(), stderr=stderr)
+            self.assertIn(error, stderr.getvalue())
+
+        self.assertFalse(Project.objects.exists())
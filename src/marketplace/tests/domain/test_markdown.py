@@ -0,0 +1,71 @@
+import io
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from marketplace.domain import marketplace
+from marketplace.domain.org import OrganizationService
+from marketplace.domain.proj import ProjectService
+from marketplace.models.proj import Project, ProjectScope
+
+from .common import example_organization, example_organization_user, example_project
+
+
+class RenderedMarkdownTestCase(TestCase):
+
+    def setUp(self):
+        self.owner_user = example_organization_user()
+        marketplace.user.add_user(self.owner_user, 'organization')
+
+        organization = example_organization()
+        OrganizationService.create_organization(self.owner_user, organization)
+
+        self.project = example_project()
+        self.project.motivation = 'A *motivating* problem'
+        self.project.scope_goals = 'Our **goals**'
+        self.project.stakeholders = ''
+        OrganizationService.create_project(self.owner_user, organization.id, self.project)
+        ProjectService.publish_project(self.owner_user, self.project.id, self.project)
+
+    def test_rendered_upon_save(self):
+        project = Project.objects.get(id=self.project.id)
+        with mock.patch('marketplace.models.common.render_markdown') as render_markdown:
+            self.assertEqual(project.rendered['motivation'], '<p>A <em>motivating</em> problem</p>\n')
+            self.assertEqual(project.rendered['stakeholders'], '')
+        render_markdown.assert_not_called()
+
+        project.motivation = 'A *changed* problem'
+        project.save(update_fields=['motivation'])
+
+        project = Project.objects.get(id=self.project.id)
+        with mock.patch('marketplace.models.common.render_markdown') as render_markdown:
+            self.assertEqual(project.rendered['motivation'], '<p>A <em>changed</em> problem</p>\n')
+        render_markdown.assert_not_called()
+
+    def test_stale_source_rendered_upon_access(self):
+        # (updates bypass save)
+        Project.objects.filter(id=self.project.id).update(motivation='An *updated* problem')
+
+        project = Project.objects.get(id=self.project.id)
+        self.assertEqual(project.rendered['motivation'], '<p>An <em>updated</em> problem</p>\n')
+
+    def test_backfill(self):
+        Project.objects.update(rendered_markdown='')
+        ProjectScope.objects.update(rendered_markdown='')
+
+        call_command('render_markdown', stdout=io.StringIO())
+
+        self.client.force_login(self.owner_user)
+        with mock.patch('marketplace.models.common.render_markdown') as render_markdown:
+            response = self.client.get(reverse('marketplace:proj_info', args=[self.project.id]))
+            self.assertContains(response, '<p>A <em>motivating</em> problem</p>')
+
+            response = self.client.get(reverse('marketplace:proj_scope', args=[self.project.id]))
+            self.assertContains(response, '<p>Our <strong>goals</strong></p>')
+        render_markdown.assert_not_called()
+
+        output = io.StringIO()
+        call_command('render_markdown', stdout=output)
+        self.assertIn('Rendered 0 of 1 projects', output.getvalue())
@@ -1,10 +1,17 @@
+from unittest import mock
+from smtplib import SMTPException
+
 from django.core import mail
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
 from marketplace.domain import marketplace
+from marketplace.domain.notifications import NotificationService, deliver_queued_emails
 from marketplace.models.user import (
     NotificationSeverity,
     NotificationSource,
+    EmailStatus,
+    OutboundEmail,
     UserNotification,
 )
 
@@ -40,7 +47,14 @@ class NotificationsTestCase(TestCase):
         )
 
         self.assertEqual(UserNotification.objects.count(), 1)
+
+        # email is queued to the outbox rather than sent
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboundEmail.objects.filter(status=EmailStatus.PENDING).count(), 1)
+
+        self.assertEqual(deliver_queued_emails(), (1, 0))
         self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(OutboundEmail.objects.filter(status=EmailStatus.SENT).count(), 1)
 
         # the method under test is perhaps too low-level for it to make sense for it to run model
         # validations. rather, this is done here to ensure that the notification (was) proper,
@@ -50,3 +64,123 @@ class NotificationsTestCase(TestCase):
 
         (email,) = mail.outbox
         self.assertEqual(email.to, [volunteer.email])
+
+    def test_add_multiuser_notification(self):
+        "notifications are fanned out in bulk and emails queued"
+        users = [
+            common.example_volunteer_user(),
+            common.example_staff_user(),
+            common.example_organization_user(email=''),
+        ]
+        for user in users:
+            user.save()
+
+        # duplicate recipients are notified once
+        with self.assertNumQueries(2):
+            NotificationService.add_multiuser_notification(
+                users + users[:1],
+                "Project finished",
+                NotificationSeverity.INFO,
+                NotificationSource.PROJECT,
+                1,
+            )
+
+        self.assertEqual(UserNotification.objects.count(), 3)
+        self.assertEqual(
+            set(UserNotification.objects.values_list('user', flat=True)),
+            {user.id for user in users},
+        )
+
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(OutboundEmail.objects.count(), 2)
+
+        deliver_queued_emails()
+        self.assertEqual(
+            [email.to for email in mail.outbox],
+            [[users[0].email], [users[1].email]],
+        )
+
+    @override_settings(EMAIL_OUTBOX_MAX_ATTEMPTS=2)
+    def test_deliver_queued_emails_retry(self):
+        "failed deliveries are retried with backoff, then given up on"
+        NotificationService.send_email('from@example.com', 'to@example.com', "Subject", "Body")
+
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=SMTPException), \
+                self.assertLogs('marketplace.domain.notifications', 'ERROR'):
+            self.assertEqual(deliver_queued_emails(), (0, 1))
+
+        email = OutboundEmail.objects.get()
+        self.assertEqual(email.status, EmailStatus.PENDING)
+        self.assertEqual(email.attempts, 1)
+        self.assertGreater(email.next_attempt_date, email.creation_date)
+
+        # not yet due for retry
+        self.assertEqual(deliver_queued_emails(), (0, 0))
+
+        OutboundEmail.objects.update(next_attempt_date=email.creation_date)
+        with mock.patch('django.core.mail.EmailMessage.send', side_effect=SMTPException), \
+                self.assertLogs('marketplace.domain.notifications', 'ERROR'):
+            self.assertEqual(deliver_queued_emails(), (0, 1))
+
+        email.refresh_from_db()
+        self.assertEqual(email.status, EmailStatus.FAILED)
+        self.assertEqual(email.attempts, 2)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_deliver_queued_emails_invalid_message(self):
+        "an invalid message fails alone, without rolling back the batch"
+        NotificationService.send_email('from@example.com', 'to@example.com', "Subject", "Body")
+        NotificationService.send_email('from@example.com', 'to@example.com', "Sub\nject", "Body")
+
+        with self.assertLogs('marketplace.domain.notifications', 'ERROR'):
+            self.assertEqual(deliver_queued_emails(), (1, 1))
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(
+            list(OutboundEmail.objects.order_by('id').values_list('status', 'attempts')),
+            [(EmailStatus.SENT, 1), (EmailStatus.PENDING, 1)],
+        )
+        self.assertIn('BadHeaderError', OutboundEmail.objects.get(status=EmailStatus.PENDING).last_error)
+
+    def test_read_state(self):
+        "notifications are marked read in bulk, and unread counts cached"
+        cache.clear()
+
+        volunteer = common.example_volunteer_user()
+        marketplace.user.add_user(volunteer, 'volunteer')
+        UserNotification.objects.filter(user=volunteer).delete()
+
+        NotificationService.add_multiuser_notification(
+            [volunteer] * 5,
+            "Project finished",
+            NotificationSeverity.INFO,
+            NotificationSource.PROJECT,
+            1,
+        )
+        for index in range(4):
+            NotificationService.add_multiuser_notification(
+                [volunteer], f"Notification {index}", NotificationSeverity.INFO, NotificationSource.PROJECT, 1,
+            )
+
+        with self.assertNumQueries(1):
+            self.assertEqual(marketplace.notification.get_unread_count(volunteer), 5)
+        with self.assertNumQueries(0):
+            self.assertEqual(marketplace.notification.get_unread_count(volunteer), 5)
+
+        notifications = list(UserNotification.objects.filter(user=volunteer).order_by('id'))
+        with self.assertNumQueries(1):
+            self.assertEqual(NotificationService.mark_notifications_as_read(notifications[:2]), 2)
+        with self.assertNumQueries(0):
+            self.assertEqual(NotificationService.mark_notifications_as_read(notifications[:2]), 0)
+
+        self.assertEqual(marketplace.notification.get_unread_count(volunteer), 3)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(marketplace.notification.mark_all_read(volunteer), 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(marketplace.notification.get_unread_count(volunteer), 0)
+
+        marketplace.notification.add_user_notification(
+            volunteer, "Welcome", NotificationSeverity.INFO, NotificationSource.GENERIC, None,
+        )
+        self.assertEqual(marketplace.notification.get_unread_count(volunteer), 1)
@@ -1,3 +1,4 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.core.exceptions import PermissionDenied
 from django.contrib.auth.models import AnonymousUser
@@ -24,6 +25,9 @@ class OrganizationTestCase(TestCase):
     organization = None
 
     def setUp(self):
+        # domain results are memoized; don't inherit those of other tests
+        cache.clear()
+
         self.organization_user = example_organization_user()
         marketplace.user.add_user(self.organization_user, 'organization', None)
         self.staff_user = example_staff_user()
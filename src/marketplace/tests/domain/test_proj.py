@@ -1,8 +1,9 @@
+from django.core.cache import cache
 from django.test import TestCase
 from django.core.exceptions import PermissionDenied
 from django.contrib.auth.models import AnonymousUser
 
-from marketplace.domain import marketplace
+from marketplace.domain import jobs, marketplace
 from marketplace.domain.org import OrganizationService
 from marketplace.domain.proj import ProjectService, ProjectTaskService
 
@@ -34,6 +35,9 @@ class ProjectTestCase(TestCase):
     project = None
 
     def setUp(self):
+        # domain results are memoized; don't inherit those of other tests
+        cache.clear()
+
         code = SignupCode()
         code.name = "AUTOMATICVOLUNTEER"
         code.type = SignupCodeType.VOLUNTEER_AUTOMATIC_ACCEPT
@@ -579,6 +583,9 @@ class ProjectTestCase(TestCase):
             ProjectTaskService.accept_task_review(self.owner_user, self.project.id, task.id, task_review)
             self.assertEqual(ProjectTaskService.get_project_task_review(self.owner_user, self.project.id, task.id, task_review.id).review_result, ReviewStatus.ACCEPTED)
             self.assertEqual(ProjectTaskService.get_project_task(self.owner_user, self.project.id, task.id).stage, TaskStatus.COMPLETED)
+            # badges are awarded by background job
+            self.assertEqual(len(self.volunteer_applicant_user.userbadge_set.all()), 1)
+            jobs.run_queued_jobs()
             self.assertEqual(len(self.volunteer_applicant_user.userbadge_set.all()), 3)
 
         with self.subTest(stage='Pin task review'):
@@ -0,0 +1,85 @@
+import json
+import re
+
+from django.db import connection, transaction
+from django.test import TestCase
+
+from marketplace.domain import marketplace
+from marketplace.domain.org import OrganizationService
+from marketplace.domain.proj import ProjectService, filter_public_projects
+from marketplace.models.common import ReviewStatus
+from marketplace.models.proj import (
+    Project, ProjectComment, ProjectLog, ProjectStatus, ProjectTask, ProjectTaskRole,
+    TaskRole, TaskStatus, VolunteerApplication,
+)
+from marketplace.models.user import UserNotification, VolunteerProfile
+
+from .common import example_organization, example_organization_user, example_project
+
+
+def sequential_scans(query_set):
+    """Tables which the database would scan sequentially to evaluate the
+    given queryset.
+
+    On PostgreSQL sequential scans are disabled (made prohibitively
+    costly) for the purpose, such that any which remain could not have
+    been avoided by an index.
+
+    """
+    if connection.vendor == 'postgresql':
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = query_set.explain(format='json')
+
+        def walk(node):
+            if node['Node Type'] == 'Seq Scan':
+                yield node['Relation Name']
+            for child in node.get('Plans', ()):
+                yield from walk(child)
+
+        return set(walk(json.loads(plan)[0]['Plan']))
+
+    if connection.vendor == 'sqlite':
+        return set(re.findall(r'\bSCAN (?:TABLE )?(\w+)$', query_set.explain(), re.MULTILINE))
+
+    raise NotImplementedError(connection.vendor)
+
+
+class QueryPlanTestCase(TestCase):
+
+    def setUp(self):
+        if connection.vendor not in ('postgresql', 'sqlite'):
+            self.skipTest(f'query plans are not inspected on {connection.vendor}')
+
+        self.owner_user = example_organization_user()
+        marketplace.user.add_user(self.owner_user, 'organization')
+
+        self.organization = example_organization()
+        OrganizationService.create_organization(self.owner_user, self.organization)
+
+        self.project = example_project()
+        OrganizationService.create_project(self.owner_user, self.organization.id, self.project)
+        ProjectService.publish_project(self.owner_user, self.project.id, self.project)
+
+        self.task = self.project.projecttask_set.first()
+        self.channel = ProjectService.get_project_channels(self.owner_user, self.project).first()
+
+    def assertNoSequentialScan(self, query_set):
+        table = query_set.model._meta.db_table
+        self.assertNotIn(table, sequential_scans(query_set), query_set.query)
+
+    def test_hot_queries(self):
+        for query_set in (
+            UserNotification.objects.filter(user=self.owner_user).order_by('-notification_date', '-id'),
+            filter_public_projects(Project.objects.all()).order_by('-creation_date'),
+            Project.objects.filter(status=ProjectStatus.NEW).order_by('-creation_date'),
+            ProjectTaskRole.objects.filter(user=self.owner_user, role=TaskRole.VOLUNTEER),
+            ProjectTask.objects.filter(project=self.project, stage=TaskStatus.STARTED, accepting_volunteers=True),
+            ProjectComment.objects.filter(channel=self.channel).order_by('-comment_date', '-id'),
+            ProjectLog.objects.filter(project=self.project).order_by('-change_date', '-id'),
+            VolunteerApplication.objects.filter(task=self.task, status=ReviewStatus.NEW),
+            VolunteerProfile.objects.filter(volunteer_status=ReviewStatus.NEW),
+        ):
+            with self.subTest(query=str(query_set.query)):
+                self.assertNoSequentialScan(query_set)
@@ -0,0 +1,120 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from marketplace.domain import marketplace
+from marketplace.domain.org import OrganizationService
+from marketplace.models.common import ReviewStatus, Score
+from marketplace.models.proj import ProjectTask, ProjectTaskReview, ProjectTaskRole, TaskRole, TaskStatus
+from marketplace.models.user import BadgeTier, BadgeType, NotificationSource, UserBadge, UserNotification
+
+from . import common
+
+
+class ReputationTestCase(TestCase):
+
+    def setUp(self):
+        self.owner_user = common.example_organization_user()
+        marketplace.user.add_user(self.owner_user, 'organization')
+        self.volunteer_user = common.example_volunteer_user()
+        marketplace.user.add_user(self.volunteer_user, 'volunteer')
+        self.idle_user = common.example_volunteer_user(username='idle', email='idle@example.com')
+        marketplace.user.add_user(self.idle_user, 'volunteer')
+
+        organization = common.example_organization()
+        OrganizationService.create_organization(self.owner_user, organization)
+        self.project = common.example_project()
+        OrganizationService.create_project(self.owner_user, organization.id, self.project)
+
+        start = date(2020, 1, 1)
+        # (estimated days, actual days -- or None, where the actual dates are
+        # missing -- and accepted review's score)
+        for (estimated_days, actual_days, review_score) in (
+            (10, 5, Score.FIVE_STARS),
+            (10, 9, Score.FOUR_STARS),
+            (10, 10, Score.THREE_STARS),
+            (10, 20, None),
+            (10, None, None),
+        ):
+            task = ProjectTask.objects.create(
+                project=self.project,
+                name='Completed task',
+                stage=TaskStatus.COMPLETED,
+                percentage_complete=1.0,
+                accepting_volunteers=False,
+                estimated_start_date=start,
+                estimated_end_date=start + timedelta(days=estimated_days),
+                actual_start_date=start if actual_days else None,
+                actual_end_date=start + timedelta(days=actual_days) if actual_days else None,
+            )
+            ProjectTaskRole.objects.create(task=task, user=self.volunteer_user, role=TaskRole.VOLUNTEER)
+            ProjectTaskReview.objects.create(
+                task=task,
+                volunteer=self.volunteer_user,
+                volunteer_comment='Done.',
+                volunteer_effort_hours=1,
+                review_score=review_score or Score.ONE_STAR,
+                review_result=ReviewStatus.ACCEPTED if review_score else ReviewStatus.REJECTED,
+            )
+
+        # unfinished tasks count for nothing
+        task = ProjectTask.objects.create(project=self.project, name='Started task',
+                                         stage=TaskStatus.STARTED, percentage_complete=0.5,
+                                         accepting_volunteers=False,
+                                         estimated_start_date=start, estimated_end_date=start)
+        ProjectTaskRole.objects.create(task=task, user=self.volunteer_user, role=TaskRole.VOLUNTEER)
+
+    def reputation_badges(self, user):
+        return UserBadge.objects.filter(user=user).exclude(type=BadgeType.EARLY_USER)
+
+    def test_compute_reputations(self):
+        with self.assertNumQueries(1):
+            (idle, volunteer) = sorted(
+                marketplace.reputation.compute_reputations([self.volunteer_user, self.idle_user]),
+                key=lambda reputation: reputation.user_id != self.idle_user.id,
+            )
+
+        self.assertEqual(volunteer.completed_task_count, 5)
+        self.assertEqual(volunteer.ahead_of_time_task_count, 2)
+        self.assertEqual(volunteer.ahead_of_time_task_ratio, 0.4)
+        self.assertEqual(volunteer.average_review_score, 4)
+
+        self.assertEqual(idle.completed_task_count, 0)
+        self.assertIsNone(idle.ahead_of_time_task_ratio)
+        self.assertIsNone(idle.average_review_score)
+
+    def test_update_reputations(self):
+        UserNotification.objects.all().delete()
+        UserBadge.objects.create(user=self.volunteer_user, type=BadgeType.WORK_SPEED, tier=BadgeTier.MASTER)
+
+        self.assertEqual(marketplace.reputation.update_reputations([self.volunteer_user, self.idle_user]), (2, 0, 1))
+
+        profile = self.volunteer_user.volunteerprofile
+        profile.refresh_from_db()
+        self.assertEqual(profile.completed_task_count, 5)
+        self.assertEqual(profile.average_review_score, 4)
+        self.assertEqual(profile.ahead_of_time_task_ratio, 0.4)
+
+        self.assertEqual(
+            dict(self.reputation_badges(self.volunteer_user).values_list('type', 'tier')),
+            {BadgeType.NUMBER_OF_PROJECTS: BadgeTier.BASIC, BadgeType.REVIEW_SCORE: BadgeTier.MASTER},
+        )
+        self.assertFalse(self.reputation_badges(self.idle_user).exists())
+
+        notifications = UserNotification.objects.filter(user=self.volunteer_user)
+        self.assertEqual(notifications.count(), 3)
+        self.assertFalse(notifications.filter(source=NotificationSource.BADGE, target_id=None).exists())
+
+        # unchanged reputations change nothing
+        self.assertEqual(marketplace.reputation.update_reputations([self.volunteer_user]), (0, 0, 0))
+
+    def test_recompute_reputation_command(self):
+        UserNotification.objects.all().delete()
+
+        stdout = StringIO()
+        call_command('recompute_reputation', '--all', '--batch-size=1', stdout=stdout)
+        self.assertIn('2 badges awarded', stdout.getvalue())
+        self.assertEqual(self.reputation_badges(self.volunteer_user).count(), 2)
+        self.assertFalse(UserNotification.objects.exists())
@@ -0,0 +1,137 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from marketplace.domain import marketplace
+from marketplace.domain.org import OrganizationService
+from marketplace.domain.proj import ProjectService
+from marketplace.models.common import SocialCause
+from marketplace.models.proj import ProjectSearchDocument, ProjectSocialCause, ProjectTaskRequirement
+from marketplace.models.user import Skill
+
+from .common import example_organization, example_organization_user, example_project
+
+
+class ProjectSearchTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.owner_user = example_organization_user()
+        marketplace.user.add_user(self.owner_user, 'organization')
+
+        self.organization = example_organization()
+        OrganizationService.create_organization(self.owner_user, self.organization)
+
+        self.project = example_project()
+        self.project.name = 'Flood forecasting'
+        OrganizationService.create_project(self.owner_user, self.organization.id, self.project)
+        ProjectService.publish_project(self.owner_user, self.project.id, self.project)
+
+        self.other_project = example_project()
+        self.other_project.name = 'School attendance'
+        self.other_project.short_summary = 'Predicting floods of absences'
+        OrganizationService.create_project(self.owner_user, self.organization.id, self.other_project)
+        ProjectService.publish_project(self.owner_user, self.other_project.id, self.other_project)
+
+        skill = Skill.objects.create(area='Data science', name='Geospatial analysis')
+        ProjectTaskRequirement.objects.create(task=self.project.projecttask_set.first(), skill=skill)
+        ProjectSocialCause.objects.create(project=self.project, social_cause=SocialCause.ENVIRONMENT)
+
+    def test_search_document_sync(self):
+        document = ProjectSearchDocument.objects.get(project=self.project)
+        self.assertEqual(document.name, 'Flood forecasting')
+        self.assertEqual(document.organization_name, self.organization.name)
+        self.assertEqual(document.skills, 'Geospatial analysis')
+        self.assertEqual(document.social_causes, 'Environment')
+
+        self.organization.name = 'Renamed organization'
+        self.organization.save()
+        document.refresh_from_db()
+        self.assertEqual(document.organization_name, 'Renamed organization')
+
+        ProjectTaskRequirement.objects.all().delete()
+        document.refresh_from_db()
+        self.assertEqual(document.skills, '')
+
+    def test_text_search(self):
+        # matches any field (by word prefix), better matches first
+        self.assertEqual(
+            list(marketplace.project.list_public_projects(text='flood')),
+            [self.project, self.other_project],
+        )
+        self.assertEqual(
+            list(marketplace.project.list_public_projects(text='geospatial FORECAST')),
+            [self.project],
+        )
+        self.assertEqual(
+            list(marketplace.project.list_public_projects(text='renamed')),
+            [],
+        )
+
+        self.project.name = 'Renamed project'
+        self.project.save()
+        self.assertEqual(
+            list(marketplace.project.list_public_projects(text='renamed')),
+            [self.project],
+        )
+
+        self.project.delete()
+        self.assertEqual(
+            list(marketplace.project.list_public_projects(text='flood')),
+            [self.other_project],
+        )
+
+    def test_filters(self):
+        self.assertEqual(
+            list(marketplace.project.list_public_projects(skills='spatial')),
+            [self.project],
+        )
+        self.assertEqual(
+            list(marketplace.project.list_public_projects(social_cause='environment')),
+            [self.project],
+        )
+        self.assertEqual(
+            list(marketplace.project.list_public_projects(projname='school', orgname='organization')),
+            [self.other_project],
+        )
+
+    def test_facet_counts(self):
+        this_year = timezone.now().year
+
+        counts = marketplace.project.count_public_project_facets()
+        self.assertEqual(counts['social_cause']['environment'], 1)
+        self.assertEqual(counts['social_cause']['health'], 0)
+        self.assertEqual(counts['project_status']['new'], 2)
+        self.assertEqual(counts['posted_since'], {this_year: 2})
+
+        # draft projects are excluded (from the years on offer as well)
+        draft_project = example_project()
+        OrganizationService.create_project(self.owner_user, self.organization.id, draft_project)
+        draft_project.creation_date = timezone.now().replace(year=2010)
+        draft_project.save()
+        counts = marketplace.project.count_public_project_facets()
+        self.assertEqual(counts['posted_since'], {this_year: 2})
+
+        # counts reflect the other facets' selections and the search
+        counts = marketplace.project.count_public_project_facets(social_cause='environment', text='flood')
+        self.assertEqual(counts['social_cause']['environment'], 1)
+        self.assertEqual(counts['social_cause']['health'], 0)
+        self.assertEqual(counts['project_status']['new'], 1)
+
+        counts = marketplace.project.count_public_project_facets(project_status='completed')
+        self.assertEqual(counts['social_cause']['environment'], 0)
+        self.assertEqual(counts['project_status']['new'], 2)
+
+        # the cached index is invalidated by changes to projects
+        ProjectSocialCause.objects.create(project=self.other_project, social_cause=SocialCause.HEALTH)
+        counts = marketplace.project.count_public_project_facets()
+        self.assertEqual(counts['social_cause']['health'], 1)
+
+    def test_project_list_view(self):
+        response = self.client.get(reverse('marketplace:proj_list'), {'socialcause': 'environment'})
+        self.assertContains(response, self.project.name)
+        self.assertNotContains(response, self.other_project.name)
+        self.assertEqual(response.context['facet_counts']['social_cause']['environment'], 1)
+        self.assertEqual(response.context['facet_counts']['project_status']['new'], 1)
@@ -0,0 +1,58 @@
+import datetime
+import io
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+
+from marketplace.domain.templates import DEFAULT_PROJECT_TEMPLATE
+from marketplace.models.proj import Project, ProjectTask, ProjectTaskRole
+from marketplace.models.user import UserNotification, VolunteerProfile
+
+
+class SeedScaleTestCase(TestCase):
+
+    def seed(self, prefix, seed=0):
+        call_command(
+            'seed_scale',
+            projects=20,
+            volunteers=30,
+            comments=50,
+            notifications=60,
+            seed=seed,
+            as_of=datetime.date(2019, 6, 1),
+            prefix=prefix,
+            stdout=io.StringIO(),
+        )
+        projects = Project.objects.filter(name__startswith=f'{prefix} project ').order_by('id')
+        return [
+            (project.name[len(prefix):], project.status, project.creation_date, project.projecttask_set.count())
+            for project in projects
+        ]
+
+    def test_seed_scale(self):
+        graph = self.seed('one')
+
+        self.assertEqual(len(graph), 20)
+        self.assertEqual(ProjectTask.objects.count(), 4 * 20)
+        self.assertEqual(VolunteerProfile.objects.count(), 30)
+        self.assertEqual(UserNotification.objects.count(), 60)
+        self.assertTrue(ProjectTaskRole.objects.exists())
+
+        # projects are shaped as those of the default template
+        project = Project.objects.filter(name__startswith='one project ').first()
+        self.assertEqual(
+            [task.name for task in project.projecttask_set.order_by('id')],
+            [task['name'] for task in DEFAULT_PROJECT_TEMPLATE['tasks']],
+        )
+        self.assertEqual(
+            [channel.name for channel in project.projectdiscussionchannel_set.order_by('id')],
+            [channel['name'] for channel in DEFAULT_PROJECT_TEMPLATE['channels']],
+        )
+
+        # the graph is determined by its seed
+        self.assertEqual(self.seed('two'), graph)
+        self.assertNotEqual(self.seed('three', seed=1), graph)
+
+        with self.assertRaises(CommandError):
+            self.seed('one')
@@ -0,0 +1,56 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from marketplace.domain import marketplace
+from marketplace.domain.org import OrganizationService
+from marketplace.domain.proj import ProjectService
+from marketplace.models.stats import PlatformStatistics
+
+from .common import example_organization, example_organization_user, example_project
+
+
+class PlatformStatisticsTestCase(TestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.owner_user = example_organization_user()
+        marketplace.user.add_user(self.owner_user, 'organization')
+
+        self.organization = example_organization()
+        OrganizationService.create_organization(self.owner_user, self.organization)
+
+        self.project = example_project()
+        OrganizationService.create_project(self.owner_user, self.organization.id, self.project)
+        ProjectService.publish_project(self.owner_user, self.project.id, self.project)
+
+    def test_platform_statistics(self):
+        statistics = marketplace.stats.get_platform_statistics()
+        self.assertEqual(statistics.featured_project, self.project)
+        self.assertEqual(statistics.featured_organization, self.organization)
+        self.assertEqual(statistics.projects_this_month, 1)
+        self.assertEqual(PlatformStatistics.objects.count(), 1)
+
+        # fresh statistics are served from a single read (and prefetch)
+        with self.assertNumQueries(1):
+            statistics = marketplace.stats.get_platform_statistics()
+            self.assertEqual(statistics.featured_project.name, self.project.name)
+
+        # stale statistics are recomputed
+        PlatformStatistics.objects.update(
+            projects_this_month=0,
+            computation_date=statistics.computation_date - timedelta(days=1),
+        )
+        statistics = marketplace.stats.get_platform_statistics(max_age=3600)
+        self.assertEqual(statistics.projects_this_month, 1)
+        self.assertEqual(PlatformStatistics.objects.get().projects_this_month, 1)
+
+    def test_home_view(self):
+        marketplace.stats.refresh_platform_statistics()
+
+        response = self.client.get(reverse('marketplace:home'))
+        self.assertContains(response, self.project.name)
+        self.assertContains(response, self.organization.name)
@@ -0,0 +1,162 @@
+from django.core.cache import cache
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from marketplace.domain import marketplace
+from marketplace.domain.org import OrganizationService
+from marketplace.domain.proj import ProjectTaskService
+from marketplace.domain.templates import DEFAULT_PROJECT_TEMPLATE, ProjectTemplate
+from marketplace.models.common import TaskType
+from marketplace.models.proj import TaskStatus
+
+from marketplace.tests.domain.common import (
+    example_organization, example_organization_user, example_project, example_staff_user,
+)
+
+
+def example_template(task_count):
+    return {
+        'tasks': [
+            {'key': f'task{index}', 'name': f'Task {index}',
+             'type': TaskType.DOMAIN_WORK_TASK if index else TaskType.SCOPING_TASK}
+            for index in range(task_count)
+        ],
+        'channels': [{'name': 'Lobby'}] + [
+            {'name': f'Channel {index}', 'task': f'task{index}'}
+            for index in range(task_count)
+        ],
+    }
+
+
+class ProjectTemplateTestCase(TestCase):
+
+    def setUp(self):
+        # domain results are memoized; don't inherit those of other tests
+        cache.clear()
+
+        self.owner_user = example_organization_user()
+        marketplace.user.add_user(self.owner_user, 'organization')
+        self.staff_user = example_staff_user()
+        marketplace.user.add_user(self.staff_user, 'organization')
+
+        self.organization = example_organization()
+        OrganizationService.create_organization(self.owner_user, self.organization)
+        OrganizationService.add_staff_member_by_id(self.owner_user, self.organization.id, self.staff_user.id, None)
+
+    def create_project(self):
+        project = example_project()
+        OrganizationService.create_project(self.owner_user, self.organization.id, project)
+        return project
+
+    def test_default_template(self):
+        project = self.create_project()
+
+        self.assertEqual(
+            [(task.name, task.type, task.stage) for task in project.projecttask_set.order_by('id')],
+            [(task['name'], task['type'], task['stage']) for task in DEFAULT_PROJECT_TEMPLATE['tasks']],
+        )
+        self.assertEqual(
+            [(channel.name, channel.related_task and channel.related_task.type)
+             for channel in project.projectdiscussionchannel_set.order_by('id')],
+            [
+                ('General discussion', None),
+                ('Technical talk', None),
+                ('Project management', TaskType.PROJECT_MANAGEMENT_TASK),
+                ('Project scoping', TaskType.SCOPING_TASK),
+                ('Domain work', TaskType.DOMAIN_WORK_TASK),
+                ('QA', TaskType.QA_TASK),
+            ],
+        )
+        self.assertIn('<p>Describe in detail', project.projecttask_set.get(type=TaskType.SCOPING_TASK).rendered_markdown)
+
+    def test_organization_template(self):
+        template = example_template(2)
+
+        with self.assertRaises(PermissionDenied):
+            OrganizationService.save_project_template(self.staff_user, self.organization.id, template)
+        OrganizationService.save_project_template(self.owner_user, self.organization.id, template)
+
+        project = self.create_project()
+        self.assertEqual(
+            [(task.name, task.stage) for task in project.projecttask_set.order_by('id')],
+            [('Task 0', TaskStatus.NOT_STARTED), ('Task 1', TaskStatus.NOT_STARTED)],
+        )
+        self.assertEqual(
+            [(channel.name, channel.related_task and channel.related_task.name)
+             for channel in project.projectdiscussionchannel_set.order_by('id')],
+            [('Lobby', None), ('Channel 0', 'Task 0'), ('Channel 1', 'Task 1')],
+        )
+
+        OrganizationService.save_project_template(self.owner_user, self.organization.id, None)
+        self.assertEqual(self.create_project().projecttask_set.count(), len(DEFAULT_PROJECT_TEMPLATE['tasks']))
+
+    def test_default_channels(self):
+        template = {
+            'tasks': [
+                {'key': 'scoping', 'name': 'Scoping', 'type': TaskType.SCOPING_TASK},
+                {'name': 'Modeling', 'type': TaskType.DOMAIN_WORK_TASK},
+            ],
+            'channels': [{'name': 'Scoping talk', 'task': 'scoping'}],
+        }
+        OrganizationService.save_project_template(self.owner_user, self.organization.id, template)
+
+        project = self.create_project()
+        self.assertEqual(
+            [(channel.name, channel.related_task.name)
+             for channel in project.projectdiscussionchannel_set.order_by('id')],
+            [('Scoping talk', 'Scoping'), ('Modeling', 'Modeling')],
+        )
+
+        project_task = project.projecttask_set.get(name='Modeling')
+        project_task.name = 'Modelling'
+        ProjectTaskService.save_task(self.owner_user, project.id, project_task.id, project_task)
+        self.assertEqual(project.projectdiscussionchannel_set.get(related_task=project_task).name, 'Modelling')
+
+        ProjectTaskService.delete_task(self.owner_user, project.id, project_task)
+        self.assertEqual(project.projectdiscussionchannel_set.count(), 1)
+
+    def test_creation_queries(self):
+        query_counts = []
+        for task_count in (1, 10):
+            OrganizationService.save_project_template(self.owner_user, self.organization.id,
+                                                      example_template(task_count))
+            # (the template is otherwise cached)
+            self.create_project()
+
+            with CaptureQueriesContext(connection) as queries:
+                project = self.create_project()
+            self.assertEqual(project.projecttask_set.count(), task_count)
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_invalid_templates(self):
+        for definition in (
+            [],
+            {'tasks': [], 'roles': []},
+            {'tasks': [{'short_summary': 'Nameless'}]},
+            {'tasks': [{'name': 'Task', 'percentage_complete': 50}]},
+            {'tasks': [{'name': 'Task', 'type': 'XXX'}]},
+            {'tasks': [{'name': 'x' * 51}]},
+            {'tasks': [{'key': 'a', 'name': 'A'}, {'key': 'a', 'name': 'B'}]},
+            {'channels': [{'name': 'Channel', 'task': 'missing'}]},
+            {'tasks': [{'key': 'a', 'name': 'A'}],
+             'channels': [{'name': 'One', 'task': 'a'}, {'name': 'Two', 'task': 'a'}]},
+            {},
+            {'tasks': [{'name': 'Task', 'type': TaskType.DOMAIN_WORK_TASK}]},
+            {'tasks': 'abc'},
+            {'tasks': 5},
+            {'tasks': [5]},
+            {'channels': ['abc']},
+            {'tasks': [{'key': ['a'], 'name': 'A'}]},
+            {'tasks': [{'key': 'a', 'name': 'A'}], 'channels': [{'name': 'One', 'task': ['a']}]},
+        ):
+            with self.subTest(definition=definition), self.assertRaises(ValidationError):
+                OrganizationService.save_project_template(self.owner_user, self.organization.id, definition)
+
+        with self.assertRaises(ValidationError):
+            ProjectTemplate.from_json('{"tasks": [')
+        with self.assertRaises(ValidationError):
+            ProjectTemplate.from_json('{"tasks": [5]}')
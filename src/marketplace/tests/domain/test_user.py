@@ -1,6 +1,8 @@
 import datetime
+from unittest import mock
 
-from django.test import TestCase
+import requests
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import AnonymousUser
 
 from marketplace.domain import marketplace
@@ -196,8 +198,15 @@ class UserTestCase(TestCase):
             (self.code_repeated_1, self.code_repeated_2),
         )
 
+    @override_settings(RECAPTCHA_SECRET_KEY='secret', RECAPTCHA_TIMEOUT=1)
+    def test_verify_captcha_timeout(self):
+        with mock.patch('requests.post', side_effect=requests.Timeout) as post:
+            with self.assertRaises(ValueError):
+                marketplace.user.verify_captcha('answer')
+
+        self.assertEqual(post.call_args[1]['timeout'], 1)
+
 # TODO test these methods:
 # UserService.get_user_todos(request_user, user)
 # UserService.get_volunteer_leaderboards(request_user)
 # UserService.get_featured_volunteer()
-# marketplace.user.verify_captcha(captcha_response)
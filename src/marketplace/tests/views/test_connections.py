@@ -0,0 +1,124 @@
+import threading
+from unittest import mock
+
+from django.core.signals import request_started
+from django.db import connection
+from django.test import SimpleTestCase, TransactionTestCase, override_settings
+from psycopg2 import extensions
+
+from marketplace.db.backends.postgresql_pool.base import ConnectionPool, PoolTimeout
+from marketplace.db.connections import METRICS
+
+
+class ConnectionHealthTestCase(TransactionTestCase):
+
+    def setUp(self):
+        connection.ensure_connection()
+        METRICS.reset()
+
+    def test_reused_connection(self):
+        request_started.send(sender=self.__class__)
+        self.assertIsNotNone(connection.connection)
+        self.assertEqual(METRICS.snapshot()['reused'], 1)
+
+    def test_unusable_connection(self):
+        with mock.patch.object(connection, 'is_usable', return_value=False), \
+                mock.patch.object(connection, 'close') as close, \
+                self.assertLogs('marketplace.db.connections', 'WARNING'):
+            request_started.send(sender=self.__class__)
+
+        close.assert_called_once_with()
+        self.assertEqual(METRICS.snapshot()['discarded'], 1)
+        self.assertEqual(METRICS.snapshot()['reused'], 0)
+
+    @override_settings(DATABASE_CONN_HEALTH_CHECKS=False)
+    def test_unchecked_connection(self):
+        with mock.patch.object(connection, 'is_usable', return_value=False) as is_usable:
+            request_started.send(sender=self.__class__)
+
+        is_usable.assert_not_called()
+        self.assertEqual(METRICS.snapshot()['reused'], 1)
+
+
+class FakeConnection:
+
+    def __init__(self):
+        self.closed = False
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+        self.rolled_back = False
+
+    def get_transaction_status(self):
+        return self.status
+
+    def rollback(self):
+        self.rolled_back = True
+        self.status = extensions.TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTestCase(SimpleTestCase):
+
+    def make_pool(self, max_size=2, max_age=60, timeout=0.1):
+        self.opened = []
+
+        def connect():
+            self.opened.append(FakeConnection())
+            return self.opened[-1]
+
+        return ConnectionPool(connect, max_size=max_size, max_age=max_age, timeout=timeout)
+
+    def test_reuse(self):
+        pool = self.make_pool()
+
+        (first, opened_at, reused) = pool.get()
+        self.assertFalse(reused)
+        pool.put(first, opened_at)
+
+        (second, _opened_at, reused) = pool.get()
+        self.assertTrue(reused)
+        self.assertIs(second, first)
+        self.assertEqual(len(self.opened), 1)
+
+    def test_reset(self):
+        pool = self.make_pool()
+
+        (in_transaction, opened_at, _reused) = pool.get()
+        in_transaction.status = extensions.TRANSACTION_STATUS_INTRANS
+        pool.put(in_transaction, opened_at)
+        self.assertTrue(in_transaction.rolled_back)
+        self.assertFalse(in_transaction.closed)
+
+        (broken, opened_at, _reused) = pool.get()
+        broken.status = extensions.TRANSACTION_STATUS_UNKNOWN
+        pool.put(broken, opened_at)
+        self.assertTrue(broken.closed)
+        self.assertEqual(pool.size, 0)
+
+    def test_max_age(self):
+        pool = self.make_pool(max_age=0)
+
+        (first, opened_at, _reused) = pool.get()
+        pool.put(first, opened_at - 1)
+
+        (second, _opened_at, reused) = pool.get()
+        self.assertFalse(reused)
+        self.assertTrue(first.closed)
+        self.assertEqual(pool.size, 1)
+
+    def test_exhausted(self):
+        pool = self.make_pool(max_size=1)
+
+        (first, opened_at, _reused) = pool.get()
+        with self.assertRaises(PoolTimeout):
+            pool.get()
+
+        # waiting threads are handed returned connections
+        timer = threading.Timer(0.01, pool.put, (first, opened_at))
+        timer.start()
+        pool.timeout = 5
+        (second, _opened_at, reused) = pool.get()
+        timer.join()
+        self.assertIs(second, first)
+        self.assertTrue(reused)
@@ -0,0 +1,40 @@
+from unittest import mock
+
+import requests
+from django.http.request import validate_host
+from django.test import SimpleTestCase
+
+from project.hosts import Ec2PrivateIp
+
+
+class Ec2PrivateIpTestCase(SimpleTestCase):
+
+    def setUp(self):
+        self.pattern = Ec2PrivateIp()
+        self.allowed_hosts = ['example.com', self.pattern]
+
+    def test_lazy_lookup(self):
+        response = mock.Mock(text='10.0.0.1\n')
+        with mock.patch('requests.get', return_value=response) as get:
+            # static hosts are matched without look-up
+            self.assertTrue(validate_host('example.com', self.allowed_hosts))
+            self.assertFalse(self.pattern == '*')
+            get.assert_not_called()
+
+            self.assertTrue(validate_host('10.0.0.1', self.allowed_hosts))
+            self.assertFalse(validate_host('10.0.0.2', self.allowed_hosts))
+
+        # the address is looked up once
+        get.assert_called_once()
+
+    def test_failed_lookup(self):
+        with mock.patch('requests.get', side_effect=requests.ConnectionError) as get:
+            self.assertFalse(validate_host('10.0.0.1', self.allowed_hosts))
+            self.assertFalse(validate_host('10.0.0.1', self.allowed_hosts))
+
+        # failures are retried only after an interval
+        get.assert_called_once()
+
+        self.pattern.failed_at -= self.pattern.retry_interval + 1
+        with mock.patch('requests.get', return_value=mock.Mock(text='10.0.0.1')):
+            self.assertTrue(validate_host('10.0.0.1', self.allowed_hosts))
@@ -0,0 +1,69 @@
+import os
+import pstats
+import re
+import tempfile
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from marketplace.domain import marketplace
+from marketplace.domain.org import OrganizationService
+from marketplace.domain.proj import ProjectService
+
+from marketplace.tests.domain.common import example_organization, example_organization_user, example_project
+
+
+SERVER_TIMING_PATTERN = re.compile(
+    r'^db;dur=[\d.]+;desc="(\d+) queries", template;dur=([\d.]+), domain;dur=([\d.]+), total;dur=[\d.]+$'
+)
+
+
+class RequestInstrumentationTestCase(TestCase):
+
+    def setUp(self):
+        self.owner_user = example_organization_user()
+        marketplace.user.add_user(self.owner_user, 'organization')
+
+        organization = example_organization()
+        OrganizationService.create_organization(self.owner_user, organization)
+
+        self.project = example_project()
+        OrganizationService.create_project(self.owner_user, organization.id, self.project)
+        ProjectService.publish_project(self.owner_user, self.project.id, self.project)
+
+        self.client.force_login(self.owner_user)
+        self.url = reverse('marketplace:proj_info', args=[self.project.id])
+
+    def test_disabled(self):
+        response = self.client.get(self.url)
+        self.assertNotIn('Server-Timing', response)
+
+    @override_settings(REQUEST_TIMING=True)
+    def test_server_timing(self):
+        response = self.client.get(self.url)
+
+        match = SERVER_TIMING_PATTERN.match(response['Server-Timing'])
+        self.assertIsNotNone(match, response['Server-Timing'])
+
+        (query_count, template_time, domain_time) = match.groups()
+        self.assertGreater(int(query_count), 0)
+        self.assertGreater(float(template_time), 0)
+        self.assertGreater(float(domain_time), 0)
+
+    def test_slow_request_profile(self):
+        with tempfile.TemporaryDirectory() as profiling_dir:
+            with override_settings(REQUEST_PROFILING_SAMPLE_RATE=1,
+                                   REQUEST_PROFILING_THRESHOLD=0,
+                                   REQUEST_PROFILING_DIR=profiling_dir):
+                with self.assertLogs('marketplace.middleware', 'WARNING'):
+                    response = self.client.get(self.url)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn('Server-Timing', response)
+
+            (file_name,) = os.listdir(profiling_dir)
+            self.assertIn('-marketplace.proj_info-', file_name)
+            self.assertTrue(file_name.endswith('.prof'))
+
+            stats = pstats.Stats(os.path.join(profiling_dir, file_name))
+            self.assertGreater(stats.total_calls, 0)
@@ -0,0 +1,83 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from marketplace.domain import marketplace
+from marketplace.domain.org import OrganizationService
+from marketplace.models.common import OrgRole, ReviewStatus
+from marketplace.models.org import OrganizationMembershipRequest
+from marketplace.models.proj import ProjectTask, VolunteerApplication
+from marketplace.models.user import NotificationSeverity, NotificationSource, UserNotification
+from marketplace.views.user import set_notification_urls
+
+from marketplace.tests.domain.common import (
+    example_organization, example_organization_user, example_project, example_volunteer_user,
+)
+
+
+class NotificationViewTestCase(TestCase):
+
+    def setUp(self):
+        self.owner_user = example_organization_user()
+        marketplace.user.add_user(self.owner_user, 'organization')
+        self.volunteer_user = example_volunteer_user()
+        marketplace.user.add_user(self.volunteer_user, 'volunteer')
+
+        self.organization = example_organization()
+        OrganizationService.create_organization(self.owner_user, self.organization)
+        self.project = example_project()
+        OrganizationService.create_project(self.owner_user, self.organization.id, self.project)
+        self.task = ProjectTask.objects.filter(project=self.project).first()
+
+        self.application = VolunteerApplication.objects.create(
+            task=self.task,
+            volunteer=self.volunteer_user,
+            volunteer_application_letter='Please consider me.',
+            status=ReviewStatus.NEW,
+        )
+        self.membership_request = OrganizationMembershipRequest.objects.create(
+            organization=self.organization,
+            user=self.volunteer_user,
+            role=OrgRole.STAFF,
+            status=ReviewStatus.NEW,
+        )
+
+    def notification(self, source, target_id):
+        return UserNotification(user=self.owner_user, source=source, target_id=target_id)
+
+    def test_set_notification_urls(self):
+        expected = [
+            (self.notification(NotificationSource.GENERIC, None), None),
+            (self.notification(NotificationSource.ORGANIZATION, self.organization.id),
+             reverse('marketplace:org_info', args=[self.organization.id])),
+            (self.notification(NotificationSource.PROJECT, self.project.id),
+             reverse('marketplace:proj_info', args=[self.project.id])),
+            (self.notification(NotificationSource.PROJECT, self.project.id + 1000), None),
+            (self.notification(NotificationSource.TASK, self.task.id),
+             reverse('marketplace:proj_info', args=[self.project.id])),
+            (self.notification(NotificationSource.VOLUNTEER_APPLICATION, self.application.id),
+             reverse('marketplace:proj_volunteer_application_review',
+                     args=[self.project.id, self.task.id, self.application.id])),
+            (self.notification(NotificationSource.ORGANIZATION_MEMBERSHIP_REQUEST, self.membership_request.id),
+             reverse('marketplace:org_staff_request_review',
+                     args=[self.organization.id, self.membership_request.id])),
+        ]
+        notifications = [notification for (notification, _url) in expected] * 3
+
+        # a query per type of target, regardless of the number of notifications
+        with self.assertNumQueries(5):
+            set_notification_urls(notifications)
+
+        for (notification, url) in expected:
+            self.assertEqual(notification.url, url)
+
+    def test_mark_all_read(self):
+        url = reverse('marketplace:user_notifications_read')
+        for index in range(3):
+            marketplace.notification.add_user_notification(
+                self.volunteer_user, f'Notification {index}', NotificationSeverity.INFO, NotificationSource.GENERIC, None,
+            )
+
+        self.client.force_login(self.volunteer_user)
+        self.assertEqual(self.client.get(url).status_code, 405)
+        self.assertRedirects(self.client.post(url), reverse('marketplace:user_dashboard'))
+        self.assertFalse(UserNotification.objects.filter(user=self.volunteer_user, is_read=False).exists())
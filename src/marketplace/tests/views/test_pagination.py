@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from marketplace.domain import marketplace
+from marketplace.models.user import UserNotification
+from marketplace.views.common import CursorPaginator, paginate_by_cursor
+
+from marketplace.tests.domain.common import example_volunteer_user
+
+
+class CursorPaginationTestCase(TestCase):
+
+    def setUp(self):
+        self.user = example_volunteer_user()
+        marketplace.user.add_user(self.user, 'volunteer')
+
+        UserNotification.objects.filter(user=self.user).delete()
+        UserNotification.objects.bulk_create([
+            UserNotification(user=self.user, notification_description=f'Notification {index}', is_read=False)
+            for index in range(25)
+        ])
+
+        # (include ties in the ordering field, which the primary key breaks)
+        now = timezone.now()
+        for notification in UserNotification.objects.filter(user=self.user):
+            UserNotification.objects.filter(pk=notification.pk).update(
+                notification_date=now - timedelta(minutes=notification.pk // 2),
+            )
+
+        self.notifications = UserNotification.objects.filter(user=self.user).order_by('-notification_date')
+        self.expected = list(self.notifications.order_by('-notification_date', '-pk'))
+
+    def test_paginator(self):
+        paginator = CursorPaginator(self.notifications, 10)
+
+        pages = [paginator.get_page()]
+        while pages[-1].has_next():
+            with self.assertNumQueries(1):
+                pages.append(paginator.get_page(pages[-1].next_cursor))
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual([obj for page in pages for obj in page], self.expected)
+        self.assertFalse(pages[0].has_previous())
+        self.assertTrue(pages[2].has_previous())
+
+        # and back again
+        previous_page = paginator.get_page(pages[2].previous_cursor)
+        self.assertEqual(list(previous_page), list(pages[1]))
+        self.assertTrue(previous_page.has_next())
+        self.assertTrue(previous_page.has_previous())
+
+        first_page = paginator.get_page(previous_page.previous_cursor)
+        self.assertEqual(list(first_page), list(pages[0]))
+        self.assertFalse(first_page.has_previous())
+
+        self.assertEqual(pages[0].approximate_count, 25)
+
+    def test_invalid_cursor(self):
+        request = RequestFactory().get('/', {'cursor': 'not-a-cursor'})
+        page = paginate_by_cursor(request, self.notifications, page_size=10)
+        self.assertEqual(list(page), self.expected[:10])
+
+    def test_list_view(self):
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('marketplace:user_dashboard'))
+        self.assertEqual(list(response.context['notification_list']), self.expected[:10])
+
+        response = self.client.get(reverse('marketplace:user_dashboard'), {
+            'cursor': response.context['page_obj'].next_cursor,
+        })
+        self.assertEqual(list(response.context['notification_list']), self.expected[10:20])
+        self.assertContains(response, 'cursor=')
@@ -0,0 +1,440 @@
+"""Query-count and render-time budgets of the site's pages.
+
+Every named URL of ``marketplace/urls.py`` is either requested -- over a
+seeded, realistically-sized site -- and held to a budget, or listed in
+``UNBUDGETED`` (with the reason). A page exceeding its query budget most
+likely walks a relation per row (N+1); lower its budget along with any
+change that reduces its queries.
+
+Pages are measured with a cold cache, and so with the queries of any
+memoized domain functions which they call.
+
+Set ``VIEW_BUDGET_REPORT`` to a file path to write a report of each page's
+queries and render time (for comparison between releases).
+
+"""
+import os
+import time
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, reverse
+
+from marketplace import urls
+from marketplace.domain import marketplace
+from marketplace.domain.org import OrganizationService
+from marketplace.domain.proj import ProjectService
+from marketplace.models.common import OrgRole, ReviewStatus, SkillLevel, SocialCause, TaskType
+from marketplace.models.org import OrganizationMembershipRequest, OrganizationSocialCause
+from marketplace.models.proj import (
+    PinnedTaskReview, ProjectComment, ProjectFollower, ProjectLog, ProjectLogSource, ProjectLogType,
+    ProjectSocialCause, ProjectTask, ProjectTaskRequirement, ProjectTaskReview, ProjectTaskRole,
+    TaskRole, TaskStatus, VolunteerApplication,
+)
+from marketplace.models.user import NotificationSource, Skill, UserNotification, VolunteerProfile, VolunteerSkill
+
+from marketplace.tests.domain.common import (
+    example_organization, example_organization_user, example_project, example_staff_user,
+    example_volunteer_user,
+)
+
+
+PROJECT_COUNT = 24
+VOLUNTEER_COUNT = 12
+COMMENT_COUNT = 30
+NOTIFICATION_COUNT = 30
+
+# render-time ceiling (seconds) of every page (generous, for slower machines)
+MAX_SECONDS = 2.0
+
+SOCIAL_CAUSES = tuple(cause for (cause, _label) in SocialCause.get_choices())
+
+
+# (URL name, URL arguments, requesting user, maximum queries)
+#
+# URL arguments are a function of the test case; the requesting user is
+# named by its attribute of the test case (or None for an anonymous user).
+#
+NO_ARGS = lambda case: {}
+ORG = lambda case: {'org_pk': case.organization.pk}
+PROJ = lambda case: {'proj_pk': case.project.pk}
+TASK = lambda case: {'proj_pk': case.project.pk, 'task_pk': case.task.pk}
+
+BUDGETS = (
+    ('home', NO_ARGS, None, 3),
+    ('home', NO_ARGS, 'volunteer_user', 9),
+    ('about', NO_ARGS, None, 0),
+    ('resources', NO_ARGS, None, 0),
+    ('terms', NO_ARGS, None, 0),
+    ('terms-20200804', NO_ARGS, None, 0),
+    ('privacy', NO_ARGS, None, 0),
+    ('privacy-20200804', NO_ARGS, None, 0),
+
+    ('org_list', NO_ARGS, None, 3),
+    ('org_create', NO_ARGS, 'owner_user', 5),
+    ('org_create_type', lambda case: {'type': 'socialgood'}, 'owner_user', 5),
+    ('org_info', ORG, None, 5),
+    ('org_info', ORG, 'owner_user', 12),
+    ('org_info_edit', ORG, 'owner_user', 20),
+    ('org_staff', ORG, 'owner_user', 18),
+    ('org_staff_edit', lambda case: {'org_pk': case.organization.pk, 'role_pk': case.organization_role.pk}, 'owner_user', 13),
+    ('org_staff_remove', lambda case: {'org_pk': case.organization.pk, 'role_pk': case.organization_role.pk}, 'owner_user', 13),
+    ('org_staff_request', ORG, 'volunteer_user', 8),
+    ('org_staff_leave', ORG, 'owner_user', 11),
+    ('org_staff_request_review', lambda case: {'org_pk': case.organization.pk, 'request_pk': case.membership_request.pk}, 'owner_user', 13),
+    ('proj_create', ORG, 'owner_user', 9),
+    ('proj_create_org_select', NO_ARGS, 'owner_user', 4),
+
+    ('proj_list', NO_ARGS, None, 5),
+    ('proj_info', PROJ, None, 12),
+    ('proj_info', PROJ, 'owner_user', 22),
+    ('proj_info_edit', PROJ, 'owner_user', 25),
+    ('proj_log', PROJ, 'owner_user', 57),
+    ('proj_discussion', PROJ, 'owner_user', 4),
+    ('proj_discussion', lambda case: {'proj_pk': case.project.pk, 'channel_pk': case.channel.pk}, 'owner_user', 57),
+    ('proj_discussion_add', lambda case: {'proj_pk': case.project.pk, 'channel_pk': case.channel.pk}, 'owner_user', 57),
+    ('proj_scope', PROJ, 'owner_user', 20),
+    ('proj_scope_previous', lambda case: {'proj_pk': case.project.pk, 'scope_pk': case.project_scope.pk}, 'owner_user', 22),
+    ('proj_scope_edit', lambda case: {'proj_pk': case.project.pk, 'scope_pk': case.project_scope.pk}, 'owner_user', 16),
+    ('proj_deliverables', PROJ, 'owner_user', 14),
+    ('proj_instructions', PROJ, 'task_volunteer_user', 7),
+    ('proj_instructions_task', TASK, 'owner_user', 23),
+    ('proj_task_list', PROJ, 'owner_user', 7),
+    ('proj_task', TASK, None, 17),
+    ('proj_task', TASK, 'owner_user', 27),
+    ('proj_task_finish', lambda case: {'proj_pk': case.project.pk, 'task_pk': case.reviewed_task.pk}, 'task_volunteer_user', 17),
+    ('proj_task_review', lambda case: {'proj_pk': case.project.pk, 'task_pk': case.reviewed_task.pk, 'review_pk': case.task_review.pk}, 'owner_user', 23),
+    ('proj_task_cancel', lambda case: {'proj_pk': case.project.pk, 'task_pk': case.reviewed_task.pk}, 'task_volunteer_user', 18),
+    ('proj_task_apply', TASK, 'volunteer_user', 26),
+    ('proj_task_edit', TASK, 'owner_user', 18),
+    ('proj_task_remove', TASK, 'owner_user', 17),
+    ('proj_volunteer_remove', lambda case: {'proj_pk': case.project.pk, 'task_pk': case.reviewed_task.pk, 'task_role_pk': case.task_role.pk}, 'owner_user', 19),
+    ('proj_volunteer_edit', lambda case: {'proj_pk': case.project.pk, 'task_pk': case.reviewed_task.pk, 'task_role_pk': case.task_role.pk}, 'owner_user', 20),
+    ('proj_volunteer_application_review', lambda case: {'proj_pk': case.project.pk, 'task_pk': case.task.pk, 'volunteer_application_pk': case.volunteer_application.pk}, 'owner_user', 22),
+    ('proj_task_requirements_edit', TASK, 'owner_user', 24),
+    ('proj_task_staff_edit', TASK, 'owner_user', 22),
+    ('proj_staff', PROJ, 'owner_user', 21),
+    ('proj_staff_edit', lambda case: {'proj_pk': case.project.pk, 'role_pk': case.project_role.pk}, 'owner_user', 17),
+    ('proj_staff_remove', lambda case: {'proj_pk': case.project.pk, 'role_pk': case.project_role.pk}, 'owner_user', 17),
+    ('proj_volunteers', PROJ, 'owner_user', 54),
+
+    ('login', NO_ARGS, None, 1),
+    ('signup_type_select', NO_ARGS, None, 0),
+    ('signup_form', lambda case: {'user_type': 'volunteer'}, None, 0),
+    ('user_pwd_change', NO_ARGS, 'owner_user', 5),
+    ('user_pwd_set', NO_ARGS, 'owner_user', 2),
+    ('user_social_connections', NO_ARGS, 'owner_user', 6),
+    ('pwd_reset_request', NO_ARGS, None, 0),
+    ('pwd_reset_request_done', NO_ARGS, None, 0),
+    ('pwd_reset', lambda case: {'uidb64': 'MQ', 'token': 'invalid-token'}, None, 1),
+    ('pwd_reset_complete', NO_ARGS, None, 0),
+
+    ('volunteer_list', NO_ARGS, None, 58),
+    ('my_user_profile', NO_ARGS, 'volunteer_user', 2),
+    ('user_dashboard', NO_ARGS, 'owner_user', 23),
+    ('user_dashboard', NO_ARGS, 'volunteer_user', 25),
+    ('user_type_select', NO_ARGS, 'volunteer_user', 2),
+    ('user_profile', lambda case: {'user_pk': case.volunteer_user.pk}, None, 84),
+    ('user_profile', lambda case: {'user_pk': case.volunteer_user.pk}, 'volunteer_user', 90),
+    ('user_profile_edit', lambda case: {'user_pk': case.volunteer_user.pk}, 'volunteer_user', 8),
+    ('user_volunteer_profile_edit', lambda case: {'user_pk': case.volunteer_user.pk, 'volunteer_pk': case.volunteer_profile.pk}, 'volunteer_user', 8),
+    ('user_profile_skills_edit', lambda case: {'user_pk': case.volunteer_user.pk}, 'volunteer_user', 12),
+    ('user_preferences_edit', lambda case: {'user_pk': case.volunteer_user.pk}, 'volunteer_user', 8),
+
+    ('admin_home', NO_ARGS, 'admin_user', 4),
+
+    ('validate_username', ORG, 'owner_user', 3),
+    ('validate_username_do', lambda case: {'org_pk': case.organization.pk, 'query': 'volunteer'}, 'owner_user', 3),
+)
+
+# URL names which are not requested, and why
+UNBUDGETED = {
+    'org_staff_add': 'form submission only',
+    'org_staff_request_review_do': 'action',
+    'proj_publish': 'action',
+    'proj_finish': 'action',
+    'proj_follow': 'action',
+    'proj_instructions_task_review_pin': 'action',
+    'proj_task_add': 'action',
+    'proj_task_publish': 'action',
+    'proj_task_review_do': 'action',
+    'proj_task_toggle_volunteers': 'action',
+    'proj_volunteer_application_review_do': 'action',
+    'logout': 'action',
+    'user_notifications_read': 'action',
+    'signup_oauth': 'requires an OAuth provider',
+    'user_volunteer_profile_create': 'action',
+    'admin_volunteer_review': 'action',
+}
+
+
+class ViewQueryBudgetTestCase(TestCase):
+
+    report = []
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner_user = example_organization_user()
+        marketplace.user.add_user(cls.owner_user, 'organization')
+
+        cls.admin_user = example_staff_user(is_staff=True, is_superuser=True)
+        marketplace.user.add_user(cls.admin_user, 'organization')
+
+        cls.organization = example_organization()
+        OrganizationService.create_organization(cls.owner_user, cls.organization)
+
+        skills = [
+            Skill.objects.create(area=f'Area {index % 3}', name=f'Skill {index}')
+            for index in range(6)
+        ]
+
+        projects = []
+        for index in range(PROJECT_COUNT):
+            project = example_project()
+            project.name = f'Project {index}'
+            OrganizationService.create_project(cls.owner_user, cls.organization.id, project)
+            ProjectService.publish_project(cls.owner_user, project.id, project)
+            projects.append(project)
+
+        ProjectSocialCause.objects.bulk_create(
+            ProjectSocialCause(project=project, social_cause=social_cause)
+            for (index, project) in enumerate(projects)
+            for social_cause in (SOCIAL_CAUSES[index % len(SOCIAL_CAUSES)],
+                                 SOCIAL_CAUSES[(index + 1) % len(SOCIAL_CAUSES)])
+        )
+
+        tasks = list(ProjectTask.objects.filter(project__in=projects).order_by('id'))
+        ProjectTaskRequirement.objects.bulk_create(
+            ProjectTaskRequirement(task=task, skill=skill, level=SkillLevel.INTERMEDIATE)
+            for (index, task) in enumerate(tasks)
+            for skill in (skills[index % len(skills)], skills[(index + 1) % len(skills)])
+        )
+
+        volunteers = []
+        for index in range(VOLUNTEER_COUNT):
+            volunteer = example_volunteer_user(
+                username=f'volunteer{index}',
+                email=f'volunteer{index}@example.com',
+            )
+            marketplace.user.add_user(volunteer, 'volunteer')
+            volunteers.append(volunteer)
+
+        VolunteerProfile.objects.filter(user__in=volunteers).update(
+            volunteer_status=ReviewStatus.ACCEPTED,
+            is_edited=True,
+        )
+        VolunteerSkill.objects.bulk_create(
+            VolunteerSkill(user=volunteer, skill=skill, level=SkillLevel.EXPERT)
+            for volunteer in volunteers
+            for skill in skills[:3]
+        )
+
+        cls.project = projects[0]
+        cls.volunteer_user = volunteers[0]
+        cls.volunteer_profile = cls.volunteer_user.volunteerprofile
+
+        # the featured volunteer works on (and has completed tasks of) many projects
+        worked_tasks = [
+            task for task in tasks
+            if task.type == TaskType.DOMAIN_WORK_TASK and task.project_id != cls.project.id
+        ][:10]
+        ProjectTaskRole.objects.bulk_create(
+            ProjectTaskRole(user=cls.volunteer_user, task=task, role=TaskRole.VOLUNTEER)
+            for task in worked_tasks
+        )
+        for task in worked_tasks:
+            review = ProjectTaskReview.objects.create(
+                task=task,
+                volunteer=cls.volunteer_user,
+                reviewer=cls.owner_user,
+                volunteer_comment='Completed.',
+                volunteer_effort_hours=5,
+                public_reviewer_comments='Well done.',
+                review_result=ReviewStatus.ACCEPTED,
+            )
+            PinnedTaskReview.objects.create(task_review=review, user=cls.volunteer_user)
+        ProjectTask.objects.filter(pk__in=[task.pk for task in worked_tasks]).update(stage=TaskStatus.COMPLETED)
+
+        # the first project is staffed, and taking applications
+        project_tasks = [task for task in tasks if task.project_id == cls.project.id]
+        cls.task = next(task for task in project_tasks if task.type == TaskType.DOMAIN_WORK_TASK)
+        ProjectTask.objects.filter(pk=cls.task.pk).update(
+            stage=TaskStatus.STARTED,
+            accepting_volunteers=True,
+        )
+        ProjectTaskRole.objects.bulk_create(
+            ProjectTaskRole(user=volunteer, task=task, role=TaskRole.VOLUNTEER)
+            for (volunteer, task) in zip(volunteers[1:], project_tasks)
+        )
+        cls.reviewed_task = project_tasks[0]
+        cls.task_volunteer_user = volunteers[1]
+        cls.task_role = ProjectTaskRole.objects.get(task=cls.reviewed_task, user=cls.task_volunteer_user)
+        cls.task_review = ProjectTaskReview.objects.create(
+            task=cls.reviewed_task,
+            volunteer=volunteers[1],
+            volunteer_comment='Ready for review.',
+            volunteer_effort_hours=3,
+        )
+
+        for volunteer in volunteers[6:]:
+            VolunteerApplication.objects.create(
+                task=cls.task,
+                volunteer=volunteer,
+                volunteer_application_letter='Please consider me.',
+                status=ReviewStatus.NEW,
+            )
+        cls.volunteer_application = VolunteerApplication.objects.filter(task=cls.task).first()
+
+        ProjectFollower.objects.bulk_create(
+            ProjectFollower(project=cls.project, user=volunteer)
+            for volunteer in volunteers
+        )
+
+        cls.channel = ProjectService.get_project_channels(cls.owner_user, cls.project).first()
+        for index in range(COMMENT_COUNT):
+            ProjectComment.objects.create(
+                channel=cls.channel,
+                author=volunteers[index % len(volunteers)],
+                comment=f'Comment {index}',
+            )
+
+        ProjectLog.objects.bulk_create(
+            ProjectLog(
+                project=cls.project,
+                author=cls.owner_user,
+                change_type=ProjectLogType.EDIT,
+                change_target=ProjectLogSource.INFORMATION,
+                change_target_id=cls.project.id,
+                change_description=f'Change {index}',
+            )
+            for index in range(COMMENT_COUNT)
+        )
+
+        notification_targets = (
+            (NotificationSource.PROJECT, cls.project.id),
+            (NotificationSource.TASK, cls.task.id),
+            (NotificationSource.VOLUNTEER_APPLICATION, cls.volunteer_application.id),
+            (NotificationSource.ORGANIZATION, cls.organization.id),
+        )
+        UserNotification.objects.bulk_create(
+            UserNotification(
+                user=user,
+                notification_description=f'Notification {index}',
+                is_read=False,
+                source=source,
+                target_id=target_id,
+            )
+            for user in (cls.owner_user, cls.volunteer_user)
+            for (index, (source, target_id)) in enumerate(
+                notification_targets[index % len(notification_targets)]
+                for index in range(NOTIFICATION_COUNT)
+            )
+        )
+
+        cls.membership_request = OrganizationMembershipRequest.objects.create(
+            organization=cls.organization,
+            user=volunteers[-1],
+            role=OrgRole.STAFF,
+            status=ReviewStatus.NEW,
+        )
+
+        marketplace.stats.refresh_platform_statistics()
+
+        cls.project_role = cls.project.projectrole_set.first()
+        cls.organization_role = cls.organization.organizationrole_set.first()
+        cls.project_scope = cls.project.projectscope_set.first()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+
+        report_path = os.environ.get('VIEW_BUDGET_REPORT')
+        if report_path:
+            with open(report_path, 'w') as report_file:
+                for row in sorted(cls.report):
+                    report_file.write('{:<36} {:<20} {:>4} {:>6} / {:<6} queries {:>8.1f} ms\n'.format(*row))
+
+    def request_page(self, url_name, url_args, user_name):
+        url = reverse(f'marketplace:{url_name}', kwargs=url_args(self))
+
+        client = self.client_class()
+        if user_name:
+            client.force_login(getattr(self, user_name))
+
+        cache.clear()
+
+        with CaptureQueriesContext(connection) as queries:
+            start = time.perf_counter()
+            response = client.get(url)
+            seconds = time.perf_counter() - start
+
+        return (response, len(queries), seconds)
+
+    def test_query_budgets(self):
+        for (url_name, url_args, user_name, max_queries) in BUDGETS:
+            with self.subTest(url=url_name, user=user_name):
+                (response, query_count, seconds) = self.request_page(url_name, url_args, user_name)
+
+                self.report.append((
+                    url_name,
+                    user_name or 'anonymous',
+                    response.status_code,
+                    query_count,
+                    max_queries,
+                    seconds * 1000,
+                ))
+
+                self.assertLess(response.status_code, 400)
+                self.assertLessEqual(query_count, max_queries)
+                self.assertLessEqual(seconds, MAX_SECONDS)
+
+    def test_list_pages_constant(self):
+        """List pages' queries don't vary with their number of rows."""
+        def query_count(url_name, url_args=NO_ARGS, query=''):
+            url = reverse(f'marketplace:{url_name}', kwargs=url_args(self)) + query
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                self.client_class().get(url)
+            return len(queries)
+
+        # (a full first page against a partial second page)
+        self.assertEqual(query_count('proj_list'), query_count('proj_list', query='?page=2'))
+
+        for (url_name, url_args, add_row) in (
+            ('org_list', NO_ARGS, self.add_organization),
+            ('org_info', ORG, self.add_project),
+            ('proj_info', PROJ, self.add_task),
+        ):
+            with self.subTest(url=url_name):
+                before = query_count(url_name, url_args)
+                for _index in range(3):
+                    add_row()
+                self.assertEqual(query_count(url_name, url_args), before)
+
+    def add_organization(self):
+        organization = example_organization()
+        organization.save()
+        OrganizationSocialCause.objects.create(organization=organization, social_cause=SOCIAL_CAUSES[0])
+
+    def add_project(self):
+        project = example_project()
+        project.organization = self.organization
+        project.status = self.project.status
+        project.save()
+        ProjectSocialCause.objects.create(project=project, social_cause=SOCIAL_CAUSES[0])
+
+    def add_task(self):
+        task = ProjectTask.objects.get(pk=self.task.pk)
+        task.pk = None
+        task.save()
+        ProjectTaskRequirement.objects.create(task=task, skill=Skill.objects.first(), level=SkillLevel.EXPERT)
+
+    def test_all_urls_budgeted(self):
+        budgeted = {url_name for (url_name, *_rest) in BUDGETS}
+        url_names = {
+            pattern.name for pattern in urls.urlpatterns
+            if isinstance(pattern, URLPattern) and pattern.name
+        }
+        self.assertEqual(url_names - budgeted - set(UNBUDGETED), set())
@@ -0,0 +1,75 @@
+from django.db import connection
+from django.test import TestCase, modify_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from marketplace.domain import marketplace
+from marketplace.domain.org import OrganizationService
+from marketplace.domain.proj import ProjectService
+from marketplace.domain.roles import role_snapshot_scope
+from marketplace.models.proj import ProjRole, ProjectRole
+
+from marketplace.tests.domain.common import (
+    example_organization, example_organization_user, example_project, example_staff_user,
+)
+
+
+class RoleSnapshotTestCase(TestCase):
+
+    def setUp(self):
+        self.owner_user = example_organization_user()
+        marketplace.user.add_user(self.owner_user, 'organization')
+
+        self.staff_user = example_staff_user()
+        marketplace.user.add_user(self.staff_user, 'organization')
+
+        self.organization = example_organization()
+        OrganizationService.create_organization(self.owner_user, self.organization)
+
+        self.project = example_project()
+        OrganizationService.create_project(self.owner_user, self.organization.id, self.project)
+        ProjectService.publish_project(self.owner_user, self.project.id, self.project)
+
+        self.channel = ProjectService.get_project_channels(self.owner_user, self.project).first()
+
+    def count_view_queries(self, url):
+        # (a fresh client loads the middleware currently configured)
+        client = self.client_class()
+        client.force_login(self.owner_user)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(url)
+
+        self.assertIn(response.status_code, (200, 302))
+        return len(queries)
+
+    def test_view_query_counts(self):
+        "role snapshots reduce the queries issued by project pages"
+        for url in (
+            reverse('marketplace:proj_info', args=[self.project.id]),
+            reverse('marketplace:proj_task_list', args=[self.project.id]),
+            reverse('marketplace:proj_discussion', args=[self.project.id, self.channel.id]),
+        ):
+            with self.subTest(url=url):
+                with modify_settings(MIDDLEWARE={
+                    'remove': 'marketplace.middleware.role_snapshot_middleware',
+                }):
+                    without_snapshot = self.count_view_queries(url)
+
+                with_snapshot = self.count_view_queries(url)
+
+                self.assertLess(with_snapshot, without_snapshot)
+
+    def test_snapshot_invalidation(self):
+        "role changes within a scope are reflected by subsequent checks"
+        with role_snapshot_scope():
+            self.assertTrue(marketplace.project.user.is_owner(self.owner_user, self.project))
+            self.assertFalse(marketplace.project.user.is_member(self.staff_user, self.project))
+
+            with self.assertNumQueries(0):
+                self.assertTrue(marketplace.project.user.is_official(self.owner_user, self.project))
+                self.assertTrue(marketplace.project.user.can_edit_information(self.owner_user, self.project))
+
+            ProjectRole.objects.create(user=self.staff_user, project=self.project, role=ProjRole.STAFF)
+            self.assertTrue(marketplace.project.user.is_member(self.staff_user, self.project))
+            self.assertFalse(marketplace.project.user.is_owner(self.staff_user, self.project))
@@ -0,0 +1,63 @@
+import io
+import json
+import os
+import tempfile
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from marketplace.db import slow_queries
+from marketplace.domain import marketplace
+
+from marketplace.tests.domain.common import example_volunteer_user
+
+
+class NormalizeSqlTestCase(SimpleTestCase):
+
+    def test_normalize_sql(self):
+        self.assertEqual(
+            slow_queries.normalize_sql(
+                'SELECT "t"."id" FROM "t" U0\n  WHERE "t"."status" = \'it\'\'s\' '
+                'AND "t"."id" IN (%s, %s, %s) LIMIT 21'
+            ),
+            'SELECT "t"."id" FROM "t" U0 WHERE "t"."status" = ? AND "t"."id" IN (...) LIMIT ?',
+        )
+
+
+@override_settings(SLOW_QUERY_THRESHOLD=1e-9)
+class SlowQueryLogTestCase(TestCase):
+
+    def setUp(self):
+        # (the wrapper is otherwise installed upon connection)
+        slow_queries.install_slow_query_log(None, connection)
+        self.addCleanup(connection.execute_wrappers.remove, slow_queries.log_slow_queries)
+
+        self.user = example_volunteer_user()
+        marketplace.user.add_user(self.user, 'volunteer')
+        self.client.force_login(self.user)
+
+    def test_attribution(self):
+        with self.assertLogs('marketplace.db.slow_queries', 'INFO') as logs:
+            response = self.client.get(reverse('marketplace:user_dashboard'))
+        self.assertEqual(response.status_code, 200)
+
+        entries = [json.loads(record.getMessage()) for record in logs.records]
+        callers = {entry['caller'] for entry in entries}
+        self.assertIn('user.UserService.get_user_todos', callers)
+        self.assertIn('org.OrganizationService.user_is_any_organization_member', callers)
+        self.assertIn('marketplace:user_dashboard', {entry['view'] for entry in entries})
+
+        with tempfile.TemporaryDirectory() as log_dir:
+            log_path = os.path.join(log_dir, 'slow_queries.log')
+            with open(log_path, 'w') as log_file:
+                log_file.writelines(record.getMessage() + '\n' for record in logs.records * 2)
+
+            output = io.StringIO()
+            call_command('slow_query_report', log_path, order_by='count', stdout=output)
+
+        report = output.getvalue()
+        self.assertIn('caller: user.UserService.get_user_todos', report)
+        self.assertIn(f'Total: {len(entries) * 2} slow queries', report)
+        self.assertNotIn('count=1 ', report)
@@ -0,0 +1,50 @@
+import subprocess
+import sys
+
+from django.conf import settings
+from django.test import SimpleTestCase
+
+from marketplace.management.commands.profile_startup import parse_import_times
+
+
+# set up Django as does a management command skipping system checks
+SETUP = '''
+import sys
+import django
+import rules
+
+django.setup()
+
+assert rules.rule_exists('user.is_site_staff'), "permissions not added"
+print(' '.join(module for module in ('requests', 'marketplace.views') if module in sys.modules))
+'''
+
+
+class StartupTestCase(SimpleTestCase):
+
+    def test_setup_imports(self):
+        process = subprocess.run(
+            [sys.executable, '-c', SETUP],
+            cwd=settings.BASE_DIR,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        self.assertEqual(process.returncode, 0, process.stderr)
+
+        # permissions are added without the import of views (or requests)
+        self.assertEqual(process.stdout.strip(), '')
+
+    def test_parse_import_times(self):
+        output = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       120 |        120 |     _weakrefset\n"
+            "import time:      1500 |       1620 |   marketplace.models\n"
+            "import time:       200 |       1820 | marketplace\n"
+            "Traceback (most recent call last):\n"
+        )
+        self.assertEqual(parse_import_times(output), [
+            ('_weakrefset', 0.00012, 0.00012, 2),
+            ('marketplace.models', 0.0015, 0.00162, 1),
+            ('marketplace', 0.0002, 0.00182, 0),
+        ])
@@ -0,0 +1,69 @@
+import threading
+
+from django.db import connections
+from django.test import TransactionTestCase
+from django.urls import reverse
+
+from marketplace.domain import marketplace
+from marketplace.domain.org import OrganizationService
+from marketplace.domain.proj import ProjectService
+
+from marketplace.tests.domain.common import (
+    example_organization, example_organization_user, example_project, example_volunteer_user,
+)
+
+
+class ThreadedRequestsTestCase(TransactionTestCase):
+    """Requests served concurrently by the threads of a (gthread) worker
+    share no per-request state.
+
+    """
+    thread_count = 8
+    request_count = 5
+
+    def setUp(self):
+        self.owner_user = example_organization_user()
+        marketplace.user.add_user(self.owner_user, 'organization')
+
+        self.volunteer_user = example_volunteer_user()
+        marketplace.user.add_user(self.volunteer_user, 'volunteer')
+
+        organization = example_organization()
+        OrganizationService.create_organization(self.owner_user, organization)
+
+        self.project = example_project()
+        OrganizationService.create_project(self.owner_user, organization.id, self.project)
+        ProjectService.publish_project(self.owner_user, self.project.id, self.project)
+
+    def test_concurrent_permissions(self):
+        info_url = reverse('marketplace:proj_info', args=[self.project.id])
+        edit_url = reverse('marketplace:proj_info_edit', args=[self.project.id])
+        barrier = threading.Barrier(self.thread_count, timeout=30)
+        results = []
+
+        def request_as(user, client):
+            barrier.wait()
+
+            try:
+                for _ in range(self.request_count):
+                    response = client.get(info_url)
+                    results.append((user, response.status_code, edit_url in response.content.decode()))
+            finally:
+                connections.close_all()
+
+        threads = []
+        for index in range(self.thread_count):
+            user = self.owner_user if index % 2 else self.volunteer_user
+            client = self.client_class()
+            client.force_login(user)
+            threads.append(threading.Thread(target=request_as, args=(user, client)))
+
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(60)
+
+        self.assertEqual(len(results), self.thread_count * self.request_count)
+        for (user, status_code, can_edit) in results:
+            self.assertEqual(status_code, 200)
+            self.assertEqual(can_edit, user == self.owner_user, user)
@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.contrib.auth import views as auth_views
 from django.urls import path, reverse_lazy
 from django.views.generic.base import RedirectView, TemplateView
@@ -105,6 +106,7 @@ urlpatterns = [
     path('volunteers/', user.volunteer_list_view, name='volunteer_list'),
     path('user/', user.my_user_profile_view, name='my_user_profile'),
     path('user/dashboard/', user.UserHomeView.as_view(), name='user_dashboard'),
+    path('user/dashboard/read', user.mark_all_notifications_read_view, name='user_notifications_read'),
     path('user/select/', user.select_user_type_after, name='user_type_select'),
     path('user/<int:user_pk>', user.UserProfileView.as_view(), name='user_profile'),
     path('user/<int:user_pk>/edit', user.UserProfileEdit.as_view(), name='user_profile_edit'),
@@ -119,3 +121,6 @@ urlpatterns = [
     path('ajax/org/<int:org_pk>/candidates/', org.get_all_users_not_organization_members_json, name='validate_username'),
     path('ajax/org/<int:org_pk>/candidates/<str:query>', org.get_all_users_not_organization_members_json, name='validate_username_do'),
 ]
+
+if settings.LOADTEST_ENDPOINTS:
+    urlpatterns.append(path('loadtest/io', common.loadtest_io_view, name='loadtest_io'))
@@ -11,6 +11,14 @@ def redirect(*args, params=None, **kwargs):
     return response
 
 
+def percentile(values, share):
+    """The nearest-rank percentile of the given (sorted) values."""
+    if not values:
+        return None
+    index = max(0, min(len(values) - 1, round(share * len(values)) - 1))
+    return values[index]
+
+
 class SubmitSelect(django.forms.widgets.ChoiceWidget):
 
     input_type = 'submit'
@@ -1,4 +0,0 @@
-# This import is needed to add the permissions that are then used in the views
-import marketplace.authorization.org
-import marketplace.authorization.proj
-import marketplace.authorization.user
@@ -1,6 +1,14 @@
+import base64
+import binascii
+import json
+import time
+from collections.abc import Sequence
 from itertools import repeat, zip_longest
 
-from django.http import Http404, HttpResponseRedirect
+from django.core.exceptions import ValidationError
+from django.db import connections
+from django.db.models import Q
+from django.http import Http404, HttpResponse, HttpResponseRedirect
 from django.shortcuts import redirect, render
 from django.urls import reverse, reverse_lazy
 from django.core.paginator import Paginator
@@ -18,6 +26,16 @@ def about_view(request):
 def resources_view(request):
     return render(request, 'marketplace/resources.html')
 
+def loadtest_io_view(request):
+    """Simulate a request blocked on an external service (such as
+    reCAPTCHA or S3), for load tests (see: manage.py loadtest).
+
+    Enabled only under settings.LOADTEST_ENDPOINTS.
+
+    """
+    time.sleep(min(float(request.GET.get('delay', 0.2)), 5))
+    return HttpResponse('ok', content_type='text/plain')
+
 def home_link(include_link=True):
     return ('Home', reverse_lazy('marketplace:home') if include_link else None)
 
@@ -31,6 +49,174 @@ def paginate(request, query_set, page_size=25, request_key='page'):
     return paginator.get_page(request.GET.get(request_key, 1))
 
 
+class CursorPage(Sequence):
+
+    def __init__(self, object_list, paginator, has_next, has_previous):
+        self.object_list = object_list
+        self.paginator = paginator
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__} of {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self._has_next or self._has_previous
+
+    @property
+    def next_cursor(self):
+        if self._has_next and self.object_list:
+            return self.paginator.encode_cursor(CursorPaginator.NEXT, self.object_list[-1])
+        return None
+
+    @property
+    def previous_cursor(self):
+        if self._has_previous and self.object_list:
+            return self.paginator.encode_cursor(CursorPaginator.PREVIOUS, self.object_list[0])
+        return None
+
+    @property
+    def approximate_count(self):
+        return self.paginator.approximate_count()
+
+
+class CursorPaginator:
+    """Keyset ("cursor") pagination of a queryset ordered by a single field
+    (such as a date).
+
+    Pages are identified by an opaque cursor -- the ordering field's value
+    and primary key of the first or last object of the adjacent page --
+    rather than by number. Every page is retrieved by a single query,
+    seeking from the cursor, such that deep pages cost no more than the
+    first; and no COUNT of the whole queryset is required.
+
+    Compatible with ListView, via `CursorPaginationMixin`.
+
+    """
+    NEXT = 'n'
+    PREVIOUS = 'p'
+
+    # bound of approximate_count() where no row estimate is available
+    count_limit = 1000
+
+    def __init__(self, object_list, per_page, orphans=0, allow_empty_first_page=True):
+        (self.order_field, self.descending) = self.get_ordering(object_list)
+        self.object_list = object_list
+        self.per_page = int(per_page)
+
+    @staticmethod
+    def get_ordering(query_set):
+        ordering = query_set.query.order_by or query_set.model._meta.ordering
+        if not ordering:
+            raise ValueError('cursor pagination requires an ordered queryset')
+
+        (order_field, *_rest) = ordering
+        return (order_field.lstrip('-'), order_field.startswith('-'))
+
+    def encode_cursor(self, direction, obj):
+        # (value_to_string preserves the microseconds which DjangoJSONEncoder drops)
+        value = self.object_list.model._meta.get_field(self.order_field).value_to_string(obj)
+        payload = json.dumps([direction, value, obj.pk])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    def decode_cursor(self, cursor):
+        try:
+            (direction, value, pk) = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            value = self.object_list.model._meta.get_field(self.order_field).to_python(value)
+            pk = self.object_list.model._meta.pk.to_python(pk)
+        except (binascii.Error, TypeError, ValueError, ValidationError):
+            return None
+
+        if direction not in (self.NEXT, self.PREVIOUS):
+            return None
+
+        return (direction, value, pk)
+
+    def get_page(self, cursor=None):
+        """Retrieve the page identified by the given cursor.
+
+        Absent a (valid) cursor, the first page is returned.
+
+        """
+        decoded = self.decode_cursor(cursor) if cursor else None
+        (direction, value, pk) = decoded or (self.NEXT, None, None)
+
+        # seek forward (or backward) from the cursor
+        forward = (direction == self.NEXT)
+        descending = self.descending if forward else not self.descending
+        sign = '-' if descending else ''
+        lookup = 'lt' if descending else 'gt'
+
+        query_set = self.object_list.order_by(f'{sign}{self.order_field}', f'{sign}pk')
+        if decoded:
+            query_set = query_set.filter(
+                Q(**{f'{self.order_field}__{lookup}': value}) |
+                Q(**{self.order_field: value, f'pk__{lookup}': pk})
+            )
+
+        # (one extra row indicates whether there is yet another page)
+        rows = list(query_set[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+
+        if forward:
+            return CursorPage(rows, self, has_next=has_more, has_previous=decoded is not None)
+
+        rows.reverse()
+        return CursorPage(rows, self, has_next=True, has_previous=has_more)
+
+    def approximate_count(self):
+        """Estimate the number of objects, without a COUNT of the whole
+        queryset.
+
+        On PostgreSQL this is the query planner's row estimate; elsewhere,
+        an exact count up to (one more than) `count_limit`.
+
+        """
+        query_set = self.object_list.order_by()
+        connection = connections[query_set.db]
+
+        if connection.vendor == 'postgresql':
+            (sql, params) = query_set.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+                (plan,) = cursor.fetchone()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return plan[0]['Plan']['Plan Rows']
+
+        return query_set[:self.count_limit + 1].count()
+
+
+class CursorPaginationMixin:
+    """ListView mixin paginating by cursor (see: `CursorPaginator`)."""
+
+    paginator_class = CursorPaginator
+    page_kwarg = 'cursor'
+
+    def paginate_queryset(self, queryset, page_size):
+        paginator = self.get_paginator(queryset, page_size)
+        page = paginator.get_page(self.request.GET.get(self.page_kwarg))
+        return (paginator, page, page.object_list, page.has_other_pages())
+
+
+def paginate_by_cursor(request, query_set, page_size=25, request_key='cursor'):
+    paginator = CursorPaginator(query_set, page_size)
+    return paginator.get_page(request.GET.get(request_key))
+
+
 def generic_getter(domain_function, *args):
     try:
         result_object = domain_function(*args)
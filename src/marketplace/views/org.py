@@ -86,10 +86,7 @@ def organization_list_view(request):
     elif request.method == 'GET':
         organizations = OrganizationService.get_all_organizations(request.user)
 
-    if organizations:
-        organizations_page = paginate(request, organizations, page_size=15)
-    else:
-        organizations_page = []
+    organizations_page = paginate(request, organizations, page_size=15)
 
     return render(request, 'marketplace/org_list.html',
                         {
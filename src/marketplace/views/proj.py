@@ -5,8 +5,6 @@ from django.contrib.auth import logout
 from django.contrib.messages.views import SuccessMessageMixin
 from django.contrib import messages
 from django.core.exceptions import PermissionDenied, ValidationError
-from django.db.models import Max, Min
-from django.db.models.functions import ExtractYear
 from django.forms import CharField, ModelForm, Textarea
 from django.http import Http404, HttpResponseRedirect
 from django.shortcuts import get_object_or_404, redirect, render
@@ -24,7 +22,7 @@ from ..models.proj import (
     ProjectTask, ProjectTaskRequirement, ProjectStatus, TaskStatus,
     ProjectTaskReview, ProjectTaskRole, VolunteerApplication, ProjectScope,
 )
-from .common import build_breadcrumb, home_link, paginate, generic_getter
+from .common import build_breadcrumb, home_link, paginate, paginate_by_cursor, generic_getter, CursorPaginationMixin
 from .org import organizations_link, organization_link, get_organization, add_organization_common_context
 
 from marketplace.domain import marketplace
@@ -128,6 +126,7 @@ PROJECT_SEARCH_KEYS = (
     'projname',
     'orgname',
     'skills',
+    'text',
 )
 
 PROJECT_SEARCH_LISTS = (
@@ -138,26 +137,9 @@ PROJECT_SEARCH_LISTS = (
 @require_GET
 def project_list_view(request):
     # year of posting filter gets slight special handling
-    #
-    # FIXME: the below query should only consider dates of "public" projects
-    # FIXME: (which will be available to the view);
-    # FIXME: though, it's a minor discrepancy to show more years than are useful.
-    #
-    # domain/proj.py:filter_public_projects does this (and the below query _could_ be moved to
-    # that module as well). though, at the same time, filter_public_projects would make *at least*
-    # as much sense as a method on the Project object manager, (such that it's available here
-    # "for free").
-    #
-    (latest_year, oldest_year) = (
-        Project.objects
-        .annotate(
-            creation_year=ExtractYear('creation_date'),
-        ).aggregate(
-            Max('creation_year'),
-            Min('creation_year'),
-        ).values()
-    )
-    project_years = range(latest_year, (oldest_year - 1), -1) if latest_year and oldest_year else ()
+    facet_index = marketplace.project.get_public_project_facet_index()
+    project_years = facet_index.year_range
+    oldest_year = project_years[-1] if project_years else None
 
     try:
         filter_year = int(request.GET.get('postedsince', ''))
@@ -181,6 +163,7 @@ def project_list_view(request):
     filter_projname = request.GET.get('projname', '')
     filter_orgname = request.GET.get('orgname', '')
     filter_skills = request.GET.get('skills', '')
+    filter_text = request.GET.get('text', '')
 
     search_values_multi = (
         request.GET.getlist(key.replace('_', ''))
@@ -196,7 +179,8 @@ def project_list_view(request):
     checked_project_fields = dict.fromkeys(request.GET.getlist('projectstatus'), True)
 
     projects =  marketplace.project.list_public_projects(**search_config)
-    projects_page = paginate(request, projects, page_size=15) if projects else ()
+    facet_counts = marketplace.project.count_public_project_facets(**search_config)
+    projects_page = paginate(request, projects, page_size=15)
 
     any_org_member = OrganizationService.user_is_any_organization_member(request.user)
     organizations = OrganizationService.get_organizations_with_user_create_project_permission(request.user)
@@ -213,14 +197,16 @@ def project_list_view(request):
         'proj_list': projects_page,
         'checked_social_cause_fields': checked_social_cause_fields,
         'checked_project_fields': checked_project_fields,
+        'facet_counts': facet_counts,
         'filter_projname': filter_projname,
         'filter_orgname': filter_orgname,
         'filter_skills': filter_skills,
+        'filter_text': filter_text,
         'user_is_any_organization_member': any_org_member,
         'single_org_membership': single_org_membership,
         'organization_memberships': organization_memberships,
         'project_years': [
-            (project_year, project_year == selected_year)
+            (project_year, project_year == selected_year, facet_counts['posted_since'][project_year])
             for project_year in project_years
         ],
     })
@@ -264,7 +250,7 @@ class ProjectView(PermissionRequiredMixin, generic.ListView): ## This is a listv
     def get_permission_object(self):
         return get_project(self.request, self.kwargs['proj_pk'])
 
-class ProjectLogView(PermissionRequiredMixin, generic.ListView):
+class ProjectLogView(PermissionRequiredMixin, CursorPaginationMixin, generic.ListView):
     template_name = 'marketplace/proj_log.html'
     context_object_name = 'project_logs'
     paginate_by = 20
@@ -328,7 +314,7 @@ def project_channel_comments_view(request, proj_pk, channel_pk):
         form = CreateProjectCommentForm()
     project = get_project(request, proj_pk)
     project_comments = ProjectService.get_project_comments(request.user, channel_pk, project)
-    project_comments_page = paginate(request, project_comments, page_size=20)
+    project_comments_page = paginate_by_cursor(request, project_comments, page_size=20)
     channel = ProjectService.get_project_channel(request.user, project, channel_pk)
     discussion_channels = ProjectService.get_project_channels(request.user, project)
     return render(request, 'marketplace/proj_discussion.html',
@@ -1,5 +1,3 @@
-from datetime import timedelta
-
 from allauth.account.models import EmailAddress
 from allauth.account.utils import perform_login
 from allauth.socialaccount import providers
@@ -15,7 +13,6 @@ from django.contrib.auth.decorators import login_required
 from django.http import Http404, HttpResponseForbidden
 from django.shortcuts import get_object_or_404, redirect, render
 from django.urls import reverse, reverse_lazy
-from django.utils import timezone
 from django.utils.decorators import method_decorator
 from django.views import generic
 from django.views.decorators.csrf import csrf_protect
@@ -27,14 +24,14 @@ from rules.contrib.views import (
 )
 
 from ..models.org import Organization, OrganizationMembershipRequest
-from ..models.proj import Project, ProjectStatus, ProjectTask, VolunteerApplication
-from ..models.user import SkillLevel, User, UserType, VolunteerProfile, UserNotification, NotificationSource
-from .common import build_breadcrumb, home_link, paginate
+from ..models.proj import Project, ProjectTask, VolunteerApplication
+from ..models.user import User, UserType, VolunteerProfile, UserNotification, NotificationSource
+from .common import build_breadcrumb, home_link, paginate, CursorPaginationMixin
 
 from marketplace import utils
 from marketplace.domain import marketplace
 from marketplace.domain.user import UserService
-from marketplace.domain.proj import ProjectService, ProjectTaskService
+from marketplace.domain.proj import ProjectTaskService
 from marketplace.domain.org import OrganizationService
 from marketplace.domain.notifications import NotificationService
 from marketplace.domain.news import NewsService
@@ -59,39 +56,48 @@ def edit_my_preferences_link(user_pk, include_link=True):
     return ("Edit my interests" , reverse('marketplace:user_preferences_edit', args=[user_pk]) if include_link else None)
 
 
-def get_or_none(classmodel, **kwargs):
-    try:
-        return classmodel.objects.get(**kwargs)
-    except classmodel.DoesNotExist:
-        return None
+# Notification targets, by notification source: their model, the fields of
+# their URL arguments, and their URL name
+NOTIFICATION_TARGETS = {
+    NotificationSource.ORGANIZATION: (
+        Organization, ('id',), 'marketplace:org_info',
+    ),
+    NotificationSource.PROJECT: (
+        Project, ('id',), 'marketplace:proj_info',
+    ),
+    NotificationSource.TASK: (
+        ProjectTask, ('project',), 'marketplace:proj_info',
+    ),
+    NotificationSource.VOLUNTEER_APPLICATION: (
+        VolunteerApplication, ('task__project', 'task', 'id'), 'marketplace:proj_volunteer_application_review',
+    ),
+    NotificationSource.ORGANIZATION_MEMBERSHIP_REQUEST: (
+        OrganizationMembershipRequest, ('organization', 'id'), 'marketplace:org_staff_request_review',
+    ),
+}
+
+
+def set_notification_urls(notifications):
+    """Set the `url` of each of the given notifications to that of its
+    target (or to None, where it has none, or it no longer exists).
+
+    Targets are fetched by a query per type of target, (rather than per
+    notification).
 
+    """
+    target_ids = {}
+    for notification in notifications:
+        if notification.target_id and notification.source in NOTIFICATION_TARGETS:
+            target_ids.setdefault(notification.source, set()).add(notification.target_id)
 
-def get_url_for_notification(source_type, source_id):
-    url = None
-    if source_id:
-        if source_type == NotificationSource.GENERIC:
-            url = None
-        elif source_type == NotificationSource.ORGANIZATION:
-            organization = get_or_none(Organization, pk=source_id)
-            if organization:
-                url = reverse('marketplace:org_info', args=[source_id])
-        elif source_type == NotificationSource.PROJECT:
-            project = get_or_none(Project, pk=source_id)
-            if project:
-                url = reverse('marketplace:proj_info', args=[source_id])
-        elif source_type == NotificationSource.TASK:
-            project_task = get_or_none(ProjectTask, pk=source_id)
-            if project_task:
-                url = reverse('marketplace:proj_info', args=[project_task.project.id])
-        elif source_type == NotificationSource.VOLUNTEER_APPLICATION:
-            volunteer_application = get_or_none(VolunteerApplication, pk=source_id)
-            if volunteer_application:
-                url = reverse('marketplace:proj_volunteer_application_review', args=[volunteer_application.task.project.id, volunteer_application.task.id, source_id])
-        elif source_type == NotificationSource.ORGANIZATION_MEMBERSHIP_REQUEST:
-            membership_request = get_or_none(OrganizationMembershipRequest,pk=source_id)
-            if membership_request:
-                url = reverse('marketplace:org_staff_request_review', args=[membership_request.organization.id, source_id])
-    return url
+    target_urls = {}
+    for (source, ids) in target_ids.items():
+        (model, fields, url_name) = NOTIFICATION_TARGETS[source]
+        for (target_id, *url_args) in model.objects.filter(pk__in=ids).values_list('pk', *fields):
+            target_urls[(source, target_id)] = reverse(url_name, args=url_args)
+
+    for notification in notifications:
+        notification.url = target_urls.get((notification.source, notification.target_id))
 
 
 class AuthenticationForm(django.contrib.auth.forms.AuthenticationForm):
@@ -186,7 +192,7 @@ def volunteer_list_view(request):
                         })
 
 
-class UserHomeView(PermissionRequiredMixin, generic.ListView): ## This is a listview because it is actually showing the list of user notifications
+class UserHomeView(PermissionRequiredMixin, CursorPaginationMixin, generic.ListView): ## This is a listview because it is actually showing the list of user notifications
     model = UserNotification
     template_name = 'marketplace/home_user.html'
     context_object_name = 'notification_list'
@@ -199,8 +205,7 @@ class UserHomeView(PermissionRequiredMixin, generic.ListView): ## This is a list
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['breadcrumb'] = build_breadcrumb([home_link(), dashboard_link(include_link=False)])
-        for notification in context['notification_list']:
-            notification.url = get_url_for_notification(notification.source, notification.target_id)
+        set_notification_urls(context['notification_list'])
         context['todos'] = UserService.get_user_todos(self.request.user, self.request.user)
         context['my_tasks'] = ProjectTaskService.get_user_in_progress_tasks(self.request.user)
         context['my_task_applications'] = ProjectTaskService.get_volunteer_open_task_applications(self.request.user, None)
@@ -218,39 +223,29 @@ class UserHomeView(PermissionRequiredMixin, generic.ListView): ## This is a list
         # This should be done in the service itself but only the view knows the
         # items that are actually displayed (as pagination is done in the view) so
         # the service iteslf cannot just mark the right notifications as read.
-        mark_notifications_as_read = lambda response: NotificationService.mark_notifications_as_read(context['notification_list'])
+        # (a callback's return value would replace the response)
+        def mark_notifications_as_read(response):
+            NotificationService.mark_notifications_as_read(context['notification_list'])
         response.add_post_render_callback(mark_notifications_as_read)
         return response
 
-def home_view(request):
-    # featured volunteer
-    featured_volunteer = UserService.get_featured_volunteer()
-    if featured_volunteer:
-        featured_volunteer_skills = (
-            featured_volunteer.user.volunteerskill_set
-            .filter(level=SkillLevel.EXPERT)
-            .values_list('skill__name', flat=True)
-        )
-    else:
-        featured_volunteer_skills = None
+@login_required
+@require_POST
+def mark_all_notifications_read_view(request):
+    marketplace.notification.mark_all_read(request.user)
+    return redirect('marketplace:user_dashboard')
 
-    # platform stats
-    avg_days_month = 365.25 / 12
-    one_avg_month = timedelta(days=avg_days_month)
-    one_avg_month_ago = timezone.now() - one_avg_month
+
+def home_view(request):
+    platform_stats = marketplace.stats.get_platform_statistics()
 
     return render(request, 'marketplace/home_anonymous.html', {
         'user_is_any_organization_member': OrganizationService.user_can_create_projects(request.user),
-        'featured_project': ProjectService.get_featured_project(),
-        'featured_organization': OrganizationService.get_featured_organization(),
-        'featured_volunteer': featured_volunteer,
-        'featured_volunteer_skills': featured_volunteer_skills,
+        'featured_project': platform_stats.featured_project,
+        'featured_organization': platform_stats.featured_organization,
+        'featured_volunteer': platform_stats.featured_volunteer,
         'news': NewsService.get_latest_news(request.user),
-        'platform_stats': {
-            'projects_in_design': Project.objects.filter(status=ProjectStatus.DESIGN).count(),
-            'projects_this_month': Project.objects.filter(creation_date__gte=one_avg_month_ago).count(),
-            'volunteers_this_month': VolunteerProfile.objects.filter(creation_date__gte=one_avg_month_ago).count(),
-        },
+        'platform_stats': platform_stats,
     })
 
 
@@ -0,0 +1,70 @@
+"""Discovery of this host's addresses, for ALLOWED_HOSTS.
+
+Within EC2, requests may address the instance by its private IP address
+(as do the load balancer's health checks). That address is looked up from
+the instance metadata service -- not upon import of settings, which every
+process does, but only upon a request whose host matches none of the
+other allowed hosts.
+
+"""
+import threading
+import time
+
+
+EC2_METADATA_URL = 'http://169.254.169.254/latest/meta-data/local-ipv4'
+
+# (a pattern which matches no valid host)
+UNRESOLVED = '<unresolved>'
+
+
+class Ec2PrivateIp:
+    """An ALLOWED_HOSTS pattern matching the EC2 instance's private IP
+    address.
+
+    The address is retrieved upon first comparison, and cached for the
+    life of the process. (Failed look-ups are retried no more often than
+    every ``retry_interval`` seconds.)
+
+    """
+    def __init__(self, timeout=0.1, retry_interval=300):
+        self.timeout = timeout
+        self.retry_interval = retry_interval
+        self.address = None
+        self.failed_at = None
+        self.lock = threading.Lock()
+
+    def resolve(self):
+        # (imported upon use, rather than upon import of settings)
+        import requests
+
+        with self.lock:
+            if self.address is None and (
+                self.failed_at is None or time.monotonic() - self.failed_at > self.retry_interval
+            ):
+                try:
+                    response = requests.get(EC2_METADATA_URL, timeout=self.timeout)
+                    response.raise_for_status()
+                except requests.RequestException:
+                    self.failed_at = time.monotonic()
+                else:
+                    self.address = response.text.strip().lower()
+
+            return self.address
+
+    # As a host pattern (see: django.http.request.validate_host) #
+
+    def __bool__(self):
+        return True
+
+    def __eq__(self, other):
+        if other == '*':
+            return False
+        return isinstance(other, str) and other.lower() == self.resolve()
+
+    __hash__ = object.__hash__
+
+    def lower(self):
+        return self.resolve() or UNRESOLVED
+
+    def __repr__(self):
+        return f'<{self.__class__.__name__}: {self.address or "unresolved"}>'
@@ -11,12 +11,13 @@ https://docs.djangoproject.com/en/2.0/ref/settings/
 """
 import os
 
-import requests
 from decouple import Csv, config
 from dj_database_url import parse as db_url
 from django.contrib.messages import constants as messages
 from django.core.exceptions import ImproperlyConfigured
 
+from project.hosts import Ec2PrivateIp
+
 # Build paths inside the project like this: os.path.join(BASE_DIR, ...)
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
@@ -32,25 +33,14 @@ DEBUG = config('DEBUG', default=False, cast=bool)
 
 ALLOWED_HOSTS = config('ALLOWED_HOSTS', cast=Csv())
 
-if DEBUG:
-    EC2_PRIVATE_IP = None
-else:
-    # TODO: Could perhaps instead determine this value at EC2 instance
-    # TODO: initialization (via user data or something)?
-    # TODO: ...Such that container processes can retrieve it locally
-    # TODO: (or from the host)?
-    try:
-        response = requests.get(
-            'http://169.254.169.254/latest/meta-data/local-ipv4',
-            timeout=0.01
-        )
-    except requests.exceptions.RequestException:
-        EC2_PRIVATE_IP = None
-    else:
-        EC2_PRIVATE_IP = response.text
-
-    if EC2_PRIVATE_IP:
-        ALLOWED_HOSTS.append(EC2_PRIVATE_IP)
+# Unless disabled, requests for the EC2 instance's private IP address are also
+# allowed. (The address is looked up lazily; see: project.hosts.)
+EC2_HOST_DISCOVERY = config('EC2_HOST_DISCOVERY', default=not DEBUG, cast=bool)
+
+if EC2_HOST_DISCOVERY:
+    ALLOWED_HOSTS.append(
+        Ec2PrivateIp(timeout=config('EC2_METADATA_TIMEOUT', default=0.1, cast=float))
+    )
 
 file_storage_option = config('DEFAULT_FILE_STORAGE', default='') or 'filesystem'
 file_storage_options = {'s3', 'whitenoise', 'filesystem'}
@@ -99,7 +89,43 @@ if file_storage_option == 's3':
     INSTALLED_APPS.append('storages')
 
 
+# Caches
+#
+# locmem (the default) is private to each server process: in production
+# (under multiple workers) prefer a cache shared among processes -- file, or
+# db (which requires: manage.py createcachetable).
+#
+cache_option = config('CACHE_BACKEND', default='') or 'locmem'
+cache_options = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'marketplace'),
+    'file': ('django.core.cache.backends.filebased.FileBasedCache', '/var/tmp/dssgsolve/cache'),
+    'db': ('django.core.cache.backends.db.DatabaseCache', 'marketplace_cache'),
+    'dummy': ('django.core.cache.backends.dummy.DummyCache', ''),
+}
+if cache_option not in cache_options:
+    raise ImproperlyConfigured("unrecognized value for CACHE_BACKEND: "
+                               f"{cache_option!r} not in {set(cache_options)}")
+
+(cache_backend, cache_location) = cache_options[cache_option]
+
+CACHES = {
+    'default': {
+        'BACKEND': cache_backend,
+        'LOCATION': config('CACHE_LOCATION', default=cache_location),
+        'TIMEOUT': config('CACHE_TIMEOUT', default=300, cast=int),
+        'KEY_PREFIX': 'marketplace',
+    },
+}
+
+# Maximum age (in seconds) of the platform statistics presented by the home
+# page, before they are recomputed upon request. (They may also be refreshed
+# ahead of time by: manage.py refresh_platform_statistics.)
+PLATFORM_STATISTICS_MAX_AGE = config('PLATFORM_STATISTICS_MAX_AGE', default=900, cast=int)
+
+
 MIDDLEWARE = [
+    'marketplace.middleware.request_instrumentation_middleware',
+    'marketplace.middleware.slow_query_middleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -108,6 +134,7 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 
+    'marketplace.middleware.role_snapshot_middleware',
     'marketplace.middleware.UserTypeMiddleware',
     'marketplace.middleware.version_header_middleware',
 ]
@@ -130,6 +157,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'marketplace.context_processors.include_settings',
+                'marketplace.context_processors.notifications',
             ],
         },
     },
@@ -149,6 +177,36 @@ DATABASES = {
     )
 }
 
+# Persistent connections (see: marketplace.db.connections)
+#
+# Connections are kept open, and reused by subsequent requests, for up to
+# DATABASE_CONN_MAX_AGE seconds (0: closed at the end of each request). Under
+# DATABASE_CONN_HEALTH_CHECKS, reused connections are checked before use.
+#
+DATABASE_CONN_MAX_AGE = config('DATABASE_CONN_MAX_AGE', default=60, cast=int)
+DATABASE_CONN_HEALTH_CHECKS = config('DATABASE_CONN_HEALTH_CHECKS', default=True, cast=bool)
+
+DATABASES['default']['CONN_MAX_AGE'] = DATABASE_CONN_MAX_AGE
+
+# Connection pool (PostgreSQL only; see: marketplace.db.backends.postgresql_pool)
+#
+# Under threaded workers, connections may instead be shared via an in-process
+# pool of up to DATABASE_POOL_SIZE connections, to which they are returned at
+# the end of each request.
+#
+DATABASE_POOL = config('DATABASE_POOL', default=False, cast=bool)
+DATABASE_POOL_SIZE = config('DATABASE_POOL_SIZE', default=10, cast=int)
+DATABASE_POOL_TIMEOUT = config('DATABASE_POOL_TIMEOUT', default=30, cast=float)  # seconds
+
+if DATABASE_POOL:
+    if DATABASES['default']['ENGINE'] not in ('django.db.backends.postgresql',
+                                              'django.db.backends.postgresql_psycopg2'):
+        raise ImproperlyConfigured("DATABASE_POOL requires PostgreSQL: "
+                                   f"not {DATABASES['default']['ENGINE']!r}")
+
+    DATABASES['default']['ENGINE'] = 'marketplace.db.backends.postgresql_pool'
+    DATABASES['default']['CONN_MAX_AGE'] = 0
+
 
 # Password validation
 # https://docs.djangoproject.com/en/2.0/ref/settings/#auth-password-validators
@@ -289,12 +347,30 @@ else:
     EMAIL_HOST_USER = config('EMAIL_HOST_USER')
     EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 
+# Outbox (see: manage.py send_queued_emails)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+EMAIL_OUTBOX_RETRY_DELAY = config('EMAIL_OUTBOX_RETRY_DELAY', default=60, cast=int)  # seconds
+EMAIL_OUTBOX_MAX_RETRY_DELAY = config('EMAIL_OUTBOX_MAX_RETRY_DELAY', default=3600, cast=int)
+
+# Background jobs (see: manage.py run_jobs)
+JOBS_MAX_ATTEMPTS = config('JOBS_MAX_ATTEMPTS', default=5, cast=int)
+JOBS_RETRY_DELAY = config('JOBS_RETRY_DELAY', default=30, cast=int)  # seconds
+JOBS_MAX_RETRY_DELAY = config('JOBS_MAX_RETRY_DELAY', default=3600, cast=int)
+JOBS_CLAIM_TIMEOUT = config('JOBS_CLAIM_TIMEOUT', default=600, cast=int)
+# run jobs in-process upon commit, rather than by worker (by default, in development)
+JOBS_RUN_EAGERLY = config('JOBS_RUN_EAGERLY', default=DEBUG, cast=bool)
+
 
 if DEBUG:
     LOGS_HOME = '.'
 else:
     LOGS_HOME = '/var/log/webapp'
 
+# Log queries slower than this threshold (in seconds), with their callers, to
+# SLOW_QUERY_LOG (see: marketplace/db/slow_queries.py); zero disables the log
+SLOW_QUERY_THRESHOLD = config('SLOW_QUERY_THRESHOLD', default=0, cast=float)
+SLOW_QUERY_LOG = config('SLOW_QUERY_LOG', default=os.path.join(LOGS_HOME, 'slow_queries.log'))
+
 LOGGING = {
     'version': 1,
     'disable_existing_loggers': True,
@@ -303,6 +379,9 @@ LOGGING = {
             'format' : "[%(asctime)s] %(levelname)s [%(name)s:%(lineno)s] %(message)s",
             'datefmt' : "%d/%b/%Y %H:%M:%S"
         },
+        'message': {
+            'format': "%(message)s",
+        },
     },
     'handlers': {
         'logfile': {
@@ -318,6 +397,15 @@ LOGGING = {
             'class':'logging.StreamHandler',
             'formatter': 'standard'
         },
+        'slow_query_log': {
+            'level': 'INFO',
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': SLOW_QUERY_LOG,
+            'maxBytes': 10000000,
+            'backupCount': 5,
+            'formatter': 'message',
+            'delay': True,
+        },
     },
     'loggers': {
         'django': {
@@ -334,10 +422,30 @@ LOGGING = {
             'handlers': ['console', 'logfile'],
             'level': config('DSSG_LOG_LEVEL', default='WARN'),
         },
+        'marketplace.db.slow_queries': {
+            'handlers': ['slow_query_log'],
+            'level': 'INFO',
+            'propagate': False,
+        },
     }
 }
 
 
+# Per-request instrumentation (see: marketplace/middleware.py)
+#
+# Report time spent in the database, templates and domain by way of the
+# Server-Timing response header
+REQUEST_TIMING = config('REQUEST_TIMING', default=False, cast=bool)
+# Profile (with cProfile) this fraction of requests, saving the profiles of
+# those slower than the threshold
+REQUEST_PROFILING_SAMPLE_RATE = config('REQUEST_PROFILING_SAMPLE_RATE', default=0, cast=float)
+if not 0 <= REQUEST_PROFILING_SAMPLE_RATE <= 1:
+    raise ImproperlyConfigured("REQUEST_PROFILING_SAMPLE_RATE must be between 0 and 1: "
+                               f"{REQUEST_PROFILING_SAMPLE_RATE!r}")
+REQUEST_PROFILING_THRESHOLD = config('REQUEST_PROFILING_THRESHOLD', default=1, cast=float)  # seconds
+REQUEST_PROFILING_DIR = config('REQUEST_PROFILING_DIR', default=os.path.join(LOGS_HOME, 'profiles'))
+
+
 
 MESSAGE_TAGS = {
     messages.DEBUG: 'bg-light',
@@ -350,6 +458,10 @@ MESSAGE_TAGS = {
 
 RECAPTCHA_SITE_KEY = config('RECAPTCHA_SITE_KEY', default=None)
 RECAPTCHA_SECRET_KEY = config('RECAPTCHA_SECRET_KEY', default=None)
+RECAPTCHA_TIMEOUT = config('RECAPTCHA_TIMEOUT', default=5, cast=float)  # seconds
+
+# Serve endpoints simulating I/O-bound requests (see: manage.py loadtest)
+LOADTEST_ENDPOINTS = config('LOADTEST_ENDPOINTS', default=False, cast=bool)
 
 AUTOMATICALLY_ACCEPT_VOLUNTEERS = config('AUTOMATICALLY_ACCEPT_VOLUNTEERS', default=False, cast=bool)
 